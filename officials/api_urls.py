@@ -19,5 +19,6 @@ router.register(r'userleagueadmins', api_views.UserLeagueAdminViewSet, basename=
 
 # The API URLs are now determined automatically by the router.
 urlpatterns = [
+    path('sync/', api_views.SyncView.as_view(), name='api_sync'),
     path('', include(router.urls)),
 ]
@@ -1,17 +1,44 @@
+import copy
+import hashlib
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from .models import (Team, Pool, League, Certification, Division, Official, Meet, 
                     Assignment, Event, Strategy, Position, UserLeagueAdmin)
+from .services import delta_sync
+from .services.official_feed import official_feed
+from .signals import assignments_changed, dropout, repair_on_commit
 from .serializers import (LeagueSerializer, CertificationSerializer, DivisionSerializer, TeamSerializer, 
                         OfficialSerializer, MeetSerializer, PoolSerializer, AssignmentSerializer, 
                         EventSerializer, StrategySerializer, PositionSerializer, UserLeagueAdminSerializer)
-from rest_framework import viewsets, permissions, renderers
+from rest_framework import viewsets, permissions, renderers, status
+from rest_framework.decorators import action
 from rest_framework.renderers import TemplateHTMLRenderer, JSONRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 import requests
 import json
 from datetime import datetime
 
+def _dropdown_response(request, data):
+    """
+    JSON for a chained dropdown, with an ETag so repeated lookups get 304.
+
+    These lists are a handful of rows, so the ETag is a hash of the JSON itself.
+    """
+    response = JsonResponse(data, safe=False)
+    etag = f'"{hashlib.sha256(response.content).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag) or response
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 def team_pools(request, team_id):
     """API endpoint to get all pools for a specific team."""
     try:
@@ -26,7 +53,7 @@ def team_pools(request, team_id):
             'lanes': pool.lanes,
             'bidirectional': pool.bidirectional,
         } for pool in pools]
-        return JsonResponse(data, safe=False)
+        return _dropdown_response(request, data)
     except Team.DoesNotExist:
         return JsonResponse([], safe=False)
 
@@ -40,7 +67,7 @@ def division_teams(request, division_id):
             'id': team.id,
             'name': team.name,
         } for team in teams]
-        return JsonResponse(data, safe=False)
+        return _dropdown_response(request, data)
     except Division.DoesNotExist:
         return JsonResponse([], safe=False)
         
@@ -54,7 +81,7 @@ def league_divisions(request, league_id):
             'id': division.id,
             'name': division.name,
         } for division in divisions]
-        return JsonResponse(data, safe=False)
+        return _dropdown_response(request, data)
     except League.DoesNotExist:
         return JsonResponse([], safe=False)
 
@@ -175,17 +202,246 @@ def pool_weather(request):
         })
 
 
+class QueryPlanMixin:
+    """
+    Declares the related rows a viewset's serializer reads, so a request costs
+    a fixed number of queries however many rows it returns.
+
+    `select_related_fields` and `prefetch_related_fields` are always applied.
+    `expansions` maps each name a client may pass in `?expand=a,b` to the
+    (select_related, prefetch_related) paths the inlined objects need; the
+    serializer inlines them (see serializers.ExpandableFieldsMixin).
+
+    `?fields=a,b` narrows the response to those fields (see
+    serializers.SparseFieldsMixin). The queryset then loads only the columns
+    behind them with .only(), and joins and prefetches for fields that were
+    left out are dropped. Unknown names are ignored, and writes are neither
+    expanded nor narrowed.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    expansions = {}
+
+    def _query_param_names(self, param):
+        if self.request is None or self.request.method not in permissions.SAFE_METHODS:
+            return ()
+        names = (name.strip() for name in self.request.query_params.get(param, '').split(','))
+        return tuple(dict.fromkeys(name for name in names if name))
+
+    def requested_expansions(self):
+        return tuple(name for name in self._query_param_names('expand') if name in self.expansions)
+
+    def requested_fields(self):
+        """Field names asked for with ?fields=, or () for every field."""
+        return self._query_param_names('fields')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select_related = list(self.select_related_fields)
+        prefetch_related = list(self.prefetch_related_fields)
+        for name in self.requested_expansions():
+            select, prefetch = self.expansions[name]
+            select_related.extend(select)
+            prefetch_related.extend(prefetch)
+
+        if self.requested_fields():
+            # Sources of the fields the narrowed serializer will read.
+            sources = {field.source.split('.')[0] for field in self.get_serializer().fields.values()}
+            select_related = [path for path in select_related if path.split('__')[0] in sources]
+            prefetch_related = [path for path in prefetch_related if path.split('__')[0] in sources]
+            meta = queryset.model._meta
+            queryset = queryset.only(
+                meta.pk.name, *(field.name for field in meta.concrete_fields if field.name in sources)
+            )
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.requested_expansions()
+        context['fields'] = self.requested_fields()
+        return context
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified on list and detail reads, for models with an
+    `updated_at` column, so polling clients get 304 Not Modified.
+
+    A list's version is max(updated_at) and the row count of the filtered
+    queryset, read with one aggregate query before any row is loaded or
+    serialized; a detail's is the object's own updated_at, which is also
+    sent as Last-Modified. The ETag also
+    covers the full path (page, fields) and the media type. Expanded
+    responses inline other models' rows, whose changes these columns do not
+    track, so they are never answered with 304.
+    """
+    version_field = 'updated_at'
+
+    def _etag(self, *parts):
+        token = '|'.join(str(part) for part in (
+            self.queryset.model._meta.label, self.request.get_full_path(), self.request.accepted_media_type, *parts
+        ))
+        return f'"{hashlib.sha256(token.encode()).hexdigest()}"'
+
+    def _conditional(self, etag, last_modified, render):
+        if self.requested_expansions():
+            return render()
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        version = queryset.order_by().aggregate(latest=Max(self.version_field), count=Count('pk'))
+        # No Last-Modified here: deleting the newest row moves max(updated_at)
+        # backwards, which If-Modified-Since alone would read as unchanged.
+        return self._conditional(
+            self._etag(version['latest'], version['count']), None,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        latest = getattr(instance, self.version_field)
+        return self._conditional(
+            self._etag(instance.pk, latest), latest,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+
+class BulkWriteMixin:
+    """
+    List-valued writes for roster syncs.
+
+    POST a list to the collection (or to `bulk/`) to create many rows, PATCH
+    `bulk/` with a list of partial objects carrying their `id` to update many,
+    and DELETE `bulk/` with a list of ids to delete many. A batch of up to
+    API_BULK_MAX_ITEMS is validated as a whole and applied in one transaction
+    with bulk_create / bulk_update (see serializers.BulkListSerializer); if
+    any item is invalid nothing is written. The response lists one result per
+    item, in request order: its status and either the object or its errors.
+    Items that were valid but not applied because of others get 424.
+    """
 
-class LeagueViewSet(viewsets.ModelViewSet):
+    def bulk_written(self, objects, previous=()):
+        """
+        Hook for the side effects save() signals would have had. `previous`
+        holds copies of updated objects as they were before the batch.
+        """
+
+    def _max_items(self):
+        return getattr(settings, 'API_BULK_MAX_ITEMS', 1000)
+
+    def _rejected(self, errors):
+        if not isinstance(errors, list):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'results': [
+            {'status': status.HTTP_400_BAD_REQUEST, 'errors': item} if item
+            else {'status': status.HTTP_424_FAILED_DEPENDENCY}
+            for item in errors
+        ]}, status=status.HTTP_400_BAD_REQUEST)
+
+    def _write(self, serializer, item_status, previous=()):
+        if not serializer.is_valid():
+            return self._rejected(serializer.errors)
+        try:
+            with transaction.atomic():
+                objects = serializer.save()
+                # bulk_update sends no pre_save, which is where delta sync notices league moves.
+                previous_by_pk = {instance.pk: instance for instance in previous}
+                for instance in objects:
+                    if instance.pk in previous_by_pk:
+                        delta_sync.record_scope_change(instance, previous_by_pk[instance.pk])
+                self.bulk_written(objects, previous)
+        except IntegrityError:
+            return Response(
+                {'detail': 'The batch conflicts with existing rows or repeats an item.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        data = self.get_serializer(objects, many=True).data
+        return Response(
+            {'results': [{'status': item_status, 'data': item} for item in data]},
+            status=status.HTTP_201_CREATED if item_status == status.HTTP_201_CREATED else status.HTTP_200_OK,
+        )
+
+    def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self._bulk_create(request)
+        return super().create(request, *args, **kwargs)
+
+    def _bulk_create(self, request):
+        serializer = self.get_serializer(data=request.data, many=True, max_length=self._max_items())
+        return self._write(serializer, status.HTTP_201_CREATED)
+
+    def _bulk_update(self, request):
+        items = request.data if isinstance(request.data, list) else []
+        ids = [item['id'] for item in items if isinstance(item, dict) and isinstance(item.get('id'), int)]
+        instances = list(self.get_queryset().filter(pk__in=ids)) if len(items) <= self._max_items() else []
+        serializer = self.get_serializer(
+            instances, data=request.data, many=True, partial=True, max_length=self._max_items()
+        )
+        return self._write(serializer, status.HTTP_200_OK, [copy.copy(instance) for instance in instances])
+
+    def _bulk_delete(self, request):
+        ids = request.data
+        if not isinstance(ids, list) or not ids or len(ids) > self._max_items():
+            return Response(
+                {'detail': f'Send a list of 1 to {self._max_items()} ids to delete.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = self.get_queryset().filter(pk__in=[pk for pk in ids if isinstance(pk, int)])
+        found = {obj.pk: obj for obj in queryset}
+        if len(found) != len(ids) or len(set(ids)) != len(ids):
+            listed = set()
+            errors = []
+            for pk in ids:
+                if pk not in found:
+                    errors.append({'id': ['No object with this id.']})
+                elif pk in listed:
+                    errors.append({'id': ['This object is listed more than once.']})
+                else:
+                    errors.append({})
+                listed.add(pk)
+            return self._rejected(errors)
+        with transaction.atomic():
+            self.perform_bulk_destroy(list(found.values()))
+        return Response({'results': [{'id': pk, 'status': status.HTTP_204_NO_CONTENT} for pk in ids]})
+
+    def perform_bulk_destroy(self, objects):
+        self.get_queryset().model.objects.filter(pk__in=[obj.pk for obj in objects]).delete()
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """Create, update or delete a batch of objects (see BulkWriteMixin)."""
+        if request.method == 'POST':
+            return self._bulk_create(request)
+        if request.method == 'PATCH':
+            return self._bulk_update(request)
+        return self._bulk_delete(request)
+
+
+class LeagueViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows leagues to be viewed or edited.
     """
     queryset = League.objects.all().order_by('name')
     serializer_class = LeagueSerializer
     permission_classes = [permissions.IsAuthenticated]
+    prefetch_related_fields = ('users',)
 
 
-class CertificationViewSet(viewsets.ModelViewSet):
+class CertificationViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows certifications to be viewed or edited.
     Also supports HTML template responses for test compatibility.
@@ -221,52 +477,73 @@ class CertificationViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class DivisionViewSet(viewsets.ModelViewSet):
+class DivisionViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows divisions to be viewed or edited.
     """
     queryset = Division.objects.all().order_by('league__name', 'name')
     serializer_class = DivisionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    expansions = {'league': (('league',), ('league__users',))}
 
 
-class TeamViewSet(viewsets.ModelViewSet):
+class TeamViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows teams to be viewed or edited.
     """
     queryset = Team.objects.all().order_by('division__league__name', 'division__name', 'name')
     serializer_class = TeamSerializer
     permission_classes = [permissions.IsAuthenticated]
+    prefetch_related_fields = ('users',)
+    expansions = {'division': (('division',), ())}
 
 
-class OfficialViewSet(viewsets.ModelViewSet):
+class OfficialViewSet(BulkWriteMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows officials to be viewed or edited.
     """
     queryset = Official.objects.all().order_by('name')
     serializer_class = OfficialSerializer
     permission_classes = [permissions.IsAuthenticated]
+    expansions = {
+        'certification': (('certification',), ()),
+        'team': (('team',), ('team__users',)),
+    }
 
+    @action(detail=True, methods=['get'])
+    def assignments(self, request, pk=None):
+        """The official's upcoming meets with their assignments and published slots."""
+        feed, _etag = official_feed(self.get_object())
+        return Response(feed)
 
-class MeetViewSet(viewsets.ModelViewSet):
+
+class MeetViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows meets to be viewed or edited.
     """
     queryset = Meet.objects.all().order_by('-date', 'name') # Order by date descending, then name
     serializer_class = MeetSerializer
     permission_classes = [permissions.IsAuthenticated]
+    prefetch_related_fields = ('participating_teams',)
+    expansions = {
+        'league': (('league',), ('league__users',)),
+        'host_team': (('host_team',), ('host_team__users',)),
+        'pool': (('pool',), ()),
+        'participating_teams': ((), ('participating_teams__users',)),
+    }
 
 
-class PoolViewSet(viewsets.ModelViewSet):
+class PoolViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows pools to be viewed or edited.
     """
     queryset = Pool.objects.all().order_by('name')
     serializer_class = PoolSerializer
     permission_classes = [permissions.IsAuthenticated]
+    expansions = {'team': (('team',), ('team__users',))}
 
 
-class AssignmentViewSet(viewsets.ModelViewSet):
+class AssignmentViewSet(BulkWriteMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows assignments to be viewed or edited.
     Note: Requires authentication for all API requests (tests must log in or use credentials).
@@ -274,9 +551,20 @@ class AssignmentViewSet(viewsets.ModelViewSet):
     queryset = Assignment.objects.all().order_by('-meet__date', 'official__name')
     serializer_class = AssignmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    expansions = {
+        'meet': (('meet',), ('meet__participating_teams',)),
+        'official': (('official',), ()),
+    }
+
+    def bulk_written(self, objects, previous=()):
+        touched = list(objects) + list(previous)
+        assignments_changed([assignment.meet_id for assignment in touched])
+        # Deletes go through the post_delete signal, which repairs the schedules itself.
+        now = {assignment.pk: assignment for assignment in objects}
+        repair_on_commit(filter(None, (dropout(old, now.get(old.pk)) for old in previous)))
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows events to be viewed or edited.
     """
@@ -293,7 +581,7 @@ class EventViewSet(viewsets.ModelViewSet):
         return super().partial_update(request, *args, **kwargs)
 
 
-class StrategyViewSet(viewsets.ModelViewSet):
+class StrategyViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows strategies to be viewed or edited.
     """
@@ -302,20 +590,66 @@ class StrategyViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class PositionViewSet(viewsets.ModelViewSet):
+class PositionViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows positions to be viewed or edited.
     """
     queryset = Position.objects.all().order_by('strategy__name', 'role')
     serializer_class = PositionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    expansions = {'strategy': (('strategy',), ())}
 
 
-class UserLeagueAdminViewSet(viewsets.ModelViewSet):
+class UserLeagueAdminViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows user league admin relationships to be viewed or edited.
     """
     queryset = UserLeagueAdmin.objects.all().order_by('user__username', 'league__name')
     serializer_class = UserLeagueAdminSerializer
     permission_classes = [permissions.IsAuthenticated]
+    expansions = {
+        'user': (('user',), ()),
+        'league': (('league',), ('league__users',)),
+    }
+
 
+class SyncView(APIView):
+    """
+    Delta sync for offline clients: GET /api/v1/officials/sync/?since=<token>.
+
+    Returns a page of the rows the user can see that changed since the token,
+    by collection, the ids of rows deleted since then, and the token for the
+    next call; "more" says whether that call continues this sync. Without a
+    token, or when the server can no longer answer it, every visible row is
+    paged out with "reset": true on the first page (see services.delta_sync).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    viewsets = {
+        'leagues': LeagueViewSet,
+        'divisions': DivisionViewSet,
+        'teams': TeamViewSet,
+        'pools': PoolViewSet,
+        'officials': OfficialViewSet,
+        'meets': MeetViewSet,
+        'assignments': AssignmentViewSet,
+        'certifications': CertificationViewSet,
+        'events': EventViewSet,
+        'strategies': StrategyViewSet,
+        'positions': PositionViewSet,
+    }
+
+    def get(self, request):
+        try:
+            batch = delta_sync.sync(request.user, request.query_params.get('since'))
+        except delta_sync.InvalidToken:
+            return Response({'detail': 'Invalid sync token.'}, status=status.HTTP_400_BAD_REQUEST)
+        changed = {}
+        for name, rows in batch.changed.items():
+            viewset = self.viewsets[name]
+            rows = rows.select_related(*viewset.select_related_fields).prefetch_related(*viewset.prefetch_related_fields)
+            data = viewset.serializer_class(rows, many=True, context={'request': request}).data
+            if data:
+                changed[name] = data
+        return Response({
+            'token': batch.token, 'reset': batch.reset, 'more': batch.more, 'changed': changed, 'deleted': batch.deleted,
+        })
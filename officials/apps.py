@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OfficialsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'officials'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -3,7 +3,7 @@ import datetime
 from django.core.exceptions import ValidationError
 from django.forms import inlineformset_factory, modelformset_factory
 
-from .models import League, Division, Team, Position, Meet, Assignment, Pool, Event, Strategy, Certification, Official, EventPosition
+from .models import League, Division, Team, Position, Meet, Assignment, Pool, Event, Strategy, Certification, Official, EventPosition, MeetSchedule
 
 
 class OfficialImportForm(forms.Form):
@@ -360,6 +360,32 @@ class EventFilterForm(forms.Form):
     )
 
 
+class LeagueScheduleBuildForm(forms.Form):
+    """Form for building schedules for every meet of a league on a date or date range."""
+    start_date = forms.DateField(
+        label='Meet Date', widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'})
+    )
+    end_date = forms.DateField(
+        required=False,
+        label='Through',
+        help_text='Leave blank to build only the meets on the first date.',
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
+    )
+    build_option = forms.ChoiceField(
+        choices=MeetSchedule.BUILD_CHOICES,
+        initial='LIGHTEST',
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get('start_date')
+        end_date = cleaned_data.get('end_date')
+        if start_date and end_date and end_date < start_date:
+            self.add_error('end_date', 'The end date must be on or after the meet date.')
+        return cleaned_data
+
+
 class EventForm(forms.ModelForm):
     """Form for creating and updating events."""
     class Meta:
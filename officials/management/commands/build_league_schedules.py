@@ -0,0 +1,63 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from officials.models import League, MeetSchedule
+from officials.services.league_builder import build_league_schedules
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'Invalid date "{value}"; use YYYY-MM-DD.')
+
+
+class Command(BaseCommand):
+    help = 'Build schedules for every meet of a league on a date or in a date range.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('league', help='League id or exact name')
+        parser.add_argument('date', help='Meet date (YYYY-MM-DD)')
+        parser.add_argument('--end-date', help='Also build meets up to and including this date')
+        parser.add_argument(
+            '--option', default='LIGHTEST',
+            choices=[value for value, _label in MeetSchedule.BUILD_CHOICES],
+            help='Build option (default: LIGHTEST)',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Solver processes (default: one per CPU core; 1 solves in this process)',
+        )
+
+    def handle(self, *args, **options):
+        league_ref = options['league']
+        leagues = League.objects.filter(pk=league_ref) if league_ref.isdigit() else League.objects.filter(name=league_ref)
+        league = leagues.first()
+        if league is None:
+            raise CommandError(f'League "{league_ref}" does not exist.')
+
+        start = _parse_date(options['date'])
+        end = _parse_date(options['end_date']) if options['end_date'] else start
+        if end < start:
+            raise CommandError('--end-date must be on or after the meet date.')
+
+        outcomes = build_league_schedules(league, start, end, options['option'], workers=options['workers'])
+        if not outcomes:
+            self.stdout.write(f'No meets found for {league.name} between {start} and {end}.')
+            return
+
+        for outcome in outcomes:
+            label = f'{outcome.meet.date} {outcome.meet.name}'
+            if outcome.ok:
+                line = f'{label}: {outcome.filled_slots}/{outcome.total_slots} slots filled'
+                if outcome.unfilled_mandatory:
+                    line += f', {outcome.unfilled_mandatory} mandatory unfilled'
+                if outcome.double_booked:
+                    line += f', {len(outcome.double_booked)} official(s) confirmed at another meet that day'
+                self.stdout.write(self.style.SUCCESS(line))
+            else:
+                self.stdout.write(self.style.ERROR(f'{label}: {outcome.error}'))
+
+        built = sum(1 for outcome in outcomes if outcome.ok)
+        self.stdout.write(f'Built {built} of {len(outcomes)} meet schedule(s).')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from officials.services.delta_sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Delete delta-sync tombstones older than API_SYNC_TOMBSTONE_DAYS.'
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} tombstone(s).'))
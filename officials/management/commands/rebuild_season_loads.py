@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from officials.services.season_load import rebuild_season_loads
+
+
+class Command(BaseCommand):
+    help = "Recompute officials' season workload index from each meet's newest schedule."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', type=int, default=None, help='Only rebuild this season (year)')
+
+    def handle(self, *args, **options):
+        counted = rebuild_season_loads(options['season'])
+        scope = f'season {options["season"]}' if options['season'] else 'all seasons'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt season loads for {scope} from {counted} meet schedule(s).'))
@@ -0,0 +1,89 @@
+import json
+import time
+from dataclasses import replace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from officials.services.benchmarks import GROUPS, benchmark_report, compare_reports, run_benchmarks
+from officials.services.synthetic_league import SCALES, generate_league
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic league and time schedule builds, auto-assign, imports and list views. '
+        'The data is rolled back afterwards unless --keep is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', default='small', choices=list(SCALES), help='Preset size (default: small)')
+        parser.add_argument('--teams', type=int, help='Override the number of teams')
+        parser.add_argument('--officials-per-team', type=int, help='Override the officials per team')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (default: 3)')
+        parser.add_argument('--only', action='append', choices=GROUPS, help='Only run these groups (repeatable)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the generated data')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--compare', help='Compare against a JSON report from an earlier run')
+        parser.add_argument(
+            '--threshold', type=float, default=0.1,
+            help='Slowdown ratio above which --compare reports a regression (default: 0.1)',
+        )
+        parser.add_argument('--keep', action='store_true', help='Keep the generated data')
+
+    def handle(self, *args, **options):
+        scale = SCALES[options['scale']]
+        if options['teams']:
+            scale = replace(scale, teams=options['teams'], divisions=max(1, min(scale.divisions, options['teams'] // 2)))
+        if options['officials_per_team']:
+            scale = replace(scale, officials_per_team=options['officials_per_team'])
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1.')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as handle:
+                    baseline = json.load(handle)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Cannot read {options["compare"]}: {e}')
+
+        report = None
+        try:
+            with transaction.atomic():
+                self.stderr.write(f'Generating {scale.teams} teams and {scale.officials} officials...')
+                start = time.perf_counter()
+                try:
+                    data = generate_league(scale, seed=options['seed'])
+                except ValueError as e:
+                    raise CommandError(str(e))
+                generate_ms = (time.perf_counter() - start) * 1000
+                results = run_benchmarks(data, options['repeat'], tuple(options['only'] or GROUPS))
+                report = benchmark_report(data, results, generate_ms)
+                if not options['keep']:
+                    raise _Rollback
+        except _Rollback:
+            pass
+
+        for case in report['results']:
+            self.stderr.write(f'{case["name"]:32} {case["median_ms"]:10.1f} ms {case["queries"]:6} queries')
+
+        payload = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(payload + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+        else:
+            self.stdout.write(payload)
+
+        if baseline is not None:
+            regressions = 0
+            for name, before, after, ratio, regressed in compare_reports(baseline, report, options['threshold']):
+                regressions += regressed
+                line = f'{name:32} {before:10.1f} -> {after:10.1f} ms ({ratio:.2f}x)'
+                self.stderr.write(self.style.ERROR(line) if regressed else line)
+            if regressions:
+                raise CommandError(f'{regressions} benchmark(s) regressed against {options["compare"]}.')
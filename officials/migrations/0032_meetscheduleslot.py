@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-16 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0031_meetschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeetScheduleSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_mandatory', models.BooleanField(default=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_slots', to='officials.event')),
+                ('official', models.ForeignKey(blank=True, help_text='Official working this slot; empty when the slot could not be filled', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='schedule_slots', to='officials.official')),
+                ('position', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_slots', to='officials.position')),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='officials.meetschedule')),
+            ],
+            options={
+                'ordering': ['schedule', 'event__event_number', 'position__role'],
+                'unique_together': {('schedule', 'event', 'position')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-16 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0032_meetscheduleslot'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='meetschedule',
+            name='build_option',
+            field=models.CharField(choices=[('LIGHTEST', 'Lightest'), ('HEAVIEST', 'Heaviest'), ('OPTIMAL', 'Optimal')], max_length=20),
+        ),
+    ]
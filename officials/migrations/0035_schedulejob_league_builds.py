@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-16 11:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0034_schedulejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulejob',
+            name='end_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='schedulejob',
+            name='league',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='schedule_jobs', to='officials.league'),
+        ),
+        migrations.AddField(
+            model_name='schedulejob',
+            name='start_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='schedulejob',
+            name='meet',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='schedule_jobs', to='officials.meet'),
+        ),
+    ]
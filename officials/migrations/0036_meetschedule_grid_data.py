@@ -0,0 +1,68 @@
+# Generated by Django 5.2.1 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+from officials.services.schedule_storage import NO_SLOT, UNFILLED, PackedSchedule, encode
+
+
+def pack_slots(apps, schema_editor):
+    """Encode each schedule's slot rows into its grid_data blob."""
+    MeetSchedule = apps.get_model('officials', 'MeetSchedule')
+    MeetScheduleSlot = apps.get_model('officials', 'MeetScheduleSlot')
+
+    for schedule in MeetSchedule.objects.filter(grid_data__isnull=True).iterator():
+        slots = list(
+            MeetScheduleSlot.objects
+            .filter(schedule_id=schedule.id)
+            .order_by('event__event_number', 'position__role', 'position_id')
+            .values_list('event_id', 'position_id', 'official_id', 'is_mandatory', 'position__role')
+        )
+        if not slots:
+            continue
+        event_ids = list(dict.fromkeys(slot[0] for slot in slots))
+        roles = {slot[1]: slot[4] for slot in slots}
+        position_ids = sorted(roles, key=lambda pid: (roles[pid], pid))
+        official_ids = sorted({slot[2] for slot in slots if slot[2] is not None})
+
+        event_index = {event_id: e for e, event_id in enumerate(event_ids)}
+        position_index = {position_id: p for p, position_id in enumerate(position_ids)}
+        official_index = {official_id: o for o, official_id in enumerate(official_ids)}
+        grid = [[NO_SLOT] * len(position_ids) for _ in event_ids]
+        mandatory = [[False] * len(position_ids) for _ in event_ids]
+        for event_id, position_id, official_id, is_mandatory, _role in slots:
+            e, p = event_index[event_id], position_index[position_id]
+            grid[e][p] = official_index[official_id] if official_id is not None else UNFILLED
+            mandatory[e][p] = is_mandatory
+
+        schedule.grid_data = encode(event_ids, position_ids, official_ids, grid, mandatory)
+        schedule.save(update_fields=['grid_data'])
+
+
+def unpack_slots(apps, schema_editor):
+    MeetSchedule = apps.get_model('officials', 'MeetSchedule')
+    MeetScheduleSlot = apps.get_model('officials', 'MeetScheduleSlot')
+
+    for schedule in MeetSchedule.objects.filter(grid_data__isnull=False).iterator():
+        MeetScheduleSlot.objects.bulk_create([
+            MeetScheduleSlot(
+                schedule_id=schedule.id, event_id=event_id, position_id=position_id,
+                official_id=official_id, is_mandatory=is_mandatory,
+            )
+            for event_id, position_id, official_id, is_mandatory in PackedSchedule(schedule.grid_data).slots()
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0035_schedulejob_league_builds'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meetschedule',
+            name='grid_data',
+            field=models.BinaryField(blank=True, editable=False, help_text='Encoded event x position grid (see officials.services.schedule_storage)', null=True),
+        ),
+        migrations.RunPython(pack_slots, unpack_slots),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.1 on 2026-10-16 12:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0036_meetschedule_grid_data'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='MeetScheduleSlot',
+        ),
+    ]
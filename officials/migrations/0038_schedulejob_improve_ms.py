@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-16 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0037_delete_meetscheduleslot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulejob',
+            name='improve_ms',
+            field=models.PositiveIntegerField(default=0, help_text='Time budget for the local-search improvement pass; 0 skips it'),
+        ),
+    ]
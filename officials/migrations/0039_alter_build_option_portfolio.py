@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-16 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0038_schedulejob_improve_ms'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='meetschedule',
+            name='build_option',
+            field=models.CharField(choices=[('LIGHTEST', 'Lightest'), ('HEAVIEST', 'Heaviest'), ('OPTIMAL', 'Optimal'), ('PORTFOLIO', 'Portfolio')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='schedulejob',
+            name='build_option',
+            field=models.CharField(choices=[('LIGHTEST', 'Lightest'), ('HEAVIEST', 'Heaviest'), ('OPTIMAL', 'Optimal'), ('PORTFOLIO', 'Portfolio')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-16 15:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0039_alter_build_option_portfolio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meetschedule',
+            name='official_loads',
+            field=models.JSONField(blank=True, editable=False, help_text='{official id: [slots, heavy slots]} worked in this schedule (see officials.services.season_load)', null=True),
+        ),
+        migrations.AddField(
+            model_name='meetschedule',
+            name='season_counted',
+            field=models.BooleanField(default=False, help_text="Whether this is the schedule the meet counts towards its officials' season loads"),
+        ),
+        migrations.CreateModel(
+            name='OfficialSeasonLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.PositiveSmallIntegerField(help_text='Year of the meets counted')),
+                ('slots', models.IntegerField(default=0)),
+                ('heavy_slots', models.IntegerField(default=0, help_text='Slots in positions requiring at least SEASON_HEAVY_POSITION_LEVEL certification')),
+                ('meets', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('official', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_loads', to='officials.official')),
+            ],
+            options={
+                'ordering': ['season', 'official'],
+                'unique_together': {('official', 'season')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-16 16:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0040_officialseasonload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishedSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('html', models.TextField(editable=False)),
+                ('json', models.TextField(editable=False)),
+                ('etag', models.CharField(editable=False, help_text='Hash of the rendered content', max_length=64)),
+                ('published_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('meet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='published_schedules', to='officials.meet')),
+                ('published_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('schedule', models.ForeignKey(blank=True, help_text='Schedule this was rendered from; kept published if the schedule is deleted', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='publications', to='officials.meetschedule')),
+            ],
+            options={
+                'ordering': ['-published_at', '-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.1 on 2026-10-16 17:00
+
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_current_publications(apps, schema_editor):
+    """Index the slots of each meet's newest publication from its JSON form."""
+    PublishedSchedule = apps.get_model('officials', 'PublishedSchedule')
+    PublishedSlot = apps.get_model('officials', 'PublishedSlot')
+    Official = apps.get_model('officials', 'Official')
+    seen = set()
+    for publication in PublishedSchedule.objects.order_by('meet_id', '-published_at', '-id'):
+        if publication.meet_id in seen:
+            continue
+        seen.add(publication.meet_id)
+        document = json.loads(publication.json)
+        positions = {position['id']: position for position in document['positions']}
+        slots = [
+            (slot['official']['id'], event, positions[slot['position']])
+            for event in document['events']
+            for slot in event['slots'] if slot['official']
+        ]
+        existing = set(Official.objects.filter(id__in={official_id for official_id, _e, _p in slots}).values_list('id', flat=True))
+        PublishedSlot.objects.bulk_create([
+            PublishedSlot(
+                official_id=official_id, meet_id=publication.meet_id, publication_id=publication.id,
+                event_number=event['number'], event_name=event['name'],
+                role=position['role'], location=position['location'] or '',
+            )
+            for official_id, event, position in slots if official_id in existing
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0041_publishedschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishedSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_number', models.PositiveSmallIntegerField()),
+                ('event_name', models.CharField(max_length=100)),
+                ('role', models.CharField(max_length=100)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('meet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='published_slots', to='officials.meet')),
+                ('official', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='published_slots', to='officials.official')),
+                ('publication', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='officials.publishedschedule')),
+            ],
+            options={
+                'ordering': ['meet', 'event_number', 'role'],
+                'indexes': [models.Index(fields=['official', 'meet'], name='published_slot_official_meet')],
+            },
+        ),
+        migrations.RunPython(index_current_publications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-16 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('officials', '0043_sync_updated_at_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='publishedschedule',
+            index=models.Index(fields=['meet', '-published_at', '-id'], name='published_schedule_newest'),
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
 import datetime
+import uuid
 from django.conf import settings
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 
 
@@ -36,6 +38,7 @@ class Certification(models.Model):
     abbreviation = models.CharField(max_length=3, blank=True)
     description = models.TextField(blank=True)
     level = models.PositiveSmallIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return self.name
@@ -48,6 +51,7 @@ class League(models.Model):
     founded_year = models.PositiveIntegerField(null=True, blank=True)
     logo = models.ImageField(upload_to='league_logos', blank=True, null=True)
     users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='leagues', blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return self.name
@@ -58,6 +62,7 @@ class Division(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='divisions')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return f"{self.name} - {self.league.name}"
@@ -77,6 +82,7 @@ class Pool(models.Model):
     lanes = models.PositiveSmallIntegerField(default=6, help_text="Number of lanes")
     bidirectional = models.BooleanField(default=False, help_text="Do you start events at both ends of the pool?")
     team = models.ForeignKey('Team', on_delete=models.CASCADE, related_name='pools')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return f"{self.name} ({self.length} {self.units}, {self.lanes} lanes)"
@@ -92,6 +98,7 @@ class Team(models.Model):
     address = models.TextField(blank=True)
     website = models.URLField(blank=True)
     users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='teams', blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return self.name
@@ -114,6 +121,7 @@ class Official(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='officials')
     active = models.BooleanField(default=True)
     proficiency = models.CharField(max_length=20, choices=PROFICIENCY_CHOICES, default='Beginner')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return self.name
@@ -138,6 +146,7 @@ class Meet(models.Model):
     meet_type = models.CharField(max_length=20, choices=MEET_TYPE_CHOICES, default='dual')
     weather_forecast = models.JSONField(null=True, blank=True)
     strategy = models.ForeignKey('Strategy', on_delete=models.SET_NULL, null=True, blank=True, related_name='meets')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return f"{self.name} - {self.date}"
@@ -151,6 +160,7 @@ class Assignment(models.Model):
     assigned_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
     confirmed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         unique_together = ('meet', 'official', 'role')
@@ -310,11 +320,29 @@ class MeetSchedule(models.Model):
     BUILD_CHOICES = [
         ("LIGHTEST", "Lightest"),
         ("HEAVIEST", "Heaviest"),
+        ("OPTIMAL", "Optimal"),
+        ("PORTFOLIO", "Portfolio"),
     ]
 
     meet = models.ForeignKey(Meet, on_delete=models.CASCADE, related_name='schedules')
     name = models.CharField(max_length=255)
     build_option = models.CharField(max_length=20, choices=BUILD_CHOICES)
+    grid_data = models.BinaryField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Encoded event x position grid (see officials.services.schedule_storage)"
+    )
+    official_loads = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="{official id: [slots, heavy slots]} worked in this schedule (see officials.services.season_load)"
+    )
+    season_counted = models.BooleanField(
+        default=False,
+        help_text="Whether this is the schedule the meet counts towards its officials' season loads"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -322,3 +350,161 @@ class MeetSchedule(models.Model):
 
     def __str__(self):
         return self.name
+
+    @cached_property
+    def packed(self):
+        """Decoded view of grid_data, or None for a schedule without a grid."""
+        from officials.services.schedule_storage import PackedSchedule
+        return PackedSchedule(self.grid_data) if self.grid_data else None
+
+
+class PublishedSchedule(models.Model):
+    """
+    A MeetSchedule as published to a meet's officials and families.
+
+    The HTML page and JSON form are rendered once when the schedule is
+    published and never change afterwards; publishing again adds a new row.
+    A meet shows its newest publication (see officials.services.schedule_publish).
+    """
+    meet = models.ForeignKey(Meet, on_delete=models.CASCADE, related_name='published_schedules')
+    schedule = models.ForeignKey(
+        MeetSchedule,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='publications',
+        help_text="Schedule this was rendered from; kept published if the schedule is deleted"
+    )
+    html = models.TextField(editable=False)
+    json = models.TextField(editable=False)
+    etag = models.CharField(max_length=64, editable=False, help_text="Hash of the rendered content")
+    published_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    published_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        ordering = ['-published_at', '-id']
+        indexes = [models.Index(fields=['meet', '-published_at', '-id'], name='published_schedule_newest')]
+
+    def __str__(self):
+        return f"{self.meet} published {self.published_at:%Y-%m-%d %H:%M}"
+
+
+class PublishedSlot(models.Model):
+    """
+    One official's slot in a meet's current published schedule.
+
+    Index for per-official feeds: rows are written when a schedule is
+    published and replaced when the meet publishes again, so an official's
+    slots are found by official id without decoding any schedule grid. Event
+    and position details are copied from the publication, which never changes.
+    """
+    official = models.ForeignKey(Official, on_delete=models.CASCADE, related_name='published_slots')
+    meet = models.ForeignKey(Meet, on_delete=models.CASCADE, related_name='published_slots')
+    publication = models.ForeignKey(PublishedSchedule, on_delete=models.CASCADE, related_name='slots')
+    event_number = models.PositiveSmallIntegerField()
+    event_name = models.CharField(max_length=100)
+    role = models.CharField(max_length=100)
+    location = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        ordering = ['meet', 'event_number', 'role']
+        indexes = [models.Index(fields=['official', 'meet'], name='published_slot_official_meet')]
+
+    def __str__(self):
+        return f"{self.official} - {self.role} in event {self.event_number} at {self.meet}"
+
+
+class OfficialSeasonLoad(models.Model):
+    """
+    Rolling workload of an official over one season.
+
+    Each meet counts its newest schedule. The totals are adjusted as schedules
+    are saved, repaired or deleted rather than re-aggregated on every build.
+    """
+    official = models.ForeignKey(Official, on_delete=models.CASCADE, related_name='season_loads')
+    season = models.PositiveSmallIntegerField(help_text="Year of the meets counted")
+    slots = models.IntegerField(default=0)
+    heavy_slots = models.IntegerField(
+        default=0,
+        help_text="Slots in positions requiring at least SEASON_HEAVY_POSITION_LEVEL certification"
+    )
+    meets = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('official', 'season')
+        ordering = ['season', 'official']
+
+    def __str__(self):
+        return f"{self.official} - {self.season}: {self.slots} slot(s) in {self.meets} meet(s)"
+
+
+class ScheduleJob(models.Model):
+    """
+    A schedule build running in the background job runner.
+
+    Either a single meet's build (`meet` set) or a league-wide build over a
+    date range (`league`, `start_date` and `end_date` set).
+    """
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    meet = models.ForeignKey(Meet, on_delete=models.CASCADE, null=True, blank=True, related_name='schedule_jobs')
+    league = models.ForeignKey(
+        League, on_delete=models.CASCADE, null=True, blank=True, related_name='schedule_jobs'
+    )
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True)
+    build_option = models.CharField(max_length=20, choices=MeetSchedule.BUILD_CHOICES)
+    improve_ms = models.PositiveIntegerField(
+        default=0, help_text="Time budget for the local-search improvement pass; 0 skips it"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='QUEUED')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    message = models.CharField(max_length=255, blank=True)
+    schedule = models.ForeignKey(
+        MeetSchedule, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs'
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='schedule_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        target = self.meet if self.meet_id else f"{self.league} {self.start_date}"
+        return f"{self.get_build_option_display()} build for {target} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in ('DONE', 'FAILED')
+
+
+class Tombstone(models.Model):
+    """
+    A deleted row, kept so delta-sync clients can drop their copy.
+
+    `collection` is the sync collection the row belonged to and `league_id`
+    the league it was visible through, or null for rows every user sees
+    (see officials.services.delta_sync). Pruned after API_SYNC_TOMBSTONE_DAYS.
+    """
+    collection = models.CharField(max_length=30)
+    object_id = models.PositiveIntegerField()
+    league_id = models.PositiveIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['deleted_at']
+
+    def __str__(self):
+        return f"{self.collection} {self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
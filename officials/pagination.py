@@ -0,0 +1,134 @@
+"""
+Keyset (cursor) pagination for the API viewsets.
+
+DRF's CursorPagination only pages on one field of the model itself; the API
+lists are ordered by related fields such as `-meet__date, official__name`.
+KeysetPagination pages on the viewset queryset's whole ordering, with the
+primary key appended so the ordering is unique. A cursor holds the ordering
+values of the row a page ended on, and the next page is fetched with a
+"sorts after these values" filter, so every page costs the same query
+however deep into the list it is. Rows inserted or deleted between requests
+never shift a page.
+
+Ordering fields are expected to be non-null.
+"""
+import json
+from base64 import b64decode, b64encode
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+_KEY = 'keyset_{}'
+
+
+def _field(ordering):
+    return ordering.lstrip('-')
+
+
+def _unique_ordering(queryset):
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering or [])
+    if not {'pk', '-pk', 'id', '-id'} & set(ordering):
+        ordering.append('pk')
+    return tuple(ordering)
+
+
+def _after(ordering, values):
+    """Q for rows that sort strictly after `values` under `ordering`."""
+    condition = Q()
+    for i, field in enumerate(ordering):
+        step = Q(**{f'{_field(field)}__{"lt" if field.startswith("-") else "gt"}': values[i]})
+        for prior, value in zip(ordering[:i], values):
+            step &= Q(**{_field(prior): value})
+        condition |= step
+    return condition
+
+
+def _reversed(ordering):
+    return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on the queryset's ordering.
+
+    The page size is PAGE_SIZE from REST_FRAMEWORK; clients may ask for up to
+    API_MAX_PAGE_SIZE rows with `?page_size=`.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE or 100
+        maximum = getattr(settings, 'API_MAX_PAGE_SIZE', 1000)
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return min(page_size, maximum)
+        return max(1, min(requested, maximum))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')))
+            values, reverse = cursor['v'], bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, row, reverse):
+        values = [getattr(row, _KEY.format(i)) for i in range(len(self.ordering))]
+        token = {'v': values, 'r': 1} if reverse else {'v': values}
+        encoded = b64encode(json.dumps(token, cls=DjangoJSONEncoder, separators=(',', ':')).encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = _unique_ordering(queryset)
+        cursor = self.decode_cursor(request)
+        values, reverse = cursor if cursor else (None, False)
+
+        ordering = _reversed(self.ordering) if reverse else self.ordering
+        queryset = queryset.annotate(**{_KEY.format(i): F(_field(field)) for i, field in enumerate(self.ordering)})
+        if values is not None:
+            queryset = queryset.filter(_after(ordering, values))
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_link = self.previous_link = None
+        if rows:
+            if more or reverse:
+                self.next_link = self.encode_cursor(rows[-1], False)
+            if (more and reverse) or (values is not None and not reverse):
+                self.previous_link = self.encode_cursor(rows[0], True)
+        elif reverse:
+            self.next_link = remove_query_param(self.base_url, self.cursor_query_param)
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.next_link, 'previous': self.previous_link, 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -4,94 +4,197 @@ from .models import League, Certification, Division, Team, Official, Meet, Pool,
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+
+def _is_top_level(serializer):
+    parent = serializer.parent.parent if isinstance(serializer.parent, serializers.ListSerializer) else serializer.parent
+    return parent is None
+
+
+class SparseFieldsMixin:
+    """
+    Lets API clients ask for a subset of fields with `?fields=id,name,...`.
+
+    The viewset passes the requested names as context['fields'] and loads
+    only the columns behind them (see api_views.QueryPlanMixin). Unknown
+    names are ignored; when none of the names is known every field is
+    returned. Nested serializers keep all their fields.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested and _is_top_level(self):
+            kept = {name: field for name, field in fields.items() if name in requested}
+            if kept:
+                return kept
+        return fields
+
+
+class ExpandableFieldsMixin:
+    """
+    Lets API clients inline related objects with `?expand=name,...`.
+
+    `expandable_fields` maps a field name to the (serializer class, kwargs)
+    that replaces its primary key when the field is expanded. The viewset
+    passes the requested names as context['expand'] and prefetches the rows
+    they need (see api_views.QueryPlanMixin). Only the top-level object is
+    expanded; nested serializers keep their own fields.
+    """
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if _is_top_level(self):
+            for name in self.context.get('expand', ()):
+                if name in self.expandable_fields:
+                    serializer_class, kwargs = self.expandable_fields[name]
+                    fields[name] = serializer_class(read_only=True, **kwargs)
+        return fields
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Writes a validated batch with one bulk_create or bulk_update.
+
+    For updates the serializer is given the candidate instances and each item
+    names its row by `id`. Only for models without many-to-many fields: bulk
+    writes skip save() and signals, so callers handle those side effects.
+    auto_now columns are stamped here, as bulk_update leaves them alone.
+    """
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+        if not hasattr(self, '_matched'):
+            self._candidates = {str(instance.pk): instance for instance in self.instance}
+            self._matched = []
+            self._listed = set()
+        key = str(data.get('id')) if isinstance(data, dict) else None
+        instance = self._candidates.get(key)
+        if instance is None:
+            raise serializers.ValidationError({'id': ['No object with this id.']})
+        if key in self._listed:
+            raise serializers.ValidationError({'id': ['This object is listed more than once.']})
+        self._listed.add(key)
+        self.child.instance = instance
+        self.child.initial_data = data
+        validated = super().run_child_validation(data)
+        self._matched.append(instance)
+        return validated
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create([model(**attrs) for attrs in validated_data])
+
+    def update(self, instances, validated_data):
+        fields = set()
+        for instance, attrs in zip(self._matched, validated_data):
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+            fields.update(attrs)
+        if fields:
+            model = self.child.Meta.model
+            stamped = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+            for instance in self._matched:
+                for field in stamped:
+                    field.pre_save(instance, add=False)
+            model.objects.bulk_update(self._matched, sorted(fields | {field.name for field in stamped}))
+        return self._matched
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name']
 
-class LeagueSerializer(serializers.ModelSerializer):
+class LeagueSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     users = UserSerializer(many=True, read_only=True) # Or use serializers.PrimaryKeyRelatedField for writable
 
     class Meta:
         model = League
         fields = ['id', 'name', 'description', 'founded_year', 'logo', 'users']
 
-class CertificationSerializer(serializers.ModelSerializer):
+class CertificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Certification
         fields = ['id', 'name', 'abbreviation', 'description', 'level']
 
 
-class DivisionSerializer(serializers.ModelSerializer):
+class DivisionSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     league = serializers.PrimaryKeyRelatedField(queryset=League.objects.all())
-    # To show nested League details instead of just ID:
-    # league = LeagueSerializer(read_only=True) 
+    expandable_fields = {'league': (LeagueSerializer, {})}
 
     class Meta:
         model = Division
         fields = ['id', 'name', 'description', 'league']
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     division = serializers.PrimaryKeyRelatedField(queryset=Division.objects.all())
     users = UserSerializer(many=True, read_only=True) # Or PrimaryKeyRelatedField for writable
-    # To show nested Division details:
-    # division = DivisionSerializer(read_only=True)
+    expandable_fields = {'division': (DivisionSerializer, {})}
 
     class Meta:
         model = Team
         fields = ['id', 'name', 'abbreviation', 'mascot', 'division', 'logo', 'address', 'website', 'users']
 
 
-class OfficialSerializer(serializers.ModelSerializer):
+class OfficialSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     certification = serializers.PrimaryKeyRelatedField(queryset=Certification.objects.all(), allow_null=True)
     team = serializers.PrimaryKeyRelatedField(queryset=Team.objects.all())
-    # To show nested details:
-    # certification = CertificationSerializer(read_only=True)
-    # team = TeamSerializer(read_only=True)
+    expandable_fields = {
+        'certification': (CertificationSerializer, {}),
+        'team': (TeamSerializer, {}),
+    }
 
     class Meta:
         model = Official
         fields = ['id', 'name', 'email', 'phone', 'certification', 'team', 'active', 'proficiency']
+        list_serializer_class = BulkListSerializer
 
 
-class PoolSerializer(serializers.ModelSerializer):
+class PoolSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     team = serializers.PrimaryKeyRelatedField(queryset=Team.objects.all())
-    # To show nested Team details:
-    # team = TeamSerializer(read_only=True)
+    expandable_fields = {'team': (TeamSerializer, {})}
 
     class Meta:
         model = Pool
         fields = ['id', 'name', 'address', 'length', 'units', 'lanes', 'bidirectional', 'team']
 
 
-class MeetSerializer(serializers.ModelSerializer):
+class MeetSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     league = serializers.PrimaryKeyRelatedField(queryset=League.objects.all())
     host_team = serializers.PrimaryKeyRelatedField(queryset=Team.objects.all())
     pool = serializers.PrimaryKeyRelatedField(queryset=Pool.objects.all(), allow_null=True, required=False)
     participating_teams = serializers.PrimaryKeyRelatedField(queryset=Team.objects.all(), many=True)
-    # To show nested details:
-    # league = LeagueSerializer(read_only=True)
-    # host_team = TeamSerializer(read_only=True)
-    # pool = PoolSerializer(read_only=True)
-    # participating_teams = TeamSerializer(many=True, read_only=True)
+    expandable_fields = {
+        'league': (LeagueSerializer, {}),
+        'host_team': (TeamSerializer, {}),
+        'pool': (PoolSerializer, {}),
+        'participating_teams': (TeamSerializer, {'many': True}),
+    }
 
     class Meta:
         model = Meet
         fields = ['id', 'name', 'date', 'league', 'host_team', 'pool', 'participating_teams', 'meet_type', 'weather_forecast']
 
 
-class AssignmentSerializer(serializers.ModelSerializer):
+class AssignmentSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     meet = serializers.PrimaryKeyRelatedField(queryset=Meet.objects.all())
     official = serializers.PrimaryKeyRelatedField(queryset=Official.objects.all())
     assigned_at = serializers.DateTimeField(read_only=True)
+    expandable_fields = {
+        'meet': (MeetSerializer, {}),
+        'official': (OfficialSerializer, {}),
+    }
 
     class Meta:
         model = Assignment
         fields = ['id', 'meet', 'official', 'role', 'assigned_at', 'notes', 'confirmed']
+        list_serializer_class = BulkListSerializer
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
@@ -100,7 +203,7 @@ class EventSerializer(serializers.ModelSerializer):
         fields = ['id', 'event_number', 'name', 'description', 'meet_type', 'gender', 'created_at', 'updated_at']
 
 
-class StrategySerializer(serializers.ModelSerializer):
+class StrategySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
@@ -109,8 +212,9 @@ class StrategySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'created_at', 'updated_at']
 
 
-class PositionSerializer(serializers.ModelSerializer):
+class PositionSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     strategy = serializers.PrimaryKeyRelatedField(queryset=Strategy.objects.all())
+    expandable_fields = {'strategy': (StrategySerializer, {})}
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
@@ -119,9 +223,13 @@ class PositionSerializer(serializers.ModelSerializer):
         fields = ['id', 'role', 'strategy', 'location', 'created_at', 'updated_at']
 
 
-class UserLeagueAdminSerializer(serializers.ModelSerializer):
+class UserLeagueAdminSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
     league = serializers.PrimaryKeyRelatedField(queryset=League.objects.all())
+    expandable_fields = {
+        'user': (UserSerializer, {}),
+        'league': (LeagueSerializer, {}),
+    }
     created_at = serializers.DateTimeField(read_only=True)
 
     class Meta:
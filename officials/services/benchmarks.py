@@ -0,0 +1,257 @@
+"""
+Benchmarks for the scheduling, assignment, import and list-view paths.
+
+run_benchmarks() times each case against a SyntheticLeague (see
+synthetic_league) and returns BenchmarkResults: wall times per run plus the
+number of queries one run issues. benchmark_report() wraps them with enough
+context (commit, scale, database) to compare two runs, and compare_reports()
+lists the cases whose median got slower.
+
+Views are requested through the test client so middleware, templates and
+serializers are included, logged in as the synthetic league's staff user.
+"""
+import io
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+
+import django
+import openpyxl
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from officials.services import schedule_cache
+from officials.services.event_importer import EventImporter
+from officials.services.league_builder import build_league_schedules
+from officials.services.schedule_builder import build_schedule
+from officials.views_meets import _auto_assign_participating_officials
+
+REPORT_VERSION = 1
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    timings_ms: list = field(default_factory=list)
+    queries: int = 0
+    detail: dict = field(default_factory=dict)
+
+    @property
+    def median_ms(self):
+        return statistics.median(self.timings_ms)
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'runs': len(self.timings_ms),
+            'min_ms': round(min(self.timings_ms), 3),
+            'median_ms': round(self.median_ms, 3),
+            'max_ms': round(max(self.timings_ms), 3),
+            'queries': self.queries,
+            'timings_ms': [round(t, 3) for t in self.timings_ms],
+            'detail': self.detail,
+        }
+
+
+def time_case(name, run, repeat=3, setup=None):
+    """
+    Time `run()` `repeat` times, calling `setup()` untimed before each run.
+
+    Queries are counted on the first run. Whatever the last run returned is
+    kept in the result's detail when it is a dict.
+    """
+    result = BenchmarkResult(name=name)
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            outcome = run()
+            result.timings_ms.append((time.perf_counter() - start) * 1000)
+        if i == 0:
+            result.queries = len(queries)
+        if isinstance(outcome, dict):
+            result.detail = outcome
+    return result
+
+
+def _events_workbook(count):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.append(EventImporter.REQUIRED_HEADERS)
+    for n in range(1, count + 1):
+        worksheet.append([n, f'Event {n}', 'dual', 'male' if n % 2 else 'female'])
+    return _saved(workbook)
+
+
+def _officials_workbook(team, count):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.append(['name', 'email', 'proficiency', 'certification'])
+    for n in range(1, count + 1):
+        worksheet.append([f'Imported {team.pk}-{n}', f'imported{team.pk}-{n}@example.com', 'b', 'Timer'])
+    return _saved(workbook)
+
+
+def _saved(workbook):
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def _build_cases(data, repeat):
+    meet = data.meets[0]
+
+    def build(option):
+        def run():
+            result = build_schedule(meet, option)
+            return {'slots': result.total_slots, 'filled': result.filled_slots, 'cached': result.cached}
+        return run
+
+    def league_build():
+        outcomes = build_league_schedules(data.league, data.meet_date, workers=1)
+        return {'meets': len(outcomes), 'built': sum(1 for outcome in outcomes if outcome.ok)}
+
+    cold = lambda: schedule_cache.invalidate_meet(meet.id)  # noqa: E731
+    return [
+        time_case('build_schedule.lightest', build('LIGHTEST'), repeat, setup=cold),
+        time_case('build_schedule.lightest_cached', build('LIGHTEST'), repeat),
+        time_case('build_schedule.optimal', build('OPTIMAL'), repeat, setup=cold),
+        time_case('build_league_schedules', league_build, repeat, setup=schedule_cache.invalidate_all),
+    ]
+
+
+def _auto_assign_cases(data, repeat):
+    meet = data.open_meet
+    return [
+        time_case(
+            'auto_assign',
+            lambda: {'created': _auto_assign_participating_officials(meet)},
+            repeat,
+            setup=lambda: meet.assignments.all().delete(),
+        ),
+    ]
+
+
+def _import_cases(data, client, repeat):
+    events_file = _events_workbook(min(data.scale.events, 99))
+    team = data.meets[0].host_team
+    officials_file = _officials_workbook(team, data.scale.officials_per_team)
+
+    def import_events():
+        result = EventImporter().import_events(io.BytesIO(events_file))
+        return {'created': result.created_count, 'updated': result.updated_count}
+
+    def import_officials():
+        upload = io.BytesIO(officials_file)
+        upload.name = 'officials.xlsx'
+        response = client.post(reverse('team_import_officials', args=[team.pk]), {'excel_file': upload})
+        return {'status': response.status_code}
+
+    return [
+        time_case('import.events', import_events, repeat),
+        time_case('import.officials', import_officials, repeat),
+    ]
+
+
+VIEW_CASES = [
+    ('view.official_list', 'official_list', None),
+    ('view.assignment_list', 'assignment_list', None),
+    ('view.meet_list', 'meet_list', None),
+    ('view.team_list', 'team_list', None),
+    ('view.meet_configure', 'meet_configure', 'meet'),
+    ('api.officials', 'official-list', None),
+    ('api.assignments', 'assignment-list', None),
+    ('api.meets', 'meet-list', None),
+]
+
+
+def _view_cases(data, client, repeat):
+    results = []
+    for name, url_name, arg in VIEW_CASES:
+        url = reverse(url_name, args=[data.meets[0].pk] if arg == 'meet' else [])
+
+        def get(url=url):
+            response = client.get(url)
+            return {'status': response.status_code, 'bytes': len(response.content)}
+
+        results.append(time_case(name, get, repeat))
+    return results
+
+
+GROUPS = ('build', 'auto_assign', 'import', 'views')
+
+
+def run_benchmarks(data, repeat=3, groups=GROUPS):
+    """Run the benchmark `groups` against a SyntheticLeague; returns BenchmarkResults."""
+    client = Client()
+    client.force_login(data.user)
+    results = []
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        if 'build' in groups:
+            results += _build_cases(data, repeat)
+        if 'auto_assign' in groups:
+            results += _auto_assign_cases(data, repeat)
+        if 'import' in groups:
+            results += _import_cases(data, client, repeat)
+        if 'views' in groups:
+            results += _view_cases(data, client, repeat)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_report(data, results, generate_ms=None):
+    """JSON-ready report of a benchmark run."""
+    scale = data.scale
+    return {
+        'version': REPORT_VERSION,
+        'commit': _git_commit(),
+        'timestamp': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'scale': {
+            'divisions': scale.divisions,
+            'teams': scale.teams,
+            'officials': scale.officials,
+            'events': scale.events,
+            'positions': scale.positions,
+            'meets': len(data.meets),
+        },
+        'generate_ms': round(generate_ms, 3) if generate_ms is not None else None,
+        'results': [result.as_dict() for result in results],
+    }
+
+
+def compare_reports(baseline, current, threshold=0.1):
+    """
+    Compare two benchmark_report() dicts case by case.
+
+    Returns (name, baseline median, current median, ratio, regressed) tuples
+    for the cases in both reports. A case regressed when its median grew by
+    more than `threshold` or it issues more queries than before.
+    """
+    before = {case['name']: case for case in baseline.get('results', [])}
+    rows = []
+    for case in current.get('results', []):
+        old = before.get(case['name'])
+        if old is None:
+            continue
+        ratio = case['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        regressed = ratio > 1 + threshold or case['queries'] > old['queries']
+        rows.append((case['name'], old['median_ms'], case['median_ms'], ratio, regressed))
+    return rows
@@ -0,0 +1,46 @@
+"""
+Cross-meet booking index: which meets each official is assigned to on a date.
+
+The index is loaded for a set of dates (and optionally officials) with one
+query over Assignment joined to Meet.date. After that, checking whether an
+official is already committed to another meet that day is a dictionary lookup,
+so screening a whole roster costs one query instead of one per official.
+"""
+from collections import defaultdict
+
+from officials.models import Assignment
+
+
+class BookingIndex:
+    """{(official id, date): {meet id: confirmed}} for the loaded dates."""
+
+    def __init__(self, rows=()):
+        self._bookings = defaultdict(dict)
+        for official_id, meet_id, meet_date, confirmed in rows:
+            self.add(official_id, meet_date, meet_id, confirmed)
+
+    @classmethod
+    def for_dates(cls, dates, official_ids=None):
+        """Load the assignments on `dates`, optionally only for `official_ids`."""
+        assignments = Assignment.objects.filter(meet__date__in=set(dates))
+        if official_ids is not None:
+            assignments = assignments.filter(official_id__in=set(official_ids))
+        return cls(assignments.values_list('official_id', 'meet_id', 'meet__date', 'confirmed'))
+
+    def add(self, official_id, meet_date, meet_id, confirmed=False):
+        # An official can hold several roles at one meet; any confirmed role commits them.
+        meets = self._bookings[(official_id, meet_date)]
+        meets[meet_id] = meets.get(meet_id, False) or confirmed
+
+    def other_meets(self, official_id, meet):
+        """{meet id: confirmed} for the official's other meets on `meet`'s date."""
+        meets = self._bookings.get((official_id, meet.date), {})
+        return {meet_id: confirmed for meet_id, confirmed in meets.items() if meet_id != meet.id}
+
+    def confirmed_elsewhere(self, official_id, meet):
+        """Ids of other meets that day where the official holds a confirmed assignment."""
+        return [meet_id for meet_id, confirmed in self.other_meets(official_id, meet).items() if confirmed]
+
+    def double_booked(self, meet, official_ids):
+        """The officials among `official_ids` confirmed at another meet on `meet`'s date."""
+        return [official_id for official_id in official_ids if self.confirmed_elsewhere(official_id, meet)]
@@ -0,0 +1,277 @@
+"""
+Delta sync for offline clients.
+
+A client sends the token from its previous sync and gets back only the rows
+created or updated since then, by `updated_at`, plus the ids of rows deleted
+since then, from Tombstone rows written when anything in COLLECTIONS is
+deleted. Without a token, or when the old one can no longer be answered, the
+client gets every row it can see and is told to reset its copy.
+
+Users see the league-scoped collections of the leagues they belong to (staff
+see every league) and every row of the reference collections. A token records
+that scope, so a user joining or leaving a league gets a reset rather than a
+delta that misses rows they can now see or still holds rows they cannot. A
+row that moves to another league (an official changing team, say) is
+tombstoned for the league it left, together with the rows scoped through it.
+
+A sync is served in pages of API_SYNC_PAGE_SIZE entries: tombstones first,
+then each collection in COLLECTIONS order, by primary key. While "more" is
+set the token continues the same sync; the last page's token starts the next
+one. That token starts API_SYNC_OVERLAP_SECONDS before the sync began, so
+rows written by transactions that committed after the read are picked up
+next time. Clients therefore see some rows twice and should upsert by id,
+applying each page's deletions before its changes.
+"""
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import SET_NULL, Q
+from django.utils import timezone
+
+from officials.models import (
+    Assignment, Certification, Division, Event, League, Meet, Official, Pool, Position, Strategy, Team, Tombstone,
+)
+
+# Sync collection name, model and the lookup from the model to its league
+# (None for reference data every user sees).
+COLLECTIONS = (
+    ('leagues', League, 'pk'),
+    ('divisions', Division, 'league'),
+    ('teams', Team, 'division__league'),
+    ('pools', Pool, 'team__division__league'),
+    ('officials', Official, 'team__division__league'),
+    ('meets', Meet, 'league'),
+    ('assignments', Assignment, 'meet__league'),
+    ('certifications', Certification, None),
+    ('events', Event, None),
+    ('strategies', Strategy, None),
+    ('positions', Position, None),
+)
+SYNCED_MODELS = {model: (name, path) for name, model, path in COLLECTIONS}
+
+
+class InvalidToken(ValueError):
+    """The token was not issued by this server."""
+
+
+@dataclass(frozen=True)
+class SyncBatch:
+    token: str
+    reset: bool
+    more: bool      # further pages follow; call again with `token`
+    changed: dict   # collection name -> queryset of changed rows
+    deleted: dict   # collection name -> ids of deleted rows
+
+
+@dataclass(frozen=True)
+class _Position:
+    since: datetime = None   # None: every visible row
+    until: datetime = None   # where the next sync starts, fixed by the first page
+    phase: int = 0           # 0 for tombstones, then 1 + index into COLLECTIONS
+    after: int = 0           # last primary key sent in this phase
+
+
+def overlap():
+    return timedelta(seconds=getattr(settings, 'API_SYNC_OVERLAP_SECONDS', 30))
+
+
+def retention():
+    return timedelta(days=getattr(settings, 'API_SYNC_TOMBSTONE_DAYS', 30))
+
+
+def page_size():
+    return getattr(settings, 'API_SYNC_PAGE_SIZE', 1000)
+
+
+def visible_leagues(user):
+    """Ids of the leagues whose rows the user can see, or None for all of them."""
+    if user.is_staff:
+        return None
+    return set(user.leagues.values_list('pk', flat=True))
+
+
+def _scope(leagues):
+    if leagues is None:
+        return 'all'
+    return hashlib.sha256(','.join(map(str, sorted(leagues))).encode()).hexdigest()[:16]
+
+
+def _stamp(moment):
+    return moment.isoformat() if moment else None
+
+
+def _encode(scope, since, position=None):
+    payload = {'s': scope, 't': _stamp(since)}
+    if position is not None:
+        payload['p'] = [_stamp(position.until), position.phase, position.after]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def _decode(token):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        since = payload['t'] and datetime.fromisoformat(payload['t'])
+        if 'p' not in payload:
+            return payload['s'], _Position(since=since), False
+        until, phase, after = payload['p']
+        return payload['s'], _Position(since, datetime.fromisoformat(until), int(phase), int(after)), True
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise InvalidToken(token) from exc
+
+
+def _resume(token, scope, now):
+    """Where this page starts, and whether the client must drop its copy first."""
+    fresh = _Position(until=now - overlap())
+    if not token:
+        return fresh, True
+    token_scope, position, continued = _decode(token)
+    if position.since is None and not continued:
+        raise InvalidToken(token)
+    if token_scope != scope or (position.since is not None and position.since < now - retention()):
+        return fresh, True
+    if not continued:
+        position = _Position(since=position.since, until=now - overlap())
+    return position, False
+
+
+def _visible(model, path, leagues):
+    rows = model.objects.all()
+    if path is None or leagues is None:
+        return rows
+    return rows.filter(**{f'{path}__in': leagues})
+
+
+def _tombstones(since, leagues):
+    tombstones = Tombstone.objects.filter(deleted_at__gte=since)
+    if leagues is not None:
+        tombstones = tombstones.filter(Q(league_id__in=leagues) | Q(league_id__isnull=True))
+    return tombstones
+
+
+def sync(user, token=None):
+    """One page of the user's rows changed since `token` (see module docstring); raises InvalidToken."""
+    leagues = visible_leagues(user)
+    scope = _scope(leagues)
+    position, reset = _resume(token, scope, timezone.now())
+    since, phase, after = position.since, position.phase, position.after
+    budget = page_size()
+    changed, deleted = {}, {}
+    while budget and phase <= len(COLLECTIONS):
+        if phase == 0:
+            entries = [] if since is None else list(
+                _tombstones(since, leagues).filter(pk__gt=after).order_by('pk')
+                .values_list('pk', 'collection', 'object_id')[:budget + 1]
+            )
+            page = [pk for pk, _collection, _object_id in entries[:budget]]
+            for _pk, collection, object_id in entries[:budget]:
+                deleted.setdefault(collection, []).append(object_id)
+        else:
+            name, model, path = COLLECTIONS[phase - 1]
+            rows = _visible(model, path, leagues)
+            if since is not None:
+                rows = rows.filter(updated_at__gte=since)
+            entries = list(rows.filter(pk__gt=after).order_by('pk').values_list('pk', flat=True)[:budget + 1])
+            page = entries[:budget]
+            if page:
+                changed[name] = rows.filter(pk__in=page).order_by('pk')
+        budget -= len(page)
+        if len(entries) > len(page):
+            after = page[-1]
+            break
+        phase, after = phase + 1, 0
+    if phase <= len(COLLECTIONS):
+        token = _encode(scope, since, _Position(since, position.until, phase, after))
+        return SyncBatch(token=token, reset=reset, more=True, changed=changed, deleted=deleted)
+    return SyncBatch(token=_encode(scope, position.until), reset=reset, more=False, changed=changed, deleted=deleted)
+
+
+def _league_of(instance, path, parent_id=None):
+    """The league `instance` is visible through; `parent_id` overrides its first foreign key."""
+    if path is None:
+        return None
+    if path == 'pk':
+        return instance.pk
+    first, _, rest = path.partition('__')
+    field = instance._meta.get_field(first)
+    if parent_id is None:
+        parent_id = getattr(instance, field.attname)
+    if not rest or parent_id is None:
+        return parent_id
+    # Cascades delete children before their parents, so the parent row is still there.
+    return field.related_model.objects.filter(pk=parent_id).values_list(rest, flat=True).first()
+
+
+@lru_cache(maxsize=None)
+def _scoped_through(model):
+    """(collection, model, lookup to `model`) for the collections whose league path runs through `model`."""
+    scoped = []
+    for name, other, path in COLLECTIONS:
+        if path is None or other is model:
+            continue
+        hops = path.split('__')[:-1]
+        related = other
+        for depth, hop in enumerate(hops, 1):
+            related = related._meta.get_field(hop).related_model
+            if related is model:
+                scoped.append((name, other, '__'.join(hops[:depth])))
+                break
+    return tuple(scoped)
+
+
+def record_scope_change(instance, previous=None):
+    """
+    Tombstone a row for the league it is leaving, with the rows scoped through it.
+
+    Called before a save, or after a bulk_update with `previous` holding the
+    row as it was; without `previous` the stored row is read. Rows scoped
+    through it are bumped so the new league's users receive them.
+    """
+    name, path = SYNCED_MODELS[type(instance)]
+    if path in (None, 'pk') or instance.pk is None:
+        return
+    attname = instance._meta.get_field(path.partition('__')[0]).attname
+    if previous is None:
+        old_parent = type(instance).objects.filter(pk=instance.pk).values_list(attname, flat=True).first()
+    else:
+        old_parent = getattr(previous, attname)
+    if old_parent is None or old_parent == getattr(instance, attname):
+        return
+    old_league = _league_of(instance, path, old_parent)
+    if old_league is None or old_league == _league_of(instance, path):
+        return
+    now = timezone.now()
+    tombstones = [Tombstone(collection=name, object_id=instance.pk, league_id=old_league, deleted_at=now)]
+    for scoped_name, model, lookup in _scoped_through(type(instance)):
+        rows = model.objects.filter(**{lookup: instance.pk})
+        tombstones += [
+            Tombstone(collection=scoped_name, object_id=pk, league_id=old_league, deleted_at=now)
+            for pk in rows.values_list('pk', flat=True)
+        ]
+        rows.update(updated_at=now)
+    Tombstone.objects.bulk_create(tombstones)
+
+
+def record_deletion(instance):
+    """Write the tombstone for a deleted row of a synced model."""
+    name, path = SYNCED_MODELS[type(instance)]
+    Tombstone.objects.create(collection=name, object_id=instance.pk, league_id=_league_of(instance, path))
+
+
+def touch_dependents(instance):
+    """Bump the synced rows whose foreign key to `instance` its deletion will null (on_delete=SET_NULL)."""
+    for relation in instance._meta.related_objects:
+        if relation.on_delete is SET_NULL and relation.related_model in SYNCED_MODELS:
+            relation.related_model.objects.filter(**{relation.field.name: instance}).update(updated_at=timezone.now())
+
+
+def prune_tombstones(now=None):
+    """Delete tombstones past retention; tokens that old get a reset instead. Returns the count."""
+    cutoff = (now or timezone.now()) - retention()
+    deleted, _by_model = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,190 @@
+"""
+Local background job runner for schedule builds.
+
+Builds run on a small thread pool inside the web process so a request only
+has to record the job and return its id. Job state lives on the ScheduleJob
+row rather than in process memory, so whichever web worker receives a
+progress poll can answer it.
+
+Set SCHEDULE_JOBS_EAGER = True to run jobs inline (used by the tests).
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from officials.models import ScheduleJob
+from officials.services.schedule_builder import ScheduleBuildError, build_schedule
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide job thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'SCHEDULE_JOB_WORKERS', 2),
+                thread_name_prefix='schedule-job',
+            )
+        return _executor
+
+
+def _update_job(job_id, **fields):
+    fields['updated_at'] = timezone.now()
+    ScheduleJob.objects.filter(pk=job_id).update(**fields)
+
+
+class JobProgress:
+    """
+    Progress callback for a job.
+
+    Maps a solver's 0..1 fraction onto the job's percentage and only writes
+    to the database when it has moved by at least `step` points.
+    """
+
+    def __init__(self, job_id, start=5, end=90, step=5):
+        self.job_id = job_id
+        self.start = start
+        self.end = end
+        self.step = step
+        self.reported = start
+
+    def __call__(self, fraction):
+        percent = int(self.start + (self.end - self.start) * fraction)
+        if percent - self.reported >= self.step:
+            _update_job(self.job_id, progress=percent)
+            self.reported = percent
+
+
+def submit_schedule_build(meet, option, user=None, improve_ms=0):
+    """
+    Queue a schedule build for a meet and return its ScheduleJob.
+
+    The job is handed to the thread pool once the surrounding transaction
+    commits, so the worker always sees the job row.
+    """
+    job = ScheduleJob.objects.create(
+        meet=meet,
+        build_option=option,
+        improve_ms=improve_ms or 0,
+        requested_by=user if user is not None and user.is_authenticated else None,
+        message='Waiting to start...',
+    )
+    return _dispatch(job, run_schedule_build)
+
+
+def submit_league_build(league, start_date, end_date, option, user=None):
+    """Queue a build of every meet in a league between two dates and return its ScheduleJob."""
+    job = ScheduleJob.objects.create(
+        league=league,
+        start_date=start_date,
+        end_date=end_date or start_date,
+        build_option=option,
+        requested_by=user if user is not None and user.is_authenticated else None,
+        message='Waiting to start...',
+    )
+    return _dispatch(job, run_league_build)
+
+
+def _dispatch(job, runner):
+    if getattr(settings, 'SCHEDULE_JOBS_EAGER', False):
+        runner(job.pk)
+        job.refresh_from_db()
+    else:
+        transaction.on_commit(lambda: get_executor().submit(_run_in_thread, runner, job.pk))
+    return job
+
+
+def run_schedule_build(job_id):
+    """Run a queued build job, recording progress and outcome on the job row."""
+    job = ScheduleJob.objects.select_related('meet').get(pk=job_id)
+    _update_job(job_id, status='RUNNING', progress=5, message='Building schedule...')
+    try:
+        result = build_schedule(
+            job.meet, job.build_option, progress=JobProgress(job_id), improve_ms=job.improve_ms or None
+        )
+    except ScheduleBuildError as e:
+        _update_job(job_id, status='FAILED', message=str(e)[:255])
+        return
+    except Exception as e:
+        logger.exception("Background schedule build %s failed for meet %s", job_id, job.meet_id)
+        _update_job(job_id, status='FAILED', message=f'Failed to create schedule: {e}'[:255])
+        return
+    message = (
+        f'Schedule "{result.schedule.name}" created ({job.get_build_option_display()}): '
+        f'{result.filled_slots} of {result.total_slots} slots filled.'
+    )
+    if result.cached:
+        message += ' Inputs were unchanged, so the previous build was reused.'
+    if result.portfolio is not None:
+        message += (
+            f' Best of {len(result.portfolio.runs)} candidates: {result.portfolio.best.label}'
+            f' in {result.portfolio.elapsed:.1f}s.'
+        )
+    if result.search is not None and result.search.score < result.search.initial_score:
+        message += f' Improvement pass lowered the schedule cost by {result.search.initial_score - result.search.score:.1f}.'
+    if result.unfilled_mandatory:
+        message += f' {result.unfilled_mandatory} mandatory slot(s) could not be filled.'
+    if result.double_booked:
+        message += f' {len(result.double_booked)} official(s) are also confirmed at another meet that day.'
+    _update_job(job_id, status='DONE', progress=100, schedule=result.schedule, message=message[:255])
+
+
+def run_league_build(job_id):
+    """Run a queued league-wide build job; the meets are solved on a process pool."""
+    from officials.services.league_builder import build_league_schedules
+
+    job = ScheduleJob.objects.select_related('league').get(pk=job_id)
+    _update_job(job_id, status='RUNNING', progress=5, message='Building schedules...')
+    try:
+        outcomes = build_league_schedules(
+            job.league, job.start_date, job.end_date, job.build_option,
+            workers=getattr(settings, 'LEAGUE_BUILD_WORKERS', None),
+            progress=JobProgress(job_id),
+        )
+    except Exception as e:
+        logger.exception("League schedule build %s failed for league %s", job_id, job.league_id)
+        _update_job(job_id, status='FAILED', message=f'Failed to create schedules: {e}'[:255])
+        return
+    built = sum(1 for outcome in outcomes if outcome.ok)
+    message = f'{built} of {len(outcomes)} meet schedule(s) created ({job.get_build_option_display()}).'
+    double_booked = sum(len(outcome.double_booked) for outcome in outcomes if outcome.ok)
+    if double_booked:
+        message += f' {double_booked} official booking(s) clash with another meet that day.'
+    failed = [outcome.meet.name for outcome in outcomes if not outcome.ok]
+    if failed:
+        message += ' Not built: ' + ', '.join(failed)
+    _update_job(job_id, status='DONE', progress=100, message=message[:255])
+
+
+def _run_in_thread(runner, job_id):
+    try:
+        runner(job_id)
+    except Exception:
+        logger.exception("Schedule job %s crashed", job_id)
+    finally:
+        # Worker threads hold their own connections; don't leak them between jobs.
+        connections.close_all()
+
+
+def job_payload(job):
+    """JSON-serialisable status of a job for the progress endpoint."""
+    return {
+        'id': str(job.pk),
+        'meet_id': job.meet_id,
+        'league_id': job.league_id,
+        'build_option': job.build_option,
+        'status': job.status,
+        'progress': job.progress,
+        'message': job.message,
+        'schedule_id': job.schedule_id,
+        'finished': job.is_finished,
+    }
@@ -0,0 +1,102 @@
+"""
+Per-lane expansion of generic positions.
+
+Strategies define lane-bound jobs such as timers, turn judges and order of
+finish judges once, as generic positions, but how many of each a meet needs
+depends on its pool: one timer per lane at every finish end, one stroke and
+turn judge per two lanes at every turn end, and so on. When a schedule is
+built each such position becomes one grid column per lane group and end,
+labelled "Lane 3" or "Lanes 1-2, Far End" (see schedule_storage).
+
+LANE_POSITION_RULES maps a role prefix (matched case-insensitively) to
+(lanes per slot, end), where end is 'finish' or 'turn' and 0 lanes per slot
+means one slot per end. Positions whose location already names a lane are
+left alone, as are meets without a pool.
+
+The labels depend only on the pool's geometry and the rule, so they are
+computed once per (lanes, length, bidirectional, rule) and cached for the
+life of the process; a build looks each position up once, not per event.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+
+FINISH = 'finish'
+TURN = 'turn'
+
+DEFAULT_RULES = {
+    'timer': (1, FINISH),
+    'snt turn': (2, TURN),
+    'oof': (0, FINISH),
+}
+
+END_LABELS = ('Near End', 'Far End')
+
+# A position that is not expanded keeps its single, unlabelled column.
+NOT_EXPANDED = (None,)
+
+
+def lane_rules():
+    return getattr(settings, 'LANE_POSITION_RULES', DEFAULT_RULES)
+
+
+def ends(end, length, bidirectional):
+    """How many ends of the pool staff a position working at `end`."""
+    if end == TURN:
+        # Short pools turn at both walls; long pools only at the far one unless
+        # events also start there.
+        return 2 if bidirectional or length <= 25 else 1
+    return 2 if bidirectional else 1
+
+
+def _lane_groups(lanes, per_slot):
+    if per_slot <= 0:
+        return [None]
+    groups = []
+    for first in range(1, lanes + 1, per_slot):
+        last = min(first + per_slot - 1, lanes)
+        groups.append(f'Lane {first}' if first == last else f'Lanes {first}-{last}')
+    return groups
+
+
+@lru_cache(maxsize=256)
+def lane_labels(lanes, length, bidirectional, per_slot, end):
+    """The column labels of a position under one rule at a pool of this geometry."""
+    end_labels = END_LABELS if ends(end, length, bidirectional) == 2 else (None,)
+    labels = tuple(
+        ', '.join(part for part in (group, end_label) if part)
+        for end_label in end_labels
+        for group in _lane_groups(lanes, per_slot)
+    )
+    if not labels or labels == ('',):
+        return NOT_EXPANDED
+    return tuple(label or None for label in labels)
+
+
+def position_rule(role):
+    """The (lanes per slot, end) rule for a role, or None. The longest matching prefix wins."""
+    role = (role or '').lower()
+    matches = [prefix for prefix in lane_rules() if role.startswith(prefix.lower())]
+    if not matches:
+        return None
+    return tuple(lane_rules()[max(matches, key=len)])
+
+
+def position_lanes(pool, role, location):
+    """
+    Lane labels for a position at a pool: one per grid column, or
+    NOT_EXPANDED when the position keeps a single column.
+    """
+    if pool is None or 'lane' in (location or '').lower():
+        return NOT_EXPANDED
+    rule = position_rule(role)
+    if rule is None:
+        return NOT_EXPANDED
+    return lane_labels(pool.lanes, pool.length, pool.bidirectional, *rule)
+
+
+def lane_location(location, lane):
+    """A position's location with its lane label, for display."""
+    if not lane:
+        return location
+    return f'{location}, {lane}' if location else lane
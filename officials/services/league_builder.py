@@ -0,0 +1,156 @@
+"""
+League-wide schedule generation.
+
+Builds a schedule for every meet of a league on a date, or in a date range.
+Inputs for all of the meets are loaded with a fixed number of queries, the
+solves run in parallel on a process pool (they are pure CPU work on plain
+lists, so threads would serialise on the GIL), and all of the schedules are
+written back with one bulk insert.
+"""
+import logging
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from officials.models import EventPosition, Meet, MeetSchedule
+from officials.services import schedule_cache, season_load
+from officials.services.booking_index import BookingIndex
+from officials.services.schedule_builder import (EVENT_POSITION_FIELDS, ScheduleBuildError, add_season_loads,
+                                                 confirmed_officials_by_meet, default_schedule_name,
+                                                 inputs_from_rows, schedule_loads, summarize)
+from officials.services.schedule_storage import encode_inputs
+from officials.services.solver_pool import solve_many
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MeetBuildOutcome:
+    """What happened to one meet of a league build."""
+    meet: Meet
+    schedule: MeetSchedule = None
+    total_slots: int = 0
+    filled_slots: int = 0
+    unfilled_mandatory: int = 0
+    error: str = ''
+    # Officials also confirmed at another meet on the same date.
+    double_booked: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not self.error
+
+
+def league_meets(league, start, end=None):
+    """Meets of a league dated from `start` to `end` inclusive (just `start` if no end)."""
+    return (
+        Meet.objects
+        .filter(league=league, date__gte=start, date__lte=end or start)
+        .select_related('pool')
+        .order_by('date', 'name', 'id')
+    )
+
+
+def load_league_inputs(meets):
+    """
+    Load ScheduleInputs for many meets with two queries.
+
+    Meets sharing a meet type and strategy share the same event positions, so
+    those rows are fetched once for all of them.
+
+    Returns {meet_id: ScheduleInputs or ScheduleBuildError}.
+    """
+    keys = {(meet.meet_type, meet.strategy_id) for meet in meets if meet.strategy_id}
+    rows_by_key = {key: [] for key in keys}
+    if keys:
+        event_positions = (
+            EventPosition.objects
+            .filter(
+                event__meet_type__in={meet_type for meet_type, _ in keys},
+                position__strategy_id__in={strategy_id for _, strategy_id in keys},
+            )
+            .order_by('event__event_number', 'position__role', 'position_id')
+            .values_list('event__meet_type', 'position__strategy_id', *EVENT_POSITION_FIELDS)
+        )
+        for meet_type, strategy_id, *row in event_positions:
+            if (meet_type, strategy_id) in rows_by_key:
+                rows_by_key[(meet_type, strategy_id)].append(tuple(row))
+
+    officials = confirmed_officials_by_meet([meet.id for meet in meets])
+    inputs = {}
+    for meet in meets:
+        try:
+            inputs[meet.id] = inputs_from_rows(
+                meet, rows_by_key.get((meet.meet_type, meet.strategy_id), []), officials.get(meet.id, {})
+            )
+        except ScheduleBuildError as e:
+            inputs[meet.id] = e
+    add_season_loads(meets, inputs)
+    return inputs
+
+
+def build_league_schedules(league, start, end=None, option='LIGHTEST', workers=None, progress=None):
+    """
+    Build a schedule for every meet of `league` between `start` and `end`.
+
+    Meets that cannot be built (no strategy, no confirmed officials, ...) are
+    reported in their outcome's `error` and do not stop the others.
+
+    Returns a list of MeetBuildOutcome in meet date order.
+    """
+    meets = list(league_meets(league, start, end))
+    outcomes = {meet.id: MeetBuildOutcome(meet=meet) for meet in meets}
+    inputs = load_league_inputs(meets)
+
+    buildable = []
+    for meet in meets:
+        if isinstance(inputs[meet.id], ScheduleBuildError):
+            outcomes[meet.id].error = str(inputs[meet.id])
+        else:
+            buildable.append(meet)
+
+    bookings = BookingIndex.for_dates(
+        {meet.date for meet in buildable},
+        {official_id for meet in buildable for official_id in inputs[meet.id].official_ids},
+    )
+    for meet in buildable:
+        outcomes[meet.id].double_booked = bookings.double_booked(meet, inputs[meet.id].official_ids)
+
+    # Meets whose inputs are unchanged since an earlier build skip the solve.
+    grids = [schedule_cache.get_cached_grid(inputs[meet.id], option) for meet in buildable]
+    to_solve = [i for i, grid in enumerate(grids) if grid is None]
+    solved_grids = solve_many([inputs[buildable[i].id] for i in to_solve], option, workers=workers, progress=progress)
+    for i, grid in zip(to_solve, solved_grids):
+        grids[i] = grid
+        if not isinstance(grid, Exception):
+            schedule_cache.store_grid(inputs[buildable[i].id], option, grid)
+
+    solved = []
+    for meet, grid in zip(buildable, grids):
+        if isinstance(grid, Exception):
+            logger.error("Schedule solve failed for meet %s: %s", meet.id, grid)
+            outcomes[meet.id].error = f'Failed to create schedule: {grid}'
+        else:
+            solved.append((meet, grid))
+
+    schedules = []
+    for meet, grid in solved:
+        grid_data = encode_inputs(inputs[meet.id], grid)
+        schedules.append(MeetSchedule(
+            meet=meet,
+            name=default_schedule_name(meet),
+            build_option=option,
+            grid_data=grid_data,
+            official_loads=schedule_loads(inputs[meet.id], grid_data),
+            season_counted=True,
+        ))
+    # Saved as counted, so the season loads must be added in the same transaction.
+    with transaction.atomic():
+        schedules = MeetSchedule.objects.bulk_create(schedules)
+        season_load.record_schedules(schedules)
+
+    for schedule, (meet, grid) in zip(schedules, solved):
+        outcome = outcomes[meet.id]
+        outcome.schedule = schedule
+        outcome.total_slots, outcome.filled_slots, outcome.unfilled_mandatory = summarize(inputs[meet.id], grid)
+    return [outcomes[meet.id] for meet in meets]
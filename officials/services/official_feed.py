@@ -0,0 +1,142 @@
+"""
+Per-official "my assignments" feed.
+
+An official's feed lists their upcoming meets: the assignments they hold and
+the slots they work in each meet's published schedule. Slots come from the
+PublishedSlot index, written when a schedule is published, so building a
+feed takes three queries keyed on the official: one picking their next meets
+in the database, one for their assignments in those meets and one for their
+slots. No schedule grid is decoded and the cost depends neither on how many
+schedules exist nor on how far ahead the official is booked.
+
+Feeds are cached for FEED_TIMEOUT per official and day, under a key that
+includes a version read from the database: the newest change to the
+official and their assignments and the newest publication that lists them,
+each with a row count so deletions count too. Every worker therefore sees
+such a change on its next request, even with a per-process cache. Other
+edits (a meet's time, say) show up when the entry expires.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from officials.models import Assignment, Meet, PublishedSlot
+from officials.services.lane_expansion import lane_location
+
+CACHE_PREFIX = 'official-feed'
+FEED_TIMEOUT = 60 * 5
+
+
+def feed_limit():
+    return getattr(settings, 'OFFICIAL_FEED_MEETS', 20)
+
+
+def feed_version(official):
+    """What the official's feed was built from, in two indexed queries."""
+    assignments = Assignment.objects.filter(official_id=official.id).aggregate(
+        changed=Max('updated_at'), count=Count('id')
+    )
+    slots = PublishedSlot.objects.filter(official_id=official.id).aggregate(
+        publication=Max('publication_id'), count=Count('id')
+    )
+    return hashlib.sha256(json.dumps([
+        official.updated_at, assignments['changed'], assignments['count'], slots['publication'], slots['count'],
+    ], default=str).encode()).hexdigest()[:16]
+
+
+def _key(official, today):
+    return f'{CACHE_PREFIX}:{official.id}:{today.isoformat()}:{feed_version(official)}'
+
+
+def index_publication(publication, document):
+    """Write the PublishedSlot rows of a publication from its JSON form (see schedule_publish)."""
+    positions = {position['id']: position for position in document['positions']}
+    PublishedSlot.objects.bulk_create([
+        PublishedSlot(
+            official_id=slot['official']['id'],
+            meet_id=publication.meet_id,
+            publication=publication,
+            event_number=event['number'],
+            event_name=event['name'],
+            role=positions[slot['position']]['role'],
+            location=lane_location(positions[slot['position']]['location'], slot.get('lane')) or '',
+        )
+        for event in document['events']
+        for slot in event['slots'] if slot['official']
+    ])
+
+
+def _meet_entry(meet):
+    return {
+        'id': meet.id,
+        'name': meet.name,
+        'date': meet.date.isoformat(),
+        'start_time': meet.start_time.isoformat() if meet.start_time else None,
+        'host_team': meet.host_team.name,
+        'pool': meet.pool.name if meet.pool else None,
+        'assignments': [],
+        'slots': [],
+    }
+
+
+def build_feed(official, today=None, limit=None):
+    """
+    The official's next `limit` meets from `today` on, with three queries.
+
+    Returns {'official': {...}, 'meets': [...]}; each meet lists the
+    official's assignments and published slots, in date order.
+    """
+    today = today or timezone.localdate()
+    limit = limit or feed_limit()
+    worked = Q(pk__in=Assignment.objects.filter(official_id=official.id).values('meet_id')) | Q(
+        pk__in=PublishedSlot.objects.filter(official_id=official.id).values('meet_id')
+    )
+    upcoming = (
+        Meet.objects.filter(worked, date__gte=today)
+        .select_related('host_team', 'pool')
+        .order_by('date', 'start_time', 'id')[:limit]
+    )
+    meets = {meet.id: _meet_entry(meet) for meet in upcoming}
+    assignments = (
+        Assignment.objects.filter(official_id=official.id, meet_id__in=list(meets))
+        .order_by('meet_id', 'role')
+        .values_list('meet_id', 'id', 'role', 'confirmed')
+    )
+    for meet_id, assignment_id, role, confirmed in assignments:
+        meets[meet_id]['assignments'].append({'id': assignment_id, 'role': role, 'confirmed': confirmed})
+    slots = (
+        PublishedSlot.objects.filter(official_id=official.id, meet_id__in=list(meets))
+        .order_by('meet_id', 'event_number', 'role')
+        .values_list('meet_id', 'event_number', 'event_name', 'role', 'location')
+    )
+    for meet_id, event_number, event_name, role, location in slots:
+        meets[meet_id]['slots'].append({
+            'event_number': event_number,
+            'event_name': event_name,
+            'role': role,
+            'location': location,
+        })
+    return {
+        'official': {'id': official.id, 'name': official.name, 'team': official.team.name},
+        'meets': list(meets.values()),
+    }
+
+
+def official_feed(official, today=None):
+    """
+    (feed, etag) for the official's upcoming meets, from the cache when
+    their version is unchanged. The ETag is a hash of the feed's JSON.
+    """
+    today = today or timezone.localdate()
+    key = _key(official, today)
+    cached = cache.get(key)
+    if cached is None:
+        feed = build_feed(official, today)
+        etag = hashlib.sha256(json.dumps(feed, sort_keys=True).encode()).hexdigest()
+        cached = (feed, etag)
+        cache.set(key, cached, FEED_TIMEOUT)
+    return cached
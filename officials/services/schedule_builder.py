@@ -0,0 +1,537 @@
+"""
+Schedule builder for meets.
+
+A build loads everything it needs with a couple of bulk queries, solves the
+event-by-position grid in memory and stores the result as one compact blob on
+the MeetSchedule row (see schedule_storage). The solver itself only works on
+plain lists so it can be reused outside a request (tests, management
+commands, worker processes).
+"""
+import logging
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from officials.models import Assignment, Event, EventPosition, MeetSchedule, Official, Position
+from officials.services import lane_expansion, schedule_cache, season_load
+from officials.services.booking_index import BookingIndex
+from officials.services.schedule_search import improve_schedule
+from officials.services.schedule_storage import PackedSchedule, encode, encode_inputs
+
+logger = logging.getLogger(__name__)
+
+# Grid cell markers. Any value >= 0 is an index into ScheduleInputs.official_ids.
+UNFILLED = -1
+NO_SLOT = -2
+
+PROFICIENCY_RANK = {value: rank for rank, (value, _label) in enumerate(Official.PROFICIENCY_CHOICES)}
+
+
+class ScheduleBuildError(Exception):
+    """Raised when a meet is not ready to have a schedule built."""
+    pass
+
+
+@dataclass
+class ScheduleInputs:
+    """Snapshot of a meet's build inputs, indexed by grid row/column."""
+    meet_id: int
+    event_ids: list
+    position_ids: list
+    position_levels: list
+    official_ids: list
+    official_levels: list
+    official_proficiency: list
+    slot_mask: list
+    mandatory_mask: list
+    # Season workload per official (see season_load.fairness); None outside season mode.
+    official_season_load: list = None
+    # Lane label of each column (see lane_expansion); None when no position was expanded.
+    position_lanes: list = None
+
+    @property
+    def shape(self):
+        return len(self.event_ids), len(self.position_ids)
+
+
+@dataclass
+class ScheduleResult:
+    """Outcome of a build: the persisted schedule plus fill statistics."""
+    schedule: MeetSchedule
+    total_slots: int
+    filled_slots: int
+    unfilled_mandatory: int
+    cached: bool = False
+    search: object = None
+    portfolio: object = None
+    # Officials also confirmed at another meet on the same date.
+    double_booked: list = None
+
+
+EVENT_POSITION_FIELDS = (
+    'event_id', 'position_id', 'position__role', 'position__location',
+    'position__minimum_certification__level', 'is_mandatory',
+)
+
+
+def load_schedule_inputs(meet):
+    """
+    Load the build inputs for a meet with two queries.
+
+    Rows are the meet type's events that have positions in the meet's strategy,
+    columns are those positions, expanded per lane for the meet's pool.
+    Officials are the distinct officials holding a confirmed assignment for
+    the meet.
+    """
+    if not meet.strategy_id:
+        raise ScheduleBuildError('Set a Strategy for this meet before building a schedule.')
+    event_positions = (
+        EventPosition.objects
+        .filter(event__meet_type=meet.meet_type, position__strategy_id=meet.strategy_id)
+        .order_by('event__event_number', 'position__role', 'position_id')
+        .values_list(*EVENT_POSITION_FIELDS)
+    )
+    inputs = inputs_from_rows(meet, list(event_positions), confirmed_officials(meet))
+    add_season_loads([meet], {meet.id: inputs})
+    return inputs
+
+
+def add_season_loads(meets, inputs_by_meet):
+    """
+    Fill in official_season_load on each meet's inputs when season balancing
+    is on (SCHEDULE_SEASON_BALANCE). Entries of `inputs_by_meet` that are not
+    ScheduleInputs are skipped.
+    """
+    if not getattr(settings, 'SCHEDULE_SEASON_BALANCE', True):
+        return
+    buildable = {meet_id: inputs for meet_id, inputs in inputs_by_meet.items() if isinstance(inputs, ScheduleInputs)}
+    if not buildable:
+        return
+    loads = season_load.season_loads(
+        [meet for meet in meets if meet.id in buildable],
+        {meet_id: inputs.official_ids for meet_id, inputs in buildable.items()},
+    )
+    for meet_id, inputs in buildable.items():
+        inputs.official_season_load = [season_load.fairness(loads[meet_id][o]) for o in inputs.official_ids]
+
+
+def schedule_loads(inputs, grid_data):
+    """MeetSchedule.official_loads for a grid encoded from `inputs`."""
+    return season_load.official_loads(PackedSchedule(grid_data), dict(zip(inputs.position_ids, inputs.position_levels)))
+
+
+def inputs_from_rows(meet, event_position_rows, officials):
+    """
+    Assemble ScheduleInputs from already-loaded rows.
+
+    Lane-bound positions get one column per lane group of the meet's pool
+    (see lane_expansion); the slot and mandatory flags apply to each of them.
+
+    Args:
+        meet: The Meet being built.
+        event_position_rows: EVENT_POSITION_FIELDS tuples for the meet's type and
+            strategy, ordered by event number then role.
+        officials: {official_id: (level, proficiency rank)} as returned by
+            confirmed_officials().
+    """
+    if not meet.strategy_id:
+        raise ScheduleBuildError('Set a Strategy for this meet before building a schedule.')
+    if not event_position_rows:
+        raise ScheduleBuildError('No event positions are defined for this meet type and strategy.')
+
+    # Rows follow event number; columns are ordered by role, matching the configure page.
+    event_index = {}
+    positions = {}
+    for event_id, position_id, role, location, min_level, _is_mandatory in event_position_rows:
+        event_index.setdefault(event_id, len(event_index))
+        positions.setdefault(position_id, (role, min_level or 0, location))
+
+    pool = meet.pool if meet.pool_id else None
+    position_ids, position_lanes, position_columns = [], [], {}
+    for pid in sorted(positions, key=lambda pid: (positions[pid][0], pid)):
+        role, _min_level, location = positions[pid]
+        lanes = lane_expansion.position_lanes(pool, role, location)
+        position_columns[pid] = range(len(position_ids), len(position_ids) + len(lanes))
+        position_ids.extend([pid] * len(lanes))
+        position_lanes.extend(lanes)
+
+    slot_mask = [[False] * len(position_ids) for _ in event_index]
+    mandatory_mask = [[False] * len(position_ids) for _ in event_index]
+    for event_id, position_id, _role, _location, _min_level, is_mandatory in event_position_rows:
+        e = event_index[event_id]
+        for p in position_columns[position_id]:
+            slot_mask[e][p] = True
+            mandatory_mask[e][p] = is_mandatory
+
+    if not officials:
+        raise ScheduleBuildError('There are no confirmed officials for this meet.')
+
+    return ScheduleInputs(
+        meet_id=meet.id,
+        event_ids=list(event_index),
+        position_ids=position_ids,
+        position_levels=[positions[pid][1] for pid in position_ids],
+        official_ids=list(officials),
+        official_levels=[level for level, _rank in officials.values()],
+        official_proficiency=[rank for _level, rank in officials.values()],
+        slot_mask=slot_mask,
+        mandatory_mask=mandatory_mask,
+        position_lanes=position_lanes if any(position_lanes) else None,
+    )
+
+
+def confirmed_officials(meet):
+    """
+    Return {official_id: (certification level, proficiency rank)} for the
+    active officials holding a confirmed assignment for the meet, in name order.
+    """
+    return confirmed_officials_by_meet([meet.id]).get(meet.id, {})
+
+
+def confirmed_officials_by_meet(meet_ids):
+    """confirmed_officials() for several meets in one query, keyed by meet id."""
+    official_rows = (
+        Assignment.objects
+        .filter(meet_id__in=meet_ids, confirmed=True, official__active=True)
+        .order_by('official__name', 'official_id')
+        .values_list('meet_id', 'official_id', 'official__certification__level', 'official__proficiency')
+    )
+    by_meet = {}
+    for meet_id, official_id, level, proficiency in official_rows:
+        # An official may hold several confirmed roles; they still work one slot per event.
+        by_meet.setdefault(meet_id, {}).setdefault(
+            official_id, (level or 0, PROFICIENCY_RANK.get(proficiency, 0))
+        )
+    return by_meet
+
+
+def _preference(option, levels, proficiency, loads, season=None):
+    """
+    Return the key ranking candidate officials for a slot; lowest wins.
+
+    The key takes the official and whether they held the same position in the
+    previous event. `levels`, `proficiency`, `loads` and the optional
+    `season` workloads are indexed the same way as the officials passed in
+    (list indices or ids).
+    """
+    if option == 'HEAVIEST':
+        return lambda o, stays: (not stays, -levels[o], -proficiency[o], -loads[o], o)
+    if season:
+        # Between officials equally loaded in this meet, the one who has worked less this season wins.
+        return lambda o, stays: (loads[o], season[o], not stays, levels[o], proficiency[o], o)
+    return lambda o, stays: (loads[o], not stays, levels[o], proficiency[o], o)
+
+
+def solve(inputs, option, progress=None):
+    """
+    Fill the event-by-position grid for a build option.
+
+    Events are filled in order. Within an event, mandatory slots come first and
+    stricter certification requirements before looser ones, so scarce officials
+    are not used up on easy slots. An official works at most one position per
+    event and only positions their certification level allows.
+
+    LIGHTEST gives each slot to the least loaded eligible official, spreading
+    work across everyone; in season mode ties go to whoever has worked less
+    this season. HEAVIEST gives each slot to the strongest eligible
+    official, keeping the best officials on as many events as possible.
+    Both prefer leaving an official on the position they held in the previous
+    event when everything else is equal.
+
+    OPTIMAL hands the grid to the matrix-based assignment solver. PORTFOLIO
+    runs several solvers in parallel and keeps the best grid.
+
+    `progress`, if given, is called with the fraction of events filled.
+
+    Returns a list of rows of official indices, UNFILLED or NO_SLOT.
+    """
+    if option == 'OPTIMAL':
+        from officials.services.schedule_optimizer import solve_optimal
+        return solve_optimal(inputs, progress=progress)
+    if option == 'PORTFOLIO':
+        from officials.services.schedule_portfolio import solve_portfolio
+        return solve_portfolio(inputs, progress=progress).grid
+
+    n_events, n_positions = inputs.shape
+    levels = inputs.official_levels
+    proficiency = inputs.official_proficiency
+    loads = [0] * len(inputs.official_ids)
+
+    # Eligible officials per distinct minimum level, computed once per build.
+    eligible = {
+        min_level: [o for o, level in enumerate(levels) if level >= min_level]
+        for min_level in set(inputs.position_levels)
+    }
+
+    preference = _preference(option, levels, proficiency, loads, inputs.official_season_load)
+
+    grid = []
+    previous = None
+    for e in range(n_events):
+        row = [UNFILLED if inputs.slot_mask[e][p] else NO_SLOT for p in range(n_positions)]
+        columns = [p for p in range(n_positions) if inputs.slot_mask[e][p]]
+        columns.sort(key=lambda p: (not inputs.mandatory_mask[e][p], -inputs.position_levels[p], p))
+        busy = set()
+        for p in columns:
+            candidates = [o for o in eligible[inputs.position_levels[p]] if o not in busy]
+            if not candidates:
+                continue
+            chosen = min(candidates, key=lambda o: preference(o, previous is not None and previous[p] == o))
+            row[p] = chosen
+            busy.add(chosen)
+            loads[chosen] += 1
+        grid.append(row)
+        previous = row
+        if progress:
+            progress((e + 1) / n_events)
+    return grid
+
+
+def summarize(inputs, grid):
+    """Return (total slots, filled slots, unfilled mandatory slots) for a grid."""
+    total = filled = unfilled_mandatory = 0
+    for e, row in enumerate(grid):
+        for p, cell in enumerate(row):
+            if cell == NO_SLOT:
+                continue
+            total += 1
+            if cell >= 0:
+                filled += 1
+            elif inputs.mandatory_mask[e][p]:
+                unfilled_mandatory += 1
+    return total, filled, unfilled_mandatory
+
+
+def build_schedule(meet, option, name=None, progress=None, improve_ms=None, seed=0):
+    """
+    Build, solve and persist a schedule for a meet.
+
+    Args:
+        meet: The Meet to schedule.
+        option: One of MeetSchedule.BUILD_CHOICES.
+        name: Optional schedule name; defaults to the meet name plus a timestamp.
+        progress: Optional callable receiving the fraction of the solve completed.
+        improve_ms: If set, run the local-search improvement pass on the
+            constructed grid for up to this many milliseconds.
+        seed: Seed for the improvement pass.
+
+    Identical inputs reuse the constructed grid of an earlier build from the
+    schedule cache instead of solving again; the improvement pass still runs.
+    Officials confirmed at another meet on the same date are still scheduled
+    but reported in the result's `double_booked`.
+
+    Returns:
+        ScheduleResult for the new MeetSchedule.
+    """
+    inputs = load_schedule_inputs(meet)
+    double_booked = BookingIndex.for_dates([meet.date], inputs.official_ids).double_booked(meet, inputs.official_ids)
+    if double_booked:
+        logger.warning("Officials %s are confirmed at another meet on the date of meet %s", double_booked, meet.id)
+    digest = schedule_cache.fingerprint(inputs, option)
+    grid = schedule_cache.get_cached_grid(inputs, option, digest)
+    cached = grid is not None
+    portfolio = None
+    if not cached:
+        if option == 'PORTFOLIO':
+            from officials.services.schedule_portfolio import solve_portfolio
+
+            portfolio = solve_portfolio(inputs, progress=progress)
+            grid = portfolio.grid
+            for run in portfolio.runs:
+                logger.info(
+                    "Portfolio candidate %s for meet %s: cost %.1f, construct %.3fs, improve %.3fs",
+                    run.label, meet.id, run.score, run.construct_seconds, run.improve_seconds,
+                )
+        else:
+            grid = solve(inputs, option, progress=progress)
+        schedule_cache.store_grid(inputs, option, grid, digest)
+    search = None
+    if improve_ms:
+        search = improve_schedule(inputs, grid, option, budget_ms=improve_ms, seed=seed)
+        grid = search.grid
+    grid_data = encode_inputs(inputs, grid)
+    # Saved as counted, so the season loads must be added in the same transaction.
+    with transaction.atomic():
+        schedule = MeetSchedule.objects.create(
+            meet=meet,
+            name=name or default_schedule_name(meet),
+            build_option=option,
+            grid_data=grid_data,
+            official_loads=schedule_loads(inputs, grid_data),
+            season_counted=True,
+        )
+        season_load.record_schedules([schedule])
+    total, filled, unfilled_mandatory = summarize(inputs, grid)
+    logger.info(
+        "Built schedule %s for meet %s (%s%s): %s/%s slots filled",
+        schedule.id, meet.id, option, ', cached' if cached else '', filled, total,
+    )
+    return ScheduleResult(
+        schedule=schedule,
+        total_slots=total,
+        filled_slots=filled,
+        unfilled_mandatory=unfilled_mandatory,
+        cached=cached,
+        search=search,
+        portfolio=portfolio,
+        double_booked=double_booked,
+    )
+
+
+def default_schedule_name(meet):
+    return f"{meet.name} - {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}"
+
+
+def repair_schedules(meet, official_id):
+    """
+    Reassign the slots a dropped official held in the meet's built schedules.
+
+    Only those slots change; everyone else keeps their positions. Each slot
+    goes to an eligible confirmed official who is free in that event, picked
+    with the schedule's own build preference (OPTIMAL builds repair like
+    LIGHTEST). Slots nobody can take are left unfilled. Nothing happens while
+    the official still holds another confirmed assignment for the meet.
+
+    Returns the number of slots that changed.
+    """
+    if Assignment.objects.filter(meet_id=meet.id, official_id=official_id, confirmed=True).exists():
+        return 0
+    schedules = [
+        schedule for schedule in meet.schedules.exclude(grid_data=None)
+        if official_id in schedule.packed.official_ids
+    ]
+    if not schedules:
+        return 0
+
+    officials = confirmed_officials(meet)
+    levels = {o: level for o, (level, _rank) in officials.items()}
+    proficiency = {o: rank for o, (_level, rank) in officials.items()}
+    position_levels = dict(
+        Position.objects
+        .filter(id__in={pid for schedule in schedules for pid in schedule.packed.position_ids})
+        .values_list('id', 'minimum_certification__level')
+    )
+
+    changed = []
+    repaired = 0
+    for schedule in schedules:
+        packed = schedule.packed
+        official_ids = list(packed.official_ids)
+        index = {o: i for i, o in enumerate(official_ids)}
+        dropped = index[official_id]
+        grid = packed.grid()
+        loads = dict.fromkeys(officials, 0)
+        for row in grid:
+            for cell in row:
+                if cell >= 0 and official_ids[cell] in loads:
+                    loads[official_ids[cell]] += 1
+        preference = _preference(schedule.build_option, levels, proficiency, loads)
+
+        held = 0
+        for row in grid:
+            if dropped not in row:
+                continue
+            taken = {official_ids[cell] for cell in row if cell >= 0}
+            for p, cell in enumerate(row):
+                if cell != dropped:
+                    continue
+                held += 1
+                min_level = position_levels.get(packed.position_ids[p]) or 0
+                candidates = [o for o in officials if levels[o] >= min_level and o not in taken]
+                row[p] = UNFILLED
+                if candidates:
+                    choice = min(candidates, key=lambda o: preference(o, False))
+                    if choice not in index:
+                        index[choice] = len(official_ids)
+                        official_ids.append(choice)
+                    row[p] = index[choice]
+                    taken.add(choice)
+                    loads[choice] += 1
+        if held:
+            schedule.grid_data = encode(
+                packed.event_ids, packed.position_ids, official_ids, grid, packed.mandatory_mask(), packed.lanes
+            )
+            del schedule.packed
+            old_loads = schedule.official_loads
+            schedule.official_loads = season_load.official_loads(schedule.packed, position_levels)
+            changed.append((schedule, old_loads))
+            repaired += held
+
+    with transaction.atomic():
+        MeetSchedule.objects.bulk_update([schedule for schedule, _old in changed], ['grid_data', 'official_loads'])
+        for schedule, old_loads in changed:
+            season_load.restate_schedule(schedule, old_loads)
+    logger.info(
+        "Repaired %s slot(s) held by official %s in %s schedule(s) for meet %s",
+        repaired, official_id, len(changed), meet.id,
+    )
+    return repaired
+
+
+@dataclass
+class ScheduleCell:
+    """One filled or unfilled slot of a schedule table."""
+    official: Official
+    is_mandatory: bool
+
+
+@dataclass
+class ScheduleColumn:
+    """A column of a schedule table: a position, or one lane of a lane-expanded position."""
+    position: Position
+    lane: str = None
+    key: str = ''
+
+    @property
+    def id(self):
+        return self.position.id
+
+    @property
+    def role(self):
+        return self.position.role
+
+    @property
+    def location(self):
+        return lane_expansion.lane_location(self.position.location, self.lane)
+
+
+def schedule_table(schedule, event_ids=None):
+    """
+    Load a built schedule as table data for display.
+
+    Only the rows for `event_ids` are decoded when given. Returns
+    (columns, rows) where columns are ScheduleColumns, rows is a list of
+    (event, cells) and each cell is a ScheduleCell, or None where the event
+    has no such position.
+    """
+    packed = schedule.packed
+    if packed is None:
+        return [], []
+    return packed_table(packed, event_ids)
+
+
+def packed_table(packed, event_ids=None):
+    """schedule_table() for a PackedSchedule that is not stored on a schedule."""
+    decoded = list(packed.rows(event_ids))
+    used = {cell for _event_id, cells, _mandatory in decoded for cell in cells if cell >= 0}
+    events = Event.objects.in_bulk([event_id for event_id, _cells, _mandatory in decoded])
+    positions = Position.objects.in_bulk(packed.position_ids)
+    officials = Official.objects.in_bulk([packed.official_ids[o] for o in used])
+
+    # Positions or events deleted since the build drop out of the table.
+    columns = [p for p, pid in enumerate(packed.position_ids) if pid in positions]
+    rows = []
+    for event_id, cells, mandatory in decoded:
+        if event_id not in events:
+            continue
+        rows.append((events[event_id], [
+            None if cells[p] == NO_SLOT else ScheduleCell(
+                official=officials.get(packed.official_ids[cells[p]]) if cells[p] >= 0 else None,
+                is_mandatory=mandatory[p],
+            )
+            for p in columns
+        ]))
+    keys = packed.column_keys
+    return [ScheduleColumn(positions[packed.position_ids[p]], packed.lanes[p], keys[p]) for p in columns], rows
@@ -0,0 +1,86 @@
+"""
+Cache of solved schedule grids keyed by an input fingerprint.
+
+Coordinators press "Build" repeatedly while experimenting and most presses
+change nothing. A build loads its inputs anyway (two cheap queries), so the
+fingerprint is a hash over exactly what the solver sees: confirmed officials
+with their levels, the strategy's positions and EventPosition rows, the lane
+columns of the meet's pool, and the build option. A matching entry returns the stored grid without re-solving.
+
+Entries are kept per (meet, option) and evicted by signals when an
+Assignment or EventPosition changes; the fingerprint check still guards
+against any change the signals do not cover (an official's certification,
+for example).
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+
+KEY_PREFIX = 'schedule-grid'
+GENERATION_KEY = f'{KEY_PREFIX}:generation'
+# Built grids are cheap to recompute; don't let them live forever.
+TIMEOUT = 60 * 60 * 24
+
+
+def fingerprint(inputs, option):
+    """Stable hash of a meet's solver inputs and build option."""
+    payload = json.dumps([
+        option,
+        inputs.event_ids,
+        inputs.position_ids,
+        inputs.position_levels,
+        inputs.official_ids,
+        inputs.official_levels,
+        inputs.official_proficiency,
+        inputs.slot_mask,
+        inputs.mandatory_mask,
+        inputs.official_season_load,
+        inputs.position_lanes,
+    ], separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _generation():
+    # Bumped whenever an EventPosition changes, which can touch any meet.
+    return cache.get_or_set(GENERATION_KEY, 0, None)
+
+
+def _key(meet_id, option, generation=None):
+    if generation is None:
+        generation = _generation()
+    return f'{KEY_PREFIX}:{generation}:{meet_id}:{option}'
+
+
+def get_cached_grid(inputs, option, digest=None):
+    """Return the cached grid for these inputs, or None."""
+    entry = cache.get(_key(inputs.meet_id, option))
+    if entry is None:
+        return None
+    if entry['fingerprint'] != (digest or fingerprint(inputs, option)):
+        return None
+    return entry['grid']
+
+
+def store_grid(inputs, option, grid, digest=None):
+    cache.set(
+        _key(inputs.meet_id, option),
+        {'fingerprint': digest or fingerprint(inputs, option), 'grid': grid},
+        TIMEOUT,
+    )
+
+
+def invalidate_meet(meet_id):
+    """Drop the cached grids of one meet for every build option."""
+    from officials.models import MeetSchedule
+
+    generation = _generation()
+    cache.delete_many([_key(meet_id, option, generation) for option, _label in MeetSchedule.BUILD_CHOICES])
+
+
+def invalidate_all():
+    """Drop every cached grid by moving to a new generation."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
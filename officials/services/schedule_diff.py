@@ -0,0 +1,144 @@
+"""
+Compare two built schedules of the same meet.
+
+The comparison runs on the packed grids (see schedule_storage) as NumPy
+arrays: both grids are mapped from per-schedule official indices to official
+ids and aligned on the union of their events and positions, after which every
+comparison is a vectorised array operation. No slot or official rows are
+loaded.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from officials.services.schedule_storage import NO_SLOT, UNFILLED
+
+
+@dataclass
+class SlotChange:
+    """A slot whose official differs between the two schedules (None = unfilled)."""
+    event_id: int
+    position_id: int
+    before: int
+    after: int
+    is_mandatory: bool
+    lane: str = None
+
+
+@dataclass
+class LoadDelta:
+    """How many slots an official works in each schedule."""
+    official_id: int
+    before: int
+    after: int
+
+    @property
+    def delta(self):
+        return self.after - self.before
+
+
+@dataclass
+class ScheduleDiff:
+    before_id: int
+    after_id: int
+    changed_slots: list = field(default_factory=list)
+    load_deltas: list = field(default_factory=list)
+    newly_unfilled_mandatory: list = field(default_factory=list)
+
+    def as_dict(self):
+        return {
+            'before': self.before_id,
+            'after': self.after_id,
+            'changed_slots': [
+                {
+                    'event_id': change.event_id,
+                    'position_id': change.position_id,
+                    'lane': change.lane,
+                    'before': change.before,
+                    'after': change.after,
+                    'is_mandatory': change.is_mandatory,
+                }
+                for change in self.changed_slots
+            ],
+            'load_deltas': [
+                {'official_id': load.official_id, 'before': load.before, 'after': load.after, 'delta': load.delta}
+                for load in self.load_deltas
+            ],
+            'newly_unfilled_mandatory': [
+                {'event_id': event_id, 'position_id': position_id}
+                for event_id, position_id in self.newly_unfilled_mandatory
+            ],
+        }
+
+
+def _columns(packed):
+    # Lane-expanded positions repeat their id, so columns are keyed by (position id, lane).
+    return list(zip(packed.position_ids, packed.lanes))
+
+
+def _aligned(packed, event_index, position_index, shape):
+    """Place a packed grid, as official ids, onto the shared event x column axes."""
+    matrix, mandatory = packed.arrays()
+    # Index -1 (UNFILLED) and -2 (NO_SLOT) wrap around to the two markers appended here.
+    lookup = np.array(list(packed.official_ids) + [NO_SLOT, UNFILLED], dtype=np.int64)
+    rows = np.array([event_index[event_id] for event_id in packed.event_ids], dtype=np.intp)
+    cols = np.array([position_index[column] for column in _columns(packed)], dtype=np.intp)
+    officials = np.full(shape, NO_SLOT, dtype=np.int64)
+    is_mandatory = np.zeros(shape, dtype=bool)
+    officials[np.ix_(rows, cols)] = lookup[matrix]
+    is_mandatory[np.ix_(rows, cols)] = mandatory
+    return officials, is_mandatory
+
+
+def _loads(officials):
+    filled = officials[officials >= 0]
+    ids, counts = np.unique(filled, return_counts=True)
+    return dict(zip(ids.tolist(), counts.tolist()))
+
+
+def diff_schedules(before, after):
+    """
+    Compare two MeetSchedules.
+
+    Returns a ScheduleDiff listing the slots whose official changed, the
+    officials whose number of slots changed, and the mandatory slots that are
+    unfilled in `after` but were filled (or did not exist) in `before`.
+    """
+    packed_before, packed_after = before.packed, after.packed
+    if packed_before is None or packed_after is None:
+        raise ValueError('Both schedules need a built grid to be compared.')
+
+    event_ids = list(dict.fromkeys(packed_before.event_ids + packed_after.event_ids))
+    columns = list(dict.fromkeys(_columns(packed_before) + _columns(packed_after)))
+    event_index = {event_id: e for e, event_id in enumerate(event_ids)}
+    position_index = {column: p for p, column in enumerate(columns)}
+    shape = (len(event_ids), len(columns))
+    a, a_mandatory = _aligned(packed_before, event_index, position_index, shape)
+    b, b_mandatory = _aligned(packed_after, event_index, position_index, shape)
+
+    diff = ScheduleDiff(before_id=before.pk, after_id=after.pk)
+
+    # Unfilled and missing slots both read as "nobody" in the change list.
+    a_holder = np.where(a >= 0, a, UNFILLED)
+    b_holder = np.where(b >= 0, b, UNFILLED)
+    for e, p in np.argwhere(a_holder != b_holder).tolist():
+        diff.changed_slots.append(SlotChange(
+            event_id=event_ids[e],
+            position_id=columns[p][0],
+            before=a_holder[e, p].item() if a_holder[e, p] >= 0 else None,
+            after=b_holder[e, p].item() if b_holder[e, p] >= 0 else None,
+            is_mandatory=bool(b_mandatory[e, p] or a_mandatory[e, p]),
+            lane=columns[p][1],
+        ))
+
+    loads_before, loads_after = _loads(a), _loads(b)
+    for official_id in sorted(loads_before.keys() | loads_after.keys()):
+        load = LoadDelta(official_id, loads_before.get(official_id, 0), loads_after.get(official_id, 0))
+        if load.delta:
+            diff.load_deltas.append(load)
+
+    newly_unfilled = (b == UNFILLED) & b_mandatory & ~((a == UNFILLED) & a_mandatory)
+    diff.newly_unfilled_mandatory = [
+        (event_ids[e], columns[p][0]) for e, p in np.argwhere(newly_unfilled).tolist()
+    ]
+    return diff
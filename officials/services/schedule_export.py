@@ -0,0 +1,144 @@
+"""
+Excel export of built meet schedules.
+
+The workbook follows the deck sheets coordinators used to build by hand
+(files/OfficialsSchedule_2025-TVG-MBW-2.xlsx): a "Schedule" sheet with a
+title row, the positions' roles and locations as header rows and one row per
+event, and an "Officials" sheet listing who works how many slots.
+
+The workbook is written in openpyxl's write-only mode, which spools rows to
+disk as they are appended, and events are decoded and loaded in batches, so
+memory use does not grow with the size of the meet. stream_schedule_workbook()
+writes the file to a temporary file and yields it in chunks for a
+StreamingHttpResponse.
+"""
+import tempfile
+
+import numpy as np
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+from django.utils.text import slugify
+
+from officials.models import Event, Official, Position
+from officials.services.lane_expansion import lane_location
+from officials.services.schedule_storage import NO_SLOT
+
+EVENT_BATCH = 200
+CHUNK_SIZE = 64 * 1024
+
+TITLE_FONT = Font(bold=True, size=14)
+HEADER_FONT = Font(bold=True)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center', wrap_text=True)
+NO_SLOT_FILL = PatternFill(start_color='D9D9D9', end_color='D9D9D9', fill_type='solid')
+UNFILLED_FONT = Font(color='C00000', italic=True)
+
+
+def export_filename(schedule):
+    """File name in the style of the hand-built decks: OfficialsSchedule_<year>-<meet>-<schedule>.xlsx."""
+    meet = schedule.meet
+    return f'OfficialsSchedule_{meet.date:%Y}-{slugify(meet.name) or "meet"}-{schedule.pk}.xlsx'
+
+
+def _cell(worksheet, value, font=None, fill=None, alignment=None):
+    cell = WriteOnlyCell(worksheet, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
+def _schedule_sheet(workbook, schedule, packed, officials):
+    meet = schedule.meet
+    worksheet = workbook.create_sheet('Schedule')
+    positions = Position.objects.in_bulk(packed.position_ids)
+    # Positions deleted since the build drop out, as on the schedule page.
+    columns = [p for p, pid in enumerate(packed.position_ids) if pid in positions]
+
+    worksheet.column_dimensions['A'].width = 8
+    worksheet.column_dimensions['B'].width = 30
+    for c in range(len(columns)):
+        worksheet.column_dimensions[get_column_letter(c + 3)].width = 18
+    worksheet.freeze_panes = 'C4'
+
+    worksheet.append([_cell(worksheet, f'{meet.date:%Y} {meet.name}', font=TITLE_FONT)])
+    worksheet.append(
+        [_cell(worksheet, 'Event', HEADER_FONT), None]
+        + [_cell(worksheet, positions[packed.position_ids[p]].role, HEADER_FONT, alignment=HEADER_ALIGNMENT)
+           for p in columns]
+    )
+    worksheet.append(
+        [_cell(worksheet, 'Number', HEADER_FONT), _cell(worksheet, 'Name', HEADER_FONT)]
+        + [_cell(worksheet, lane_location(positions[packed.position_ids[p]].location, packed.lanes[p]),
+                 alignment=HEADER_ALIGNMENT)
+           for p in columns]
+    )
+
+    for start in range(0, len(packed.event_ids), EVENT_BATCH):
+        batch = packed.event_ids[start:start + EVENT_BATCH]
+        events = Event.objects.in_bulk(batch)
+        for event_id, cells, mandatory in packed.rows(batch):
+            event = events.get(event_id)
+            if event is None:
+                continue
+            row = [event.event_number, event.name]
+            for p in columns:
+                if cells[p] == NO_SLOT:
+                    row.append(_cell(worksheet, None, fill=NO_SLOT_FILL))
+                elif cells[p] >= 0:
+                    official = officials.get(packed.official_ids[cells[p]])
+                    row.append(official.name if official else None)
+                elif mandatory[p]:
+                    row.append(_cell(worksheet, 'Unfilled', UNFILLED_FONT))
+                else:
+                    row.append(None)
+            worksheet.append(row)
+
+
+def _officials_sheet(workbook, packed, officials):
+    worksheet = workbook.create_sheet('Officials')
+    worksheet.column_dimensions['A'].width = 25
+    worksheet.append([_cell(worksheet, header, HEADER_FONT) for header in ('who', 'count', 'pos', 'team')])
+    matrix, _mandatory = packed.arrays()
+    counts = np.bincount(matrix[matrix >= 0].astype(np.intp), minlength=len(packed.official_ids))
+    for o, official_id in enumerate(packed.official_ids):
+        official = officials.get(official_id)
+        if official is None:
+            continue
+        certification = official.certification
+        team = official.team
+        worksheet.append([
+            official.name,
+            int(counts[o]),
+            (certification.abbreviation or certification.name) if certification else None,
+            team.abbreviation or team.name,
+        ])
+
+
+def write_schedule_workbook(schedule, file_obj):
+    """Write a built schedule as .xlsx to `file_obj`; raises ValueError if it has no grid."""
+    packed = schedule.packed
+    if packed is None:
+        raise ValueError('This schedule has no built grid to export.')
+    # Officials are bounded by the meet's confirmed roster, not by the grid size.
+    officials = Official.objects.select_related('certification', 'team').in_bulk(packed.official_ids)
+    workbook = openpyxl.Workbook(write_only=True)
+    _schedule_sheet(workbook, schedule, packed, officials)
+    _officials_sheet(workbook, packed, officials)
+    workbook.save(file_obj)
+
+
+def stream_schedule_workbook(schedule, chunk_size=CHUNK_SIZE):
+    """Yield a built schedule's .xlsx file in chunks, spooled through a temporary file."""
+    with tempfile.TemporaryFile() as spool:
+        write_schedule_workbook(schedule, spool)
+        spool.seek(0)
+        while True:
+            chunk = spool.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
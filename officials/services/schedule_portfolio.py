@@ -0,0 +1,110 @@
+"""
+Portfolio builds: several solvers in parallel, keep the best.
+
+Each candidate is a construction heuristic plus an improvement-pass seed. The
+candidates run on the shared solver process pool, every result is scored with
+the same quality metric (schedule_search.schedule_quality) and the cheapest
+grid wins. Per-candidate timings are returned with the result so the build
+can report where the time went.
+"""
+import logging
+import time
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from officials.services.solver_pool import can_fork_workers, get_pool, portfolio_task, reset_pool
+
+logger = logging.getLogger(__name__)
+
+HEURISTICS = ('LIGHTEST', 'OPTIMAL', 'HEAVIEST')
+
+
+@dataclass
+class CandidateRun:
+    """One heuristic/seed run of a portfolio build."""
+    heuristic: str
+    seed: int
+    score: float
+    construct_seconds: float
+    improve_seconds: float
+
+    @property
+    def label(self):
+        return f'{self.heuristic}#{self.seed}'
+
+
+@dataclass
+class PortfolioResult:
+    grid: list
+    best: CandidateRun
+    runs: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+def solve_portfolio(inputs, objective='LIGHTEST', heuristics=HEURISTICS, seeds=None, improve_ms=None,
+                    workers=None, progress=None):
+    """
+    Solve a meet with every heuristic x seed combination and keep the best.
+
+    Args:
+        inputs: ScheduleInputs for the meet.
+        objective: Build option whose quality metric ranks the candidates.
+        heuristics: Construction heuristics to try.
+        seeds: Number of improvement-pass seeds per heuristic; defaults to
+            SCHEDULE_PORTFOLIO_SEEDS.
+        improve_ms: Improvement budget per candidate; defaults to
+            SCHEDULE_IMPROVE_MS. 0 only compares the constructions.
+        workers: 1 runs the candidates in this process; otherwise the shared
+            solver pool is used.
+        progress: Optional callable receiving the fraction of candidates done.
+
+    Returns a PortfolioResult; ties go to the earlier candidate.
+    """
+    if seeds is None:
+        seeds = getattr(settings, 'SCHEDULE_PORTFOLIO_SEEDS', 2)
+    if improve_ms is None:
+        improve_ms = getattr(settings, 'SCHEDULE_IMPROVE_MS', 500)
+    if workers is None:
+        workers = getattr(settings, 'SCHEDULE_PORTFOLIO_WORKERS', None)
+    # Improving the same construction twice with one seed gives the same grid.
+    candidates = [(heuristic, seed) for heuristic in heuristics for seed in range(seeds if improve_ms else 1)]
+
+    started = time.perf_counter()
+    outputs = None
+    if workers != 1 and len(candidates) > 1 and can_fork_workers():
+        try:
+            outputs = _run_on_pool(inputs, candidates, objective, improve_ms, workers, progress)
+        except BrokenProcessPool:
+            logger.warning("Solver pool broke during a portfolio build; running the candidates inline")
+            reset_pool()
+    if outputs is None:
+        outputs = []
+        for i, (heuristic, seed) in enumerate(candidates):
+            outputs.append(portfolio_task(inputs, heuristic, objective, seed, improve_ms))
+            if progress:
+                progress((i + 1) / len(candidates))
+
+    runs = []
+    best_grid = best = None
+    for (heuristic, seed), (grid, score, construct_seconds, improve_seconds) in zip(candidates, outputs):
+        run = CandidateRun(heuristic, seed, score, construct_seconds, improve_seconds)
+        runs.append(run)
+        if best is None or score < best.score:
+            best, best_grid = run, grid
+    return PortfolioResult(grid=best_grid, best=best, runs=runs, elapsed=time.perf_counter() - started)
+
+
+def _run_on_pool(inputs, candidates, objective, improve_ms, workers, progress):
+    pool = get_pool(workers)
+    futures = [
+        pool.submit(portfolio_task, inputs, heuristic, objective, seed, improve_ms)
+        for heuristic, seed in candidates
+    ]
+    outputs = []
+    for i, future in enumerate(futures):
+        outputs.append(future.result())
+        if progress:
+            progress((i + 1) / len(futures))
+    return outputs
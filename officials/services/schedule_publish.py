@@ -0,0 +1,147 @@
+"""
+Published schedule snapshots.
+
+Publishing a MeetSchedule renders its public HTML page and JSON form once and
+stores both, with a content hash, as an immutable PublishedSchedule. Serving
+a published schedule then needs no schedule queries or template rendering:
+one indexed query finds the meet's newest publication and its ETag, and the
+rendered body is read from the cache, keyed by publication id. Clients that
+send the ETag back get 304 Not Modified without the body being read.
+
+Which publication is current is always read from the database, so every
+worker sees a publish or withdraw at once even with a per-process cache;
+only bodies are cached, and a publication's body never changes. The newest
+publication's slots are also indexed per official for their feeds (see
+official_feed).
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from officials.models import PublishedSchedule, PublishedSlot
+from officials.services import official_feed
+from officials.services.schedule_builder import schedule_table
+
+CACHE_PREFIX = 'published-schedule'
+TIMEOUT = 60 * 60 * 24 * 7
+BODIES = ('html', 'json')
+
+
+def _key(publication_id, kind):
+    return f'{CACHE_PREFIX}:{publication_id}:{kind}'
+
+
+def schedule_document(schedule, positions, rows, published_at):
+    """The published JSON form of a schedule table (see schedule_table)."""
+    meet = schedule.meet
+    return {
+        'meet': {
+            'id': meet.pk,
+            'name': meet.name,
+            'date': meet.date.isoformat(),
+            'start_time': meet.start_time.isoformat() if meet.start_time else None,
+            'pool': meet.pool.name if meet.pool else None,
+        },
+        'schedule': {'id': schedule.pk, 'name': schedule.name, 'build_option': schedule.build_option},
+        'published_at': published_at.isoformat(),
+        'positions': [
+            {'id': column.id, 'role': column.role, 'location': column.position.location, 'lane': column.lane}
+            for column in positions
+        ],
+        'events': [
+            {
+                'id': event.id,
+                'number': event.event_number,
+                'name': event.name,
+                'slots': [
+                    {
+                        'position': column.id,
+                        'lane': column.lane,
+                        'official': {'id': cell.official.id, 'name': cell.official.name} if cell.official else None,
+                        'mandatory': cell.is_mandatory,
+                    }
+                    for column, cell in zip(positions, cells) if cell is not None
+                ],
+            }
+            for event, cells in rows
+        ],
+    }
+
+
+def publish_schedule(schedule, user=None):
+    """
+    Render and store a schedule as its meet's current publication.
+
+    Raises ValueError for a schedule without a built grid.
+    """
+    if schedule.packed is None:
+        raise ValueError('This schedule has no built grid to publish.')
+    meet = schedule.meet
+    published_at = timezone.now()
+    positions, rows = schedule_table(schedule)
+    html = render_to_string('officials/published_schedule.html', {
+        'meet': meet,
+        'schedule': schedule,
+        'positions': positions,
+        'rows': rows,
+        'published_at': published_at,
+    })
+    document = schedule_document(schedule, positions, rows, published_at)
+    encoded = json.dumps(document, separators=(',', ':'))
+    # Only the newest publication of a meet is indexed per official.
+    previous = PublishedSlot.objects.filter(meet=meet)
+    with transaction.atomic():
+        previous.delete()
+        snapshot = PublishedSchedule.objects.create(
+            meet=meet,
+            schedule=schedule,
+            html=html,
+            json=encoded,
+            etag=hashlib.sha256(html.encode() + b'\0' + encoded.encode()).hexdigest(),
+            published_by=user if user is not None and user.is_authenticated else None,
+            published_at=published_at,
+        )
+        official_feed.index_publication(snapshot, document)
+    cache.set_many({_key(snapshot.pk, kind): getattr(snapshot, kind) for kind in BODIES}, TIMEOUT)
+    return snapshot
+
+
+def current_publication(meet_id):
+    """
+    The meet's newest publication as a dict (id, schedule_id, etag,
+    published_at), or None when nothing is published. One indexed query; the
+    rendered bodies are not loaded (see publication_body).
+    """
+    return (
+        PublishedSchedule.objects.filter(meet_id=meet_id)
+        .values('id', 'schedule_id', 'etag', 'published_at')
+        .first()
+    )
+
+
+def publication_body(publication, kind):
+    """The rendered 'html' or 'json' of a publication from current_publication."""
+    key = _key(publication['id'], kind)
+    body = cache.get(key)
+    if body is None:
+        body = PublishedSchedule.objects.filter(pk=publication['id']).values_list(kind, flat=True).first()
+        if body is None:
+            # Withdrawn since it was looked up.
+            raise PublishedSchedule.DoesNotExist
+        cache.set(key, body, TIMEOUT)
+    return body
+
+
+def withdraw_publications(meet):
+    """Delete every publication of a meet. Returns how many were deleted."""
+    _total, deleted = PublishedSchedule.objects.filter(meet=meet).delete()
+    return deleted.get(PublishedSchedule._meta.label, 0)
+
+
+def forget_publication(publication_id):
+    """Drop the cached bodies of a deleted publication."""
+    cache.delete_many([_key(publication_id, kind) for kind in BODIES])
@@ -0,0 +1,290 @@
+"""
+Copy-on-write sandboxes for editing a built schedule.
+
+A sandbox starts as a reference to a MeetSchedule's packed grid; edits are
+kept as an overlay of changed cells, so opening one copies nothing and an
+edit touches only the cells it changes. Sandboxes are stored in the user's
+session, as JSON alongside the base grid they were opened on, so every worker
+sees the same edits and they survive restarts; they are dropped when
+committed, discarded, expired or when the session ends. The stored schedule is
+never modified: committing saves the edited grid as a new MeetSchedule.
+
+The constraint violations of the base grid are found once when the sandbox is
+opened (see schedule_validation). After that every edit re-checks only the
+cells it changed and the bookings of the officials it moved, which are
+indexed per edited event, so validating an edit costs O(1) however large the
+meet is.
+"""
+import base64
+import time
+
+from django.db import transaction
+
+from officials.models import MeetSchedule
+from officials.services import season_load
+from officials.services.schedule_storage import NO_SLOT, UNFILLED, PackedSchedule, encode
+from officials.services.schedule_validation import (DOUBLE_BOOKED, UNDER_CERTIFIED, UNFILLED_MANDATORY,
+                                                    Violation, certification_levels, find_violations)
+
+SESSION_PREFIX = 'schedule-sandbox'
+TIMEOUT = 60 * 60 * 4
+
+# Constraints a sandbox cannot be committed with. Unfilled mandatory slots are
+# allowed, as in a normal build that runs out of qualified officials.
+BLOCKING = (UNDER_CERTIFIED, DOUBLE_BOOKED)
+
+
+class SandboxError(ValueError):
+    """Raised for an edit or commit the sandbox cannot carry out."""
+    pass
+
+
+class ScheduleSandbox:
+    """Editable overlay on top of a stored schedule's grid."""
+
+    def __init__(self, schedule, official_levels, position_levels):
+        if schedule.packed is None:
+            raise SandboxError('This schedule has no built grid to edit.')
+        self.schedule_id = schedule.pk
+        self.meet_id = schedule.meet_id
+        self.name = schedule.name
+        self.build_option = schedule.build_option
+        self.data = bytes(schedule.grid_data)
+        self.official_levels = list(official_levels)
+        self.position_levels = list(position_levels)
+        self.edits = {}  # (e, p) -> cell, overriding the base grid
+        self.bookings = {}  # e -> {official index: {p, ...}} for edited events
+        self.violations = {}  # (kind, e, p) -> cell
+        matrix, mandatory = self._arrays()
+        for kind, (rows, cols) in find_violations(matrix, mandatory, official_levels, position_levels).items():
+            for e, p in zip(rows.tolist(), cols.tolist()):
+                self.violations[(kind, e, p)] = int(matrix[e, p])
+
+    def to_json(self):
+        """The sandbox as JSON-serializable data for the session (see from_json)."""
+        return {
+            'schedule_id': self.schedule_id,
+            'meet_id': self.meet_id,
+            'name': self.name,
+            'build_option': self.build_option,
+            'data': base64.b64encode(self.data).decode(),
+            'official_levels': self.official_levels,
+            'position_levels': self.position_levels,
+            'edits': [[e, p, cell] for (e, p), cell in self.edits.items()],
+            'violations': [[kind, e, p, cell] for (kind, e, p), cell in self.violations.items()],
+        }
+
+    @classmethod
+    def from_json(cls, state):
+        sandbox = cls.__new__(cls)
+        sandbox.schedule_id = state['schedule_id']
+        sandbox.meet_id = state['meet_id']
+        sandbox.name = state['name']
+        sandbox.build_option = state['build_option']
+        sandbox.data = base64.b64decode(state['data'])
+        sandbox.official_levels = state['official_levels']
+        sandbox.position_levels = state['position_levels']
+        sandbox.edits = {(e, p): cell for e, p, cell in state['edits']}
+        sandbox.bookings = {}  # indexed again on first use
+        sandbox.violations = {(kind, e, p): cell for kind, e, p, cell in state['violations']}
+        return sandbox
+
+    def _arrays(self):
+        # Decoded views of the base grid, rebuilt once per request after loading.
+        if '_cache' not in self.__dict__:
+            packed = PackedSchedule(self.data)
+            self._cache = (packed,) + packed.arrays()
+        return self._cache[1:]
+
+    @property
+    def packed(self):
+        """The base grid, without edits."""
+        self._arrays()
+        return self._cache[0]
+
+    @property
+    def official_ids(self):
+        return self.packed.official_ids
+
+    def cell(self, e, p):
+        if (e, p) in self.edits:
+            return self.edits[(e, p)]
+        matrix, _mandatory = self._arrays()
+        return int(matrix[e, p])
+
+    def grid(self):
+        """The edited grid as a list of rows."""
+        matrix, _mandatory = self._arrays()
+        rows = matrix.tolist()
+        for (e, p), cell in self.edits.items():
+            rows[e][p] = cell
+        return rows
+
+    def encoded(self):
+        """The edited grid in the stored schedule format (see schedule_storage)."""
+        packed = self.packed
+        _matrix, mandatory = self._arrays()
+        return encode(
+            packed.event_ids, packed.position_ids, packed.official_ids, self.grid(), mandatory.tolist(), packed.lanes
+        )
+
+    def violation_list(self):
+        """Current violations as Violations, ordered by kind, event and position."""
+        packed = self.packed
+        kinds = {kind: i for i, kind in enumerate((UNFILLED_MANDATORY, UNDER_CERTIFIED, DOUBLE_BOOKED))}
+        return [
+            Violation(
+                kind=kind,
+                event_id=packed.event_ids[e],
+                position_id=packed.position_ids[p],
+                official_id=packed.official_ids[cell] if cell >= 0 else None,
+                lane=packed.lanes[p],
+            )
+            for (kind, e, p), cell in sorted(self.violations.items(), key=lambda item: (kinds[item[0][0]],) + item[0][1:])
+        ]
+
+    @property
+    def blocking(self):
+        return any(kind in BLOCKING for kind, _e, _p in self.violations)
+
+    # Edits, addressed by event id and column key (see PackedSchedule.column_keys).
+
+    def _slot(self, event_id, position):
+        packed = self.packed
+        try:
+            e, p = packed.event_index(event_id), packed.column_index(position)
+        except KeyError:
+            raise SandboxError('That slot is not part of this schedule.')
+        if self.cell(e, p) == NO_SLOT:
+            raise SandboxError('That event does not use this position.')
+        return e, p
+
+    def swap(self, event_a, position_a, event_b, position_b):
+        """Exchange the officials of two slots."""
+        a, b = self._slot(event_a, position_a), self._slot(event_b, position_b)
+        first, second = self.cell(*a), self.cell(*b)
+        self._set(*a, second)
+        self._set(*b, first)
+
+    def move(self, from_event, from_position, to_event, to_position):
+        """Move a slot's official to another slot, replacing its holder."""
+        source, target = self._slot(from_event, from_position), self._slot(to_event, to_position)
+        official = self.cell(*source)
+        if official < 0:
+            raise SandboxError('There is no official in that slot to move.')
+        if source != target:
+            self._set(*source, UNFILLED)
+            self._set(*target, official)
+
+    def clear(self, event_id, position_id):
+        """Leave a slot unfilled."""
+        self._set(*self._slot(event_id, position_id), UNFILLED)
+
+    def assign(self, event_id, position_id, official_id):
+        """Put one of the schedule's officials into a slot."""
+        slot = self._slot(event_id, position_id)
+        try:
+            official = self.official_ids.index(official_id)
+        except ValueError:
+            raise SandboxError('That official was not confirmed when this schedule was built.')
+        self._set(*slot, official)
+
+    # Incremental validation.
+
+    def _event_bookings(self, e):
+        """{official index: positions} for event e, indexed on first use."""
+        if e not in self.bookings:
+            booked = {}
+            for p in range(self.packed.shape[1]):
+                cell = self.cell(e, p)
+                if cell >= 0:
+                    booked.setdefault(cell, set()).add(p)
+            self.bookings[e] = booked
+        return self.bookings[e]
+
+    def _set(self, e, p, cell):
+        old = self.cell(e, p)
+        if old == cell:
+            return
+        booked = self._event_bookings(e)
+        if old >= 0:
+            booked[old].discard(p)
+            if not booked[old]:
+                del booked[old]
+        if cell >= 0:
+            booked.setdefault(cell, set()).add(p)
+        self.edits[(e, p)] = cell
+
+        _matrix, mandatory = self._arrays()
+        self._flag(UNFILLED_MANDATORY, e, p, cell, cell == UNFILLED and mandatory[e, p])
+        self._flag(UNDER_CERTIFIED, e, p, cell, cell >= 0 and self.official_levels[cell] < self.position_levels[p])
+        self._flag(DOUBLE_BOOKED, e, p, cell, False)
+        for official in (old, cell):
+            if official >= 0:
+                positions = booked.get(official, ())
+                for q in positions:
+                    self._flag(DOUBLE_BOOKED, e, q, official, len(positions) > 1)
+
+    def _flag(self, kind, e, p, cell, broken):
+        if broken:
+            self.violations[(kind, e, p)] = cell
+        else:
+            self.violations.pop((kind, e, p), None)
+
+
+def _key(schedule_id):
+    return f'{SESSION_PREFIX}:{schedule_id}'
+
+
+def open_sandbox(session, schedule):
+    """Return the session's sandbox for a schedule, creating it on first use."""
+    sandbox = get_sandbox(session, schedule.pk)
+    if sandbox is None:
+        sandbox = ScheduleSandbox(schedule, *certification_levels(schedule.packed.official_ids,
+                                                                  schedule.packed.position_ids))
+        save_sandbox(session, sandbox)
+    return sandbox
+
+
+def get_sandbox(session, schedule_id):
+    """The session's sandbox for a schedule, or None; `session` is request.session or any mapping."""
+    stored = session.get(_key(schedule_id))
+    if stored is None:
+        return None
+    if stored['expires'] < time.time():
+        discard_sandbox(session, schedule_id)
+        return None
+    return ScheduleSandbox.from_json(stored['sandbox'])
+
+
+def save_sandbox(session, sandbox):
+    session[_key(sandbox.schedule_id)] = {'expires': time.time() + TIMEOUT, 'sandbox': sandbox.to_json()}
+
+
+def discard_sandbox(session, schedule_id):
+    session.pop(_key(schedule_id), None)
+
+
+def commit_sandbox(session, sandbox, name=None):
+    """
+    Save a sandbox's grid as a new MeetSchedule and drop the sandbox.
+
+    Raises SandboxError while an official is under-certified or double-booked.
+    """
+    if sandbox.blocking:
+        raise SandboxError('Fix the certification and double-booking problems before saving.')
+    grid_data = sandbox.encoded()
+    with transaction.atomic():
+        schedule = MeetSchedule.objects.create(
+            meet_id=sandbox.meet_id,
+            name=name or f'{sandbox.name} (edited)',
+            build_option=sandbox.build_option,
+            grid_data=grid_data,
+            official_loads=season_load.official_loads(
+                PackedSchedule(grid_data), dict(zip(sandbox.packed.position_ids, sandbox.position_levels))
+            ),
+            season_counted=True,
+        )
+        season_load.record_schedules([schedule])
+    discard_sandbox(session, sandbox.schedule_id)
+    return schedule
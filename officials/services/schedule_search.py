@@ -0,0 +1,311 @@
+"""
+Local-search improvement pass for built schedules.
+
+Starts from a constructed grid (LIGHTEST, HEAVIEST or OPTIMAL) and runs
+simulated annealing over three moves that keep the grid feasible:
+
+* reassign: give a slot to an eligible official who is free in that event;
+* swap: exchange the officials of two slots in the same event;
+* run swap: exchange two officials' positions over the consecutive events in
+  which both keep them.
+
+A move touches at most two officials and two positions, so its effect on the
+objective is scored incrementally from the cells it changes and the events
+either side of them (O(1) per changed cell) instead of re-scoring the grid.
+
+The objective (lower is better) combines:
+
+* load balance: the sum of squared per-official loads (HEAVIEST flips the
+  sign, so it rewards concentrating work on fewer officials);
+* proficiency fit: over-qualified officials on easy positions and less
+  proficient officials on demanding ones, as in the OPTIMAL solver;
+* position changes: how often an official working consecutive events moves
+  to a different position;
+* unfilled slots, mandatory ones weighing far more.
+
+Runs are deterministic for a given seed and iteration count. A wall-clock
+budget can stop a run early, in which case how far it gets depends on the
+machine.
+"""
+import math
+import random
+import time
+from dataclasses import dataclass
+
+# Grid markers, as in schedule_builder; repeated to keep this module model-free.
+UNFILLED = -1
+NO_SLOT = -2
+
+LOAD_WEIGHT = 1.0
+FIT_WEIGHT = 1.0
+CHANGE_WEIGHT = 0.5
+UNFILLED_MANDATORY_PENALTY = 1000.0
+UNFILLED_OPTIONAL_PENALTY = 10.0
+
+# Share of proposals that swap two officials over a run of events.
+RUN_SWAP_SHARE = 0.5
+
+# Annealing temperatures, in objective units. Kept well below the cost of
+# unbalancing one load (2.0) so the search explores fit and continuity
+# without undoing the construction's balance.
+START_TEMPERATURE = 0.05
+END_TEMPERATURE = 0.002
+
+
+@dataclass
+class SearchResult:
+    grid: list
+    initial_score: float
+    score: float
+    iterations: int
+    accepted: int
+    elapsed: float
+
+
+def fit_costs(inputs):
+    """Official x position fit cost, as plain lists (see schedule_optimizer.cost_matrix)."""
+    max_level = max(max(inputs.position_levels, default=0), 1)
+    max_proficiency = max(inputs.official_proficiency, default=0)
+    return [
+        [
+            0.1 * (level - position_level) + 0.1 * (max_proficiency - proficiency) * position_level / max_level
+            for position_level in inputs.position_levels
+        ]
+        for level, proficiency in zip(inputs.official_levels, inputs.official_proficiency)
+    ]
+
+
+def _load_weight(option):
+    return -LOAD_WEIGHT if option == 'HEAVIEST' else LOAD_WEIGHT
+
+
+def schedule_quality(inputs, grid, option='LIGHTEST', fit=None):
+    """Score a whole grid with the search objective. Lower is better."""
+    fit = fit or fit_costs(inputs)
+    loads = [0] * len(inputs.official_ids)
+    score = 0.0
+    previous = {}
+    for e, row in enumerate(grid):
+        current = {}
+        for p, cell in enumerate(row):
+            if cell >= 0:
+                loads[cell] += 1
+                score += FIT_WEIGHT * fit[cell][p]
+                current[cell] = p
+                if cell in previous and previous[cell] != p:
+                    score += CHANGE_WEIGHT
+            elif cell == UNFILLED:
+                score += UNFILLED_MANDATORY_PENALTY if inputs.mandatory_mask[e][p] else UNFILLED_OPTIONAL_PENALTY
+        previous = current
+    return score + _load_weight(option) * sum(load * load for load in loads)
+
+
+class _Search:
+    """Mutable search state with O(1) scoring of single moves."""
+
+    def __init__(self, inputs, grid, option):
+        self.inputs = inputs
+        self.grid = [list(row) for row in grid]
+        self.n_events, self.n_positions = inputs.shape
+        n_officials = len(inputs.official_ids)
+        self.fit = fit_costs(inputs)
+        self.load_weight = _load_weight(option)
+        self.eligible = [
+            [o for o in range(n_officials) if inputs.official_levels[o] >= level]
+            for level in inputs.position_levels
+        ]
+        self.can_work = [
+            [inputs.official_levels[o] >= level for level in inputs.position_levels] for o in range(n_officials)
+        ]
+        self.slots = [
+            (e, p) for e in range(self.n_events) for p in range(self.n_positions)
+            if self.grid[e][p] != NO_SLOT and self.eligible[p]
+        ]
+        # column[e][o]: position official o works in event e, or -1.
+        self.column = [[-1] * n_officials for _ in range(self.n_events)]
+        self.loads = [0] * n_officials
+        for e, row in enumerate(self.grid):
+            for p, cell in enumerate(row):
+                if cell >= 0:
+                    self.column[e][cell] = p
+                    self.loads[cell] += 1
+        self.score = schedule_quality(inputs, self.grid, option, self.fit)
+
+    def _changes(self, o, e):
+        """Position changes official o has with the events either side of e."""
+        here = self.column[e][o]
+        if here < 0:
+            return 0
+        count = 0
+        if e > 0 and self.column[e - 1][o] >= 0 and self.column[e - 1][o] != here:
+            count += 1
+        if e + 1 < self.n_events and self.column[e + 1][o] >= 0 and self.column[e + 1][o] != here:
+            count += 1
+        return count
+
+    def _cell_cost(self, e, p):
+        cell = self.grid[e][p]
+        if cell >= 0:
+            return FIT_WEIGHT * self.fit[cell][p]
+        return UNFILLED_MANDATORY_PENALTY if self.inputs.mandatory_mask[e][p] else UNFILLED_OPTIONAL_PENALTY
+
+    def _local(self, e, cells, officials):
+        score = sum(self._cell_cost(e, p) for p in cells)
+        score += CHANGE_WEIGHT * sum(self._changes(o, e) for o in officials)
+        return score + self.load_weight * sum(self.loads[o] * self.loads[o] for o in officials)
+
+    def _set(self, e, p, o):
+        old = self.grid[e][p]
+        if old >= 0:
+            self.column[e][old] = -1
+            self.loads[old] -= 1
+        self.grid[e][p] = o
+        if o >= 0:
+            self.column[e][o] = p
+            self.loads[o] += 1
+
+    def propose(self, rng):
+        """
+        Apply a random feasible move and return (delta, undo, redo), or None
+        when the sampled move is a no-op or infeasible.
+        """
+        e, p = self.slots[rng.randrange(len(self.slots))]
+        if rng.random() < RUN_SWAP_SHARE:
+            return self._run_swap(rng, e, p)
+        b = rng.choice(self.eligible[p])
+        a = self.grid[e][p]
+        if a == b:
+            return None
+        q = self.column[e][b]
+        officials = [o for o in (a, b) if o >= 0]
+        if q >= 0:
+            # b already works this event: swap a and b.
+            if a >= 0 and not self.can_work[a][q]:
+                return None
+            cells = (p, q)
+
+            def redo():
+                self._set(e, q, UNFILLED)
+                self._set(e, p, b)
+                self._set(e, q, a)
+
+            def undo():
+                self._set(e, p, UNFILLED)
+                self._set(e, q, b)
+                self._set(e, p, a)
+        else:
+            cells = (p,)
+
+            def redo():
+                self._set(e, p, b)
+
+            def undo():
+                self._set(e, p, a)
+
+        before = self._local(e, cells, officials)
+        redo()
+        return self._local(e, cells, officials) - before, undo, redo
+
+    def _run_swap(self, rng, e, p):
+        """
+        Swap two officials' positions over the whole run of consecutive events
+        in which both keep those positions.
+
+        A single-event swap breaks both officials' position continuity on
+        either side, so on its own it can rarely pay for a better fit; moving
+        the whole run only changes continuity at the run's ends.
+        """
+        a = self.grid[e][p]
+        q = rng.randrange(self.n_positions)
+        b = self.grid[e][q]
+        if a < 0 or b < 0 or q == p or not self.can_work[a][q] or not self.can_work[b][p]:
+            return None
+        first = last = e
+        while first > 0 and self.grid[first - 1][p] == a and self.grid[first - 1][q] == b:
+            first -= 1
+        while last + 1 < self.n_events and self.grid[last + 1][p] == a and self.grid[last + 1][q] == b:
+            last += 1
+        run = range(first, last + 1)
+        ends = (first,) if first == last else (first, last)
+
+        def score():
+            # Continuity inside the run is unaffected; only its ends matter.
+            total = sum(self._cell_cost(x, p) + self._cell_cost(x, q) for x in run)
+            return total + CHANGE_WEIGHT * sum(self._changes(o, x) for o in (a, b) for x in ends)
+
+        def swap(left, right):
+            for x in run:
+                self.grid[x][p], self.grid[x][q] = left, right
+                self.column[x][left], self.column[x][right] = p, q
+
+        before = score()
+        swap(b, a)
+        return score() - before, lambda: swap(a, b), lambda: swap(b, a)
+
+
+def improve_schedule(inputs, grid, option='LIGHTEST', budget_ms=None, max_iterations=None, seed=0):
+    """
+    Improve a constructed grid with simulated annealing.
+
+    Args:
+        inputs: The ScheduleInputs the grid was built from.
+        grid: The constructed grid; it is not modified.
+        option: Build option; HEAVIEST rewards concentrated loads.
+        budget_ms: Stop after this many milliseconds of wall-clock time.
+        max_iterations: Stop after this many proposed moves. With no time
+            budget the run is fully reproducible for a given seed.
+        seed: Seed for the move generator.
+
+    Returns a SearchResult holding the best grid found.
+    """
+    if budget_ms is None and max_iterations is None:
+        raise ValueError('Give a time budget, an iteration limit or both.')
+    started = time.perf_counter()
+    deadline = started + budget_ms / 1000 if budget_ms is not None else None
+    rng = random.Random(seed)
+    search = _Search(inputs, grid, option)
+    initial = best_score = search.score
+    best_grid = None  # None while the current state is the best one
+    iterations = accepted = 0
+    time_progress = 0.0
+    cooling = math.log(END_TEMPERATURE / START_TEMPERATURE)
+
+    while search.slots:
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        # Reading the clock on every move would cost more than the moves themselves.
+        if deadline is not None and iterations % 64 == 0:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time_progress = (now - started) / (deadline - started)
+        progress = max(time_progress, iterations / max_iterations if max_iterations else 0.0)
+        temperature = START_TEMPERATURE * math.exp(cooling * progress)
+        iterations += 1
+
+        move = search.propose(rng)
+        if move is None:
+            continue
+        delta, undo, redo = move
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            if delta > 0 and best_grid is None:
+                # Leaving the best state seen so far; keep a copy of it.
+                undo()
+                best_grid = [list(row) for row in search.grid]
+                redo()
+            search.score += delta
+            accepted += 1
+            if search.score < best_score - 1e-9:
+                best_score = search.score
+                best_grid = None
+        else:
+            undo()
+
+    return SearchResult(
+        grid=best_grid if best_grid is not None else search.grid,
+        initial_score=initial,
+        score=best_score,
+        iterations=iterations,
+        accepted=accepted,
+        elapsed=time.perf_counter() - started,
+    )
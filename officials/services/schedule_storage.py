@@ -0,0 +1,198 @@
+"""
+Compact binary storage for built schedules.
+
+A schedule is stored on its MeetSchedule row as one blob instead of one row
+per slot:
+
+    b'MSG' + version byte
+    uint32 header length
+    header JSON: event, position and official ids plus the cell type code,
+        and lane labels when positions were expanded per lane
+    event x position matrix of official indices (little-endian, row-major)
+    mandatory bitmask, one bit per cell
+
+Cells use the solver's markers: an index into the header's official ids,
+UNFILLED or NO_SLOT. PackedSchedule parses only the header up front and
+decodes matrix rows on request, so showing a few events of a large meet does
+not unpack the whole grid.
+
+A position expanded per lane (see lane_expansion) fills several columns with
+the same position id; the header's `lanes` list, parallel to `positions`,
+labels each column. Grids without lane columns omit it.
+
+This module deliberately does not import Django models so migrations and
+worker processes can use it.
+"""
+import json
+import struct
+import sys
+from array import array
+
+# Same values as officials.services.schedule_builder; repeated to keep this module model-free.
+UNFILLED = -1
+NO_SLOT = -2
+
+MAGIC = b'MSG'
+VERSION = 1
+_PREFIX = struct.Struct('<3sBI')
+
+
+class PackedSchedule:
+    """Read access to an encoded schedule grid."""
+
+    def __init__(self, data):
+        # Postgres hands bytea back as a memoryview; sqlite as bytes.
+        self._data = memoryview(data)
+        magic, version, header_length = _PREFIX.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not an encoded schedule grid.')
+        start = _PREFIX.size
+        header = json.loads(bytes(self._data[start:start + header_length]))
+        self.event_ids = header['events']
+        self.position_ids = header['positions']
+        self.official_ids = header['officials']
+        self.lanes = header.get('lanes') or [None] * len(self.position_ids)
+        self._typecode = header['type']
+        self._cells_offset = start + header_length
+        self._itemsize = array(self._typecode).itemsize
+        n_events, n_positions = self.shape
+        self._mask_offset = self._cells_offset + n_events * n_positions * self._itemsize
+        self._event_index = None
+        self._column_index = None
+
+    @property
+    def shape(self):
+        return len(self.event_ids), len(self.position_ids)
+
+    def event_index(self, event_id):
+        if self._event_index is None:
+            self._event_index = {event_id: e for e, event_id in enumerate(self.event_ids)}
+        return self._event_index[event_id]
+
+    @property
+    def column_keys(self):
+        """One key per column: the position id, or 'id:lane' for a lane column."""
+        return [str(pid) if lane is None else f'{pid}:{lane}' for pid, lane in zip(self.position_ids, self.lanes)]
+
+    def column_index(self, key):
+        """
+        The column of a column key (see column_keys). A bare position id also
+        names the first column of a lane-expanded position. Raises KeyError.
+        """
+        if self._column_index is None:
+            self._column_index = {}
+            for p, (pid, column_key) in enumerate(zip(self.position_ids, self.column_keys)):
+                self._column_index.setdefault(column_key, p)
+                self._column_index.setdefault(str(pid), p)
+        return self._column_index[str(key)]
+
+    def row(self, e):
+        """Official indices for row `e`, with UNFILLED / NO_SLOT markers."""
+        n_positions = self.shape[1]
+        start = self._cells_offset + e * n_positions * self._itemsize
+        cells = array(self._typecode)
+        cells.frombytes(self._data[start:start + n_positions * self._itemsize])
+        if sys.byteorder == 'big':
+            cells.byteswap()
+        return cells.tolist()
+
+    def mandatory_row(self, e):
+        n_positions = self.shape[1]
+        first = e * n_positions
+        mask = self._data[self._mask_offset:]
+        return [bool(mask[(first + p) >> 3] & (1 << ((first + p) & 7))) for p in range(n_positions)]
+
+    def rows(self, event_ids=None):
+        """
+        Yield (event_id, cells, mandatory) for the requested events.
+
+        With no `event_ids` every row is decoded, in event order.
+        """
+        indices = range(len(self.event_ids)) if event_ids is None else [self.event_index(i) for i in event_ids]
+        for e in indices:
+            yield self.event_ids[e], self.row(e), self.mandatory_row(e)
+
+    def grid(self):
+        """The whole matrix as a list of rows."""
+        return [self.row(e) for e in range(len(self.event_ids))]
+
+    def mandatory_mask(self):
+        return [self.mandatory_row(e) for e in range(len(self.event_ids))]
+
+    def arrays(self):
+        """
+        The matrix and mandatory mask as NumPy arrays, without going through
+        Python lists. The matrix is a read-only view onto the encoded data.
+        """
+        import numpy as np
+
+        n_events, n_positions = self.shape
+        n_cells = n_events * n_positions
+        dtype = np.dtype(self._typecode).newbyteorder('<')
+        matrix = np.frombuffer(self._data, dtype=dtype, count=n_cells, offset=self._cells_offset)
+        mask = np.frombuffer(self._data, dtype=np.uint8, count=(n_cells + 7) // 8, offset=self._mask_offset)
+        mandatory = np.unpackbits(mask, count=n_cells, bitorder='little').astype(bool)
+        return matrix.reshape(n_events, n_positions), mandatory.reshape(n_events, n_positions)
+
+    def slots(self, event_ids=None):
+        """
+        Yield (event_id, position_id, official_id or None, is_mandatory) for
+        every cell that is a slot.
+        """
+        for event_id, cells, mandatory in self.rows(event_ids):
+            for p, cell in enumerate(cells):
+                if cell != NO_SLOT:
+                    official_id = self.official_ids[cell] if cell >= 0 else None
+                    yield event_id, self.position_ids[p], official_id, mandatory[p]
+
+    def official_ids_used(self):
+        """Ids of the officials holding at least one slot."""
+        used = set()
+        for e in range(len(self.event_ids)):
+            used.update(cell for cell in self.row(e) if cell >= 0)
+        return {self.official_ids[o] for o in used}
+
+
+def encode(event_ids, position_ids, official_ids, grid, mandatory_mask, lanes=None):
+    """
+    Encode a grid of official indices into the binary schedule format.
+
+    `grid` and `mandatory_mask` are event x position lists of lists. `lanes`
+    optionally labels each position column with its lane (None for none).
+    """
+    typecode = 'h' if len(official_ids) < 2 ** 15 else 'i'
+    fields = {
+        'events': list(event_ids),
+        'positions': list(position_ids),
+        'officials': list(official_ids),
+        'type': typecode,
+    }
+    if lanes and any(lane is not None for lane in lanes):
+        if len(lanes) != len(position_ids):
+            raise ValueError('Lane labels do not match the position count.')
+        fields['lanes'] = list(lanes)
+    header = json.dumps(fields, separators=(',', ':')).encode()
+
+    cells = array(typecode, (cell for row in grid for cell in row))
+    if sys.byteorder == 'big':
+        cells.byteswap()
+
+    n_cells = len(event_ids) * len(position_ids)
+    if len(cells) != n_cells:
+        raise ValueError('Grid does not match the event and position counts.')
+    mask = bytearray((n_cells + 7) // 8)
+    i = 0
+    for row in mandatory_mask:
+        for flag in row:
+            if flag:
+                mask[i >> 3] |= 1 << (i & 7)
+            i += 1
+
+    return b''.join([_PREFIX.pack(MAGIC, VERSION, len(header)), header, cells.tobytes(), bytes(mask)])
+
+
+def encode_inputs(inputs, grid):
+    """Encode a solved grid together with the ScheduleInputs it was solved from."""
+    return encode(
+        inputs.event_ids, inputs.position_ids, inputs.official_ids, grid, inputs.mandatory_mask, inputs.position_lanes
+    )
@@ -0,0 +1,138 @@
+"""
+Constraint checks for built or hand-edited schedules.
+
+A schedule is valid when:
+
+* every mandatory slot has an official;
+* every official's certification level meets their position's
+  minimum_certification level;
+* no official holds two positions in the same event.
+
+The checks run on the packed grid (see schedule_storage) as NumPy masks, so
+validating a schedule costs two small queries for the certification levels
+and a handful of array operations, however many slots the meet has.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from officials.models import Official, Position
+from officials.services.schedule_storage import UNFILLED
+
+UNFILLED_MANDATORY = 'unfilled_mandatory'
+UNDER_CERTIFIED = 'under_certified'
+DOUBLE_BOOKED = 'double_booked'
+
+
+@dataclass
+class Violation:
+    """One broken constraint at a slot of the grid."""
+    kind: str
+    event_id: int
+    position_id: int
+    official_id: int = None
+    # Lane label of the column for a lane-expanded position (see lane_expansion).
+    lane: str = None
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'event_id': self.event_id,
+            'position_id': self.position_id,
+            'lane': self.lane,
+            'official_id': self.official_id,
+        }
+
+
+def find_violations(matrix, mandatory, official_levels, position_levels):
+    """
+    Check a grid of official indices.
+
+    Args:
+        matrix: event x position array of official indices, UNFILLED or NO_SLOT.
+        mandatory: event x position boolean array.
+        official_levels: Certification level of each official index.
+        position_levels: Minimum certification level of each position column.
+
+    Returns {kind: (event indices, position indices)} with the cells that
+    break each constraint, in row-major order.
+    """
+    matrix = np.asarray(matrix)
+    official_levels = np.asarray(official_levels, dtype=np.int64)
+    position_levels = np.asarray(position_levels, dtype=np.int64)
+
+    unfilled = (matrix == UNFILLED) & np.asarray(mandatory, dtype=bool)
+
+    rows, cols = np.nonzero(matrix >= 0)
+    officials = matrix[rows, cols].astype(np.int64)
+    under = official_levels[officials] < position_levels[cols]
+
+    # An (event, official) pair occurring more than once is a double booking.
+    pairs = rows.astype(np.int64) * max(len(official_levels), 1) + officials
+    _unique, inverse, counts = np.unique(pairs, return_inverse=True, return_counts=True)
+    doubled = counts[inverse] > 1
+
+    return {
+        UNFILLED_MANDATORY: np.nonzero(unfilled),
+        UNDER_CERTIFIED: (rows[under], cols[under]),
+        DOUBLE_BOOKED: (rows[doubled], cols[doubled]),
+    }
+
+
+def validate_grid(event_ids, position_ids, official_ids, matrix, mandatory, official_levels, position_levels,
+                  lanes=None):
+    """
+    find_violations() mapped back to ids, as a list of Violations ordered by
+    kind, then event, then position. `lanes` labels the columns, as in
+    schedule_storage.
+    """
+    matrix = np.asarray(matrix)
+    lanes = lanes or [None] * len(position_ids)
+    violations = []
+    for kind, (rows, cols) in find_violations(matrix, mandatory, official_levels, position_levels).items():
+        for e, p in zip(rows.tolist(), cols.tolist()):
+            cell = int(matrix[e, p])
+            violations.append(Violation(
+                kind=kind,
+                event_id=event_ids[e],
+                position_id=position_ids[p],
+                official_id=official_ids[cell] if cell >= 0 else None,
+                lane=lanes[p],
+            ))
+    return violations
+
+
+def certification_levels(official_ids, position_ids):
+    """
+    Current certification levels, aligned with the given ids.
+
+    Returns (official levels, position minimum levels); a missing
+    certification counts as level 0, as in the builder.
+    """
+    official_level = dict(
+        Official.objects.filter(id__in=official_ids).values_list('id', 'certification__level')
+    )
+    position_level = dict(
+        Position.objects.filter(id__in=position_ids).values_list('id', 'minimum_certification__level')
+    )
+    return (
+        [official_level.get(official_id) or 0 for official_id in official_ids],
+        [position_level.get(position_id) or 0 for position_id in position_ids],
+    )
+
+
+def validate_schedule(schedule):
+    """
+    Validate a MeetSchedule's grid against the officials' current
+    certifications. Mandatory slots are those recorded when the schedule was
+    built.
+    """
+    packed = schedule.packed
+    if packed is None:
+        raise ValueError('This schedule has no built grid to validate.')
+    matrix, mandatory = packed.arrays()
+    official_levels, position_levels = certification_levels(packed.official_ids, packed.position_ids)
+    return validate_grid(
+        packed.event_ids, packed.position_ids, packed.official_ids,
+        matrix, mandatory, official_levels, position_levels, packed.lanes,
+    )
@@ -0,0 +1,253 @@
+"""
+Season-wide workload index for officials.
+
+Every MeetSchedule records the slots each official works in it
+(`official_loads`, {official id: [slots, heavy slots]}). Each meet counts one
+schedule towards the season (`season_counted`): the one saved most recently.
+OfficialSeasonLoad keeps the running totals per official and season (the
+meet date's year): slots, heavy slots and meets worked.
+
+Whenever a schedule is saved, repaired or deleted the totals are adjusted by
+the difference between what the meet counted before and what it counts now.
+A build therefore reads one row per official instead of re-aggregating past
+schedules. rebuild_season_loads() recomputes everything
+from scratch, e.g. after importing data.
+"""
+import logging
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from officials.models import Meet, MeetSchedule, OfficialSeasonLoad, Position
+
+logger = logging.getLogger(__name__)
+
+LATEST = ('-created_at', '-id')
+
+
+def heavy_level():
+    return getattr(settings, 'SEASON_HEAVY_POSITION_LEVEL', 3)
+
+
+def season_of(meet):
+    return meet.date.year
+
+
+def official_loads(packed, position_levels):
+    """
+    {official id (str): [slots, heavy slots]} for a packed grid.
+
+    `position_levels` maps position ids to their minimum certification level.
+    Keys are strings so the result round-trips through a JSONField unchanged.
+    """
+    matrix, _mandatory = packed.arrays()
+    rows, cols = np.nonzero(matrix >= 0)
+    officials = matrix[rows, cols].astype(np.intp)
+    heavy_columns = np.array(
+        [(position_levels.get(pid) or 0) >= heavy_level() for pid in packed.position_ids], dtype=bool
+    )
+    n_officials = len(packed.official_ids)
+    slots = np.bincount(officials, minlength=n_officials)
+    heavy = np.bincount(officials[heavy_columns[cols]], minlength=n_officials)
+    return {
+        str(official_id): [int(slots[o]), int(heavy[o])]
+        for o, official_id in enumerate(packed.official_ids) if slots[o]
+    }
+
+
+def _delta(old, new):
+    """{official id: [slots, heavy, meets]} turning `old` loads into `new` ones."""
+    delta = {}
+    for key in (old or {}).keys() | (new or {}).keys():
+        before = (old or {}).get(key, [0, 0])
+        after = (new or {}).get(key, [0, 0])
+        change = [after[0] - before[0], after[1] - before[1], int(bool(after[0])) - int(bool(before[0]))]
+        if any(change):
+            delta[int(key)] = change
+    return delta
+
+
+def apply_deltas(deltas):
+    """
+    Add {season: {official id: [slots, heavy, meets]}} to the index.
+
+    Rows are locked while they are updated so concurrent builds do not lose
+    each other's changes.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        for season, delta in deltas.items():
+            if not delta:
+                continue
+            OfficialSeasonLoad.objects.bulk_create(
+                [OfficialSeasonLoad(official_id=official_id, season=season) for official_id in delta],
+                ignore_conflicts=True,
+            )
+            rows = list(
+                OfficialSeasonLoad.objects.select_for_update().filter(season=season, official_id__in=delta)
+            )
+            for row in rows:
+                slots, heavy, meets = delta[row.official_id]
+                row.slots += slots
+                row.heavy_slots += heavy
+                row.meets += meets
+                row.updated_at = now
+            OfficialSeasonLoad.objects.bulk_update(rows, ['slots', 'heavy_slots', 'meets', 'updated_at'])
+
+
+def record_schedules(schedules):
+    """
+    Count newly saved schedules towards the season, in place of what their
+    meets counted before. Each meet should appear at most once; schedules
+    may already be saved with season_counted set.
+    """
+    schedules = [schedule for schedule in schedules if schedule.official_loads is not None]
+    if not schedules:
+        return
+    meet_ids = [schedule.meet_id for schedule in schedules]
+    new_ids = [schedule.pk for schedule in schedules]
+    unflagged = [schedule.pk for schedule in schedules if not schedule.season_counted]
+    previous = dict(
+        MeetSchedule.objects
+        .filter(meet_id__in=meet_ids, season_counted=True)
+        .exclude(pk__in=new_ids)
+        .values_list('meet_id', 'official_loads')
+    )
+    # An official can work several of these meets in one season, so their changes add up.
+    deltas = defaultdict(lambda: defaultdict(lambda: [0, 0, 0]))
+    for schedule in schedules:
+        for official_id, change in _delta(previous.get(schedule.meet_id), schedule.official_loads).items():
+            total = deltas[season_of(schedule.meet)][official_id]
+            for i, c in enumerate(change):
+                total[i] += c
+        schedule.season_counted = True
+    if not previous and not unflagged:
+        apply_deltas(deltas)
+        return
+    with transaction.atomic():
+        if previous:
+            MeetSchedule.objects.filter(meet_id__in=previous, season_counted=True).exclude(pk__in=new_ids).update(
+                season_counted=False
+            )
+        if unflagged:
+            MeetSchedule.objects.filter(pk__in=unflagged).update(season_counted=True)
+        apply_deltas(deltas)
+
+
+def restate_schedule(schedule, old_loads):
+    """Adjust the index after a counted schedule's grid changed from `old_loads`."""
+    if schedule.season_counted:
+        apply_deltas({season_of(schedule.meet): _delta(old_loads, schedule.official_loads)})
+
+
+def forget_schedule(schedule):
+    """
+    Adjust the index after a schedule was deleted: if it was the one its meet
+    counted, the meet's newest remaining schedule is counted instead.
+    """
+    if not schedule.season_counted:
+        return
+    try:
+        season = season_of(Meet.objects.only('date').get(pk=schedule.meet_id))
+    except Meet.DoesNotExist:
+        return
+    replacement = (
+        MeetSchedule.objects.filter(meet_id=schedule.meet_id).exclude(official_loads=None)
+        .order_by(*LATEST).only('pk', 'official_loads').first()
+    )
+    with transaction.atomic():
+        if replacement is not None:
+            MeetSchedule.objects.filter(pk=replacement.pk).update(season_counted=True)
+        apply_deltas({season: _delta(schedule.official_loads, replacement and replacement.official_loads)})
+
+
+def season_loads(meets, official_ids_by_meet):
+    """
+    {meet id: {official id: (slots, heavy slots, meets)}} for the season of
+    each meet, with two queries.
+
+    Each meet's own counted schedule is left out, so a meet being rebuilt is
+    not weighed against itself.
+    """
+    all_officials = {official_id for ids in official_ids_by_meet.values() for official_id in ids}
+    totals = {
+        (season, official_id): (slots, heavy, count)
+        for season, official_id, slots, heavy, count in OfficialSeasonLoad.objects
+        .filter(season__in={season_of(meet) for meet in meets}, official_id__in=all_officials)
+        .values_list('season', 'official_id', 'slots', 'heavy_slots', 'meets')
+    }
+    counted = dict(
+        MeetSchedule.objects
+        .filter(meet_id__in=[meet.id for meet in meets], season_counted=True)
+        .values_list('meet_id', 'official_loads')
+    )
+    by_meet = {}
+    for meet in meets:
+        own = _delta(counted.get(meet.id), None)
+        by_meet[meet.id] = {
+            official_id: tuple(
+                total + change
+                for total, change in zip(totals.get((season_of(meet), official_id), (0, 0, 0)),
+                                         own.get(official_id, (0, 0, 0)))
+            )
+            for official_id in official_ids_by_meet.get(meet.id, ())
+        }
+    return by_meet
+
+
+def fairness(load):
+    """Single season-load figure used by LIGHTEST builds: heavy slots count twice."""
+    slots, heavy, _meets = load
+    return slots + heavy
+
+
+def rebuild_season_loads(season=None):
+    """
+    Recompute the index from each meet's newest schedule.
+
+    Fills in official_loads for schedules saved before it existed. Returns the
+    number of meets counted.
+    """
+    meets = Meet.objects.all() if season is None else Meet.objects.filter(date__year=season)
+    newest = MeetSchedule.objects.filter(meet=OuterRef('pk')).order_by(*LATEST).values('pk')[:1]
+    schedule_ids = [pk for pk in meets.annotate(newest=Subquery(newest)).values_list('newest', flat=True) if pk]
+    schedules = list(MeetSchedule.objects.filter(pk__in=schedule_ids).select_related('meet'))
+
+    missing = [s for s in schedules if s.official_loads is None and s.packed is not None]
+    if missing:
+        levels = dict(
+            Position.objects
+            .filter(id__in={pid for s in missing for pid in s.packed.position_ids})
+            .values_list('id', 'minimum_certification__level')
+        )
+        for schedule in missing:
+            schedule.official_loads = official_loads(schedule.packed, levels)
+        MeetSchedule.objects.bulk_update(missing, ['official_loads'])
+
+    totals = defaultdict(lambda: defaultdict(lambda: [0, 0, 0]))
+    for schedule in schedules:
+        for official_id, change in _delta(None, schedule.official_loads).items():
+            total = totals[season_of(schedule.meet)][official_id]
+            for i, c in enumerate(change):
+                total[i] += c
+
+    with transaction.atomic():
+        MeetSchedule.objects.filter(meet__in=meets, season_counted=True).exclude(pk__in=schedule_ids).update(
+            season_counted=False
+        )
+        MeetSchedule.objects.filter(pk__in=schedule_ids).update(season_counted=True)
+        stale = OfficialSeasonLoad.objects.all()
+        if season is not None:
+            stale = stale.filter(season=season)
+        stale.delete()
+        OfficialSeasonLoad.objects.bulk_create([
+            OfficialSeasonLoad(official_id=official_id, season=year, slots=slots, heavy_slots=heavy, meets=count)
+            for year, by_official in totals.items()
+            for official_id, (slots, heavy, count) in by_official.items()
+        ])
+    logger.info("Rebuilt season loads from %s meet schedule(s)", len(schedules))
+    return len(schedules)
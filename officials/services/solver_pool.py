@@ -0,0 +1,118 @@
+"""
+Process pool for schedule solves.
+
+Spawned workers start from a bare interpreter and unpickle the initializer
+and task functions by importing this module, so it must not import Django
+models at module level. The initializer sets Django up before any task
+(whose arguments reference the solver's dataclasses) arrives.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def init_worker():
+    import django
+    django.setup()
+
+
+def get_pool(workers=None):
+    """
+    Return the process-wide solver pool, creating it on first use.
+
+    Spawning workers and setting Django up in them takes about a second, far
+    longer than a single solve, so short-lived callers such as a portfolio
+    build share one long-lived pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+            )
+        return _pool
+
+
+def reset_pool():
+    """Discard the shared pool, e.g. after a worker died and broke it."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def can_fork_workers():
+    # Pool workers are daemonic and may not start pools of their own.
+    return not multiprocessing.current_process().daemon
+
+
+def solve_task(inputs, option):
+    from officials.services.schedule_builder import solve
+    return solve(inputs, option)
+
+
+def portfolio_task(inputs, heuristic, objective, seed, improve_ms):
+    """
+    Build one portfolio candidate: construct with `heuristic`, optionally
+    improve it, and score it with the `objective` option's quality metric.
+
+    Returns (grid, score, construct seconds, improve seconds).
+    """
+    from officials.services.schedule_builder import solve
+    from officials.services.schedule_search import improve_schedule, schedule_quality
+
+    started = time.perf_counter()
+    grid = solve(inputs, heuristic)
+    constructed = time.perf_counter()
+    improve_seconds = 0.0
+    if improve_ms:
+        grid = improve_schedule(inputs, grid, objective, budget_ms=improve_ms, seed=seed).grid
+        improve_seconds = time.perf_counter() - constructed
+    return grid, schedule_quality(inputs, grid, objective), constructed - started, improve_seconds
+
+
+def solve_many(inputs_list, option, workers=None, progress=None):
+    """
+    Solve several meets, in parallel when more than one worker is allowed.
+
+    Returns a list of grids (or the exception raised for that meet) in the
+    order of `inputs_list`.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(inputs_list)))
+    grids = [None] * len(inputs_list)
+    done = 0
+
+    if workers == 1:
+        for i, inputs in enumerate(inputs_list):
+            try:
+                grids[i] = solve_task(inputs, option)
+            except Exception as e:
+                grids[i] = e
+            done += 1
+            if progress:
+                progress(done / len(inputs_list))
+        return grids
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker) as pool:
+        futures = {pool.submit(solve_task, inputs, option): i for i, inputs in enumerate(inputs_list)}
+        for future in futures:
+            i = futures[future]
+            try:
+                grids[i] = future.result()
+            except Exception as e:
+                grids[i] = e
+            done += 1
+            if progress:
+                progress(done / len(inputs_list))
+    return grids
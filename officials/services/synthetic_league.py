@@ -0,0 +1,252 @@
+"""
+Synthetic leagues for benchmarking.
+
+generate_league() fills the database with a league of realistic shape: a
+division structure, teams with officials spread over the certification
+levels, a strategy's positions wired to the dual meet events through
+EventPositions, and one round of dual meets with confirmed assignments.
+Rows are written with bulk_create so even the largest preset (1,000 teams,
+50,000 officials) is generated in seconds rather than minutes.
+
+Events and strategies are shared across leagues (events are unique per
+number and meet type, strategies per name), so the generator reuses existing
+rows where they exist and only adds what is missing.
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from officials.models import (Assignment, Certification, Division, Event, EventPosition, League, Meet, Official,
+                              Pool, Position, Strategy, Team)
+
+BATCH_SIZE = 2000
+
+CERTIFICATION_LEVELS = [
+    (1, 'Timer', 'TM'),
+    (2, 'Stroke and Turn', 'ST'),
+    (3, 'Starter', 'SR'),
+    (4, 'Referee', 'RF'),
+]
+
+# (role, minimum certification level, number of locations) for generated positions.
+POSITION_ROLES = [
+    ('Referee', 4, 1),
+    ('Starter', 3, 1),
+    ('Stroke and Turn', 2, 4),
+    ('Timer', 1, 8),
+    ('Clerk of Course', 1, 2),
+    ('Marshal', 1, 2),
+]
+
+PROFICIENCIES = [value for value, _label in Official.PROFICIENCY_CHOICES]
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    """How big a generated league is."""
+    divisions: int
+    teams: int
+    officials_per_team: int
+    events: int
+    positions: int
+    # Officials of each team confirmed for its meet.
+    confirmed_per_team: int = 12
+
+    @property
+    def officials(self):
+        return self.teams * self.officials_per_team
+
+
+SCALES = {
+    'small': SyntheticScale(divisions=2, teams=8, officials_per_team=20, events=20, positions=12),
+    'medium': SyntheticScale(divisions=10, teams=100, officials_per_team=40, events=40, positions=24),
+    'large': SyntheticScale(divisions=50, teams=1000, officials_per_team=50, events=60, positions=40, confirmed_per_team=20),
+}
+
+
+@dataclass
+class SyntheticLeague:
+    """What generate_league() created."""
+    league: League
+    scale: SyntheticScale
+    strategy: Strategy
+    meet_date: date
+    user: object
+    # One dual meet per pair of teams, all on meet_date.
+    meets: list = field(default_factory=list)
+    # A divisional meet with no assignments yet, for auto-assign runs.
+    open_meet: Meet = None
+
+
+def _levels(rng, count):
+    # Most volunteers are timers; each certification level above is rarer.
+    return rng.choices([level for level, _name, _abbr in CERTIFICATION_LEVELS], weights=[8, 4, 2, 1], k=count)
+
+
+def _certifications():
+    certifications = {}
+    for level, name, abbreviation in CERTIFICATION_LEVELS:
+        certification = Certification.objects.filter(level=level, name=name).first()
+        if certification is None:
+            certification = Certification.objects.create(name=name, abbreviation=abbreviation, level=level)
+        certifications[level] = certification
+    return certifications
+
+
+def _positions(strategy, certifications, count):
+    # Positions beyond the standard set are extra timer lanes.
+    extra = max(0, count - sum(locations for _role, _level, locations in POSITION_ROLES))
+    specs = [
+        (role, level, f'Lane {n}' if locations > 1 else 'Deck')
+        for role, level, locations in POSITION_ROLES
+        for n in range(1, locations + 1 + (extra if role == 'Timer' else 0))
+    ][:count]
+    Position.objects.bulk_create(
+        [
+            Position(role=role, location=location, strategy=strategy, minimum_certification=certifications[level])
+            for role, level, location in specs
+        ],
+        ignore_conflicts=True,
+    )
+    wanted = {(role, location) for role, _level, location in specs}
+    return [
+        position for position in Position.objects.filter(strategy=strategy)
+        if (position.role, position.location) in wanted
+    ]
+
+
+def _events(count):
+    existing = set(Event.objects.filter(meet_type='dual').values_list('event_number', flat=True))
+    Event.objects.bulk_create([
+        Event(event_number=n, name=f'Event {n}', meet_type='dual', gender='male' if n % 2 else 'female')
+        for n in range(1, count + 1) if n not in existing
+    ])
+    return list(Event.objects.filter(meet_type='dual', event_number__lte=count))
+
+
+def generate_league(scale, seed=0, meet_date=None, name=None):
+    """
+    Create a synthetic league at `scale` (a SyntheticScale or a SCALES key).
+
+    Returns a SyntheticLeague. Runs in one transaction; `seed` makes the
+    certification and proficiency mix reproducible. Raises ValueError when a
+    division would have fewer than two teams.
+    """
+    if isinstance(scale, str):
+        scale = SCALES[scale]
+    if scale.teams < 2 * scale.divisions:
+        raise ValueError('Each division needs at least two teams to hold a dual meet.')
+    rng = random.Random(seed)
+    meet_date = meet_date or date.today() + timedelta(days=30)
+
+    with transaction.atomic():
+        certifications = _certifications()
+        strategy, _created = Strategy.objects.get_or_create(name='QUADRANTS')
+        positions = _positions(strategy, certifications, scale.positions)
+        events = _events(min(scale.events, 99))
+        # Clerks and marshals only work odd events; timers are optional on even ones.
+        EventPosition.objects.bulk_create(
+            [
+                EventPosition(
+                    event=event, position=position,
+                    is_mandatory=position.role != 'Timer' or event.event_number % 2 == 1,
+                )
+                for event in events
+                for position in positions
+                if position.role not in ('Clerk of Course', 'Marshal') or event.event_number % 2 == 1
+            ],
+            ignore_conflicts=True,
+            batch_size=BATCH_SIZE,
+        )
+
+        league = League.objects.create(name=name or f'Synthetic League {seed}', description='Benchmark data')
+        user = get_user_model().objects.create_user(
+            username=f'synthetic-{league.pk}', password=None, is_staff=True
+        )
+        league.users.add(user)
+
+        divisions = Division.objects.bulk_create([
+            Division(name=f'Division {d + 1}', league=league) for d in range(scale.divisions)
+        ])
+        teams = Team.objects.bulk_create(
+            [
+                Team(name=f'Team {t + 1}', abbreviation=f'T{t + 1}', division=divisions[t % scale.divisions])
+                for t in range(scale.teams)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        pools = Pool.objects.bulk_create(
+            [Pool(name=f'{team.name} Pool', team=team, lanes=rng.choice([6, 8]), length=25) for team in teams],
+            batch_size=BATCH_SIZE,
+        )
+
+        levels = _levels(rng, scale.officials)
+        officials = Official.objects.bulk_create(
+            [
+                Official(
+                    name=f'Official {t + 1}-{o + 1}',
+                    email=f'official{t + 1}-{o + 1}@example.com',
+                    team=team,
+                    certification=certifications[levels[t * scale.officials_per_team + o]],
+                    proficiency=rng.choice(PROFICIENCIES),
+                )
+                for t, team in enumerate(teams)
+                for o in range(scale.officials_per_team)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        # Pair up teams within each division for one round of dual meets.
+        by_division = {}
+        for t, team in enumerate(teams):
+            by_division.setdefault(team.division_id, []).append((team, pools[t]))
+        pairs = [
+            (home, away)
+            for members in by_division.values()
+            for home, away in zip(members[0::2], members[1::2])
+        ]
+        meets = Meet.objects.bulk_create([
+            Meet(
+                name=f'{home.name} vs {away.name}', date=meet_date, league=league, division_id=home.division_id,
+                host_team=home, pool=pool, meet_type='dual', strategy=strategy,
+            )
+            for (home, pool), (away, _away_pool) in pairs
+        ])
+        Participation = Meet.participating_teams.through
+        Participation.objects.bulk_create(
+            [
+                Participation(meet_id=meet.pk, team_id=team.pk)
+                for meet, ((home, _home_pool), (away, _away_pool)) in zip(meets, pairs)
+                for team in (home, away)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        officials_by_team = {}
+        for official in officials:
+            officials_by_team.setdefault(official.team_id, []).append(official)
+        confirmed = min(scale.confirmed_per_team, scale.officials_per_team)
+        Assignment.objects.bulk_create(
+            [
+                Assignment(meet=meet, official=official, role=official.certification.name, confirmed=True)
+                for meet, ((home, _home_pool), (away, _away_pool)) in zip(meets, pairs)
+                for team in (home, away)
+                for official in officials_by_team[team.pk][:confirmed]
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        first_division = divisions[0]
+        open_meet = Meet.objects.create(
+            name=f'{first_division.name} Championship', date=meet_date + timedelta(days=7), league=league,
+            division=first_division, host_team=teams[0], pool=pools[0], meet_type='divisional', strategy=strategy,
+        )
+        open_meet.participating_teams.set([team for team in teams if team.division_id == first_division.pk])
+
+    return SyntheticLeague(
+        league=league, scale=scale, strategy=strategy, meet_date=meet_date, user=user,
+        meets=meets, open_meet=open_meet,
+    )
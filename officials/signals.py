@@ -0,0 +1,156 @@
+"""
+Signal handlers that keep derived schedule data in step with its inputs.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from officials.models import Assignment, EventPosition, League, Meet, MeetSchedule, Position, PublishedSchedule, Team
+from officials.services import delta_sync, schedule_cache, schedule_publish, season_load
+from officials.services.schedule_builder import repair_schedules
+
+logger = logging.getLogger(__name__)
+
+# Saving any of these fields can take a confirmed official off a meet.
+DROPOUT_FIELDS = {'confirmed', 'meet', 'meet_id', 'official', 'official_id'}
+
+
+@receiver([post_save, post_delete], sender=Assignment)
+def assignment_changed(sender, instance, **kwargs):
+    assignments_changed([instance.meet_id])
+
+
+def assignments_changed(meet_ids):
+    """Drop what depends on these assignments; called directly after bulk writes, which send no signals."""
+    for meet_id in set(meet_ids):
+        schedule_cache.invalidate_meet(meet_id)
+
+
+def dropout(previous, assignment):
+    """(meet id, official id) a confirmed `previous` loses by becoming `assignment`, or None."""
+    if previous is None or not previous.confirmed:
+        return None
+    stored = (previous.meet_id, previous.official_id)
+    if assignment is not None and assignment.confirmed and stored == (assignment.meet_id, assignment.official_id):
+        return None
+    return stored
+
+
+@receiver(pre_save, sender=Assignment)
+def assignment_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._dropout = None
+    if raw or instance._state.adding or (update_fields is not None and not DROPOUT_FIELDS & update_fields):
+        return
+    previous = Assignment.objects.filter(pk=instance.pk).only('confirmed', 'meet_id', 'official_id').first()
+    instance._dropout = dropout(previous, instance)
+
+
+@receiver(post_save, sender=Assignment)
+def assignment_saved(sender, instance, **kwargs):
+    if getattr(instance, '_dropout', None):
+        repair_on_commit([instance._dropout], instance)
+
+
+@receiver(post_delete, sender=Assignment)
+def assignment_deleted(sender, instance, **kwargs):
+    if instance.confirmed:
+        repair_on_commit([(instance.meet_id, instance.official_id)], instance)
+
+
+def repair_on_commit(dropouts, assignment=None):
+    """
+    Repair the built schedules of meets that lost a confirmed official.
+
+    `dropouts` holds (meet id, official id) pairs; called directly after bulk
+    writes, which send no signals. The repair waits for the commit, so it sees
+    the whole write: a meet deleted with its assignments is skipped rather than
+    patched on its way out. A failed repair is logged and rolled back without
+    undoing the write. The number of slots reassigned, or None if a repair
+    failed, is left on `assignment.repaired_slots`.
+    """
+    dropouts = set(dropouts)
+    if not dropouts:
+        return
+
+    def repair():
+        meets = Meet.objects.in_bulk({meet_id for meet_id, _official_id in dropouts})
+        repaired, failed = 0, False
+        for meet_id, official_id in sorted(dropouts):
+            if meet_id not in meets:
+                continue
+            try:
+                with transaction.atomic():
+                    repaired += repair_schedules(meets[meet_id], official_id)
+            except Exception:
+                logger.exception("Schedule repair failed for official %s in meet %s", official_id, meet_id)
+                failed = True
+        if assignment is not None:
+            assignment.repaired_slots = None if failed else repaired
+
+    transaction.on_commit(repair)
+
+
+@receiver([post_save, post_delete], sender=EventPosition)
+@receiver([post_save, post_delete], sender=Position)
+def event_positions_changed(sender, instance, **kwargs):
+    # An EventPosition or Position can belong to any number of meets' grids.
+    schedule_cache.invalidate_all()
+
+
+@receiver(post_delete, sender=MeetSchedule)
+def schedule_deleted(sender, instance, **kwargs):
+    season_load.forget_schedule(instance)
+
+
+@receiver(post_delete, sender=PublishedSchedule)
+def publication_deleted(sender, instance, **kwargs):
+    schedule_publish.forget_publication(instance.pk)
+
+
+def synced_row_saving(sender, instance, raw=False, **kwargs):
+    if not raw and not instance._state.adding:
+        delta_sync.record_scope_change(instance)
+
+
+def synced_row_deleting(sender, instance, **kwargs):
+    # Runs before Django nulls the SET_NULL references with a plain UPDATE.
+    delta_sync.touch_dependents(instance)
+
+
+def synced_row_deleted(sender, instance, **kwargs):
+    delta_sync.record_deletion(instance)
+
+
+# Connected per model: a receiver for every sender would stop Django fast-deleting other models' rows.
+for _model in delta_sync.SYNCED_MODELS:
+    pre_save.connect(synced_row_saving, sender=_model, dispatch_uid=f'sync-scope-{_model._meta.label}')
+    pre_delete.connect(synced_row_deleting, sender=_model, dispatch_uid=f'sync-touch-{_model._meta.label}')
+    post_delete.connect(synced_row_deleted, sender=_model, dispatch_uid=f'sync-tombstone-{_model._meta.label}')
+
+
+# Many-to-many fields serialized with their owner: through table -> (owner, field name).
+SYNCED_MEMBERSHIPS = {
+    League.users.through: (League, 'users'),
+    Team.users.through: (Team, 'users'),
+    Meet.participating_teams.through: (Meet, 'participating_teams'),
+}
+
+
+@receiver(m2m_changed, sender=League.users.through)
+@receiver(m2m_changed, sender=Team.users.through)
+@receiver(m2m_changed, sender=Meet.participating_teams.through)
+def membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Bump the owner's updated_at so delta sync resends it with its new members."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    owner, field = SYNCED_MEMBERSHIPS[sender]
+    if not reverse:
+        owners = owner.objects.filter(pk=instance.pk)
+    elif action == 'pre_clear':
+        owners = owner.objects.filter(**{field: instance})
+    else:
+        owners = owner.objects.filter(pk__in=pk_set)
+    owners.update(updated_at=timezone.now())
@@ -0,0 +1,120 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from officials.models import Assignment, Division, League, Meet, Official, Team
+from officials.services import official_feed
+
+User = get_user_model()
+
+
+class BulkWriteTests(APITestCase):
+    """List-valued writes to the officials and assignments endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='syncer', password='testpassword123')
+        self.client.login(username='syncer', password='testpassword123')
+        league = League.objects.create(name='Bulk League')
+        self.team = Team.objects.create(name='Bulk Team', division=Division.objects.create(name='Bulk', league=league))
+        self.meet = Meet.objects.create(name='Bulk Meet', date=date(2026, 7, 11), league=league, host_team=self.team)
+        self.official = Official.objects.create(name='Existing Official', team=self.team)
+        self.officials_url = reverse('official-list')
+        self.officials_bulk_url = reverse('official-bulk')
+        self.assignments_bulk_url = reverse('assignment-bulk')
+
+    def roster(self, n):
+        return [{'name': f'Official {i}', 'team': self.team.pk, 'certification': None} for i in range(n)]
+
+    def test_list_post_creates_every_item_in_one_insert(self):
+        # Session, user, one team lookup per item and the insert inside its savepoint.
+        with self.assertNumQueries(2 + 25 + 3):
+            response = self.client.post(self.officials_url, self.roster(25), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['results']), 25)
+        self.assertEqual(response.data['results'][3]['status'], status.HTTP_201_CREATED)
+        self.assertEqual(response.data['results'][3]['data']['name'], 'Official 3')
+        self.assertTrue(Official.objects.filter(pk=response.data['results'][3]['data']['id']).exists())
+
+    def test_invalid_item_rejects_the_whole_batch(self):
+        roster = self.roster(3)
+        roster[1]['team'] = 0
+        response = self.client.post(self.officials_bulk_url, roster, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [item['status'] for item in response.data['results']],
+            [status.HTTP_424_FAILED_DEPENDENCY, status.HTTP_400_BAD_REQUEST, status.HTTP_424_FAILED_DEPENDENCY],
+        )
+        self.assertIn('team', response.data['results'][1]['errors'])
+        self.assertEqual(Official.objects.count(), 1)
+
+    def test_single_object_post_still_works(self):
+        response = self.client.post(self.officials_url, self.roster(1)[0], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['name'], 'Official 0')
+
+    @override_settings(API_BULK_MAX_ITEMS=2)
+    def test_batches_are_capped(self):
+        response = self.client.post(self.officials_bulk_url, self.roster(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Official.objects.count(), 1)
+
+    def test_patch_updates_with_one_bulk_update(self):
+        other = Official.objects.create(name='Other Official', team=self.team)
+        response = self.client.patch(self.officials_bulk_url, [
+            {'id': self.official.pk, 'active': False},
+            {'id': other.pk, 'phone': '555-0199', 'proficiency': 'Expert'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['data']['id'] for item in response.data['results']], [self.official.pk, other.pk])
+        self.official.refresh_from_db()
+        other.refresh_from_db()
+        self.assertFalse(self.official.active)
+        self.assertEqual((other.phone, other.proficiency, other.active), ('555-0199', 'Expert', True))
+
+    def test_patch_rejects_unknown_and_repeated_ids(self):
+        response = self.client.patch(self.officials_bulk_url, [
+            {'id': self.official.pk, 'name': 'Renamed'},
+            {'id': self.official.pk, 'name': 'Renamed again'},
+            {'id': 999999, 'name': 'Ghost'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [item['status'] for item in response.data['results']],
+            [status.HTTP_424_FAILED_DEPENDENCY, status.HTTP_400_BAD_REQUEST, status.HTTP_400_BAD_REQUEST],
+        )
+        self.official.refresh_from_db()
+        self.assertEqual(self.official.name, 'Existing Official')
+
+    def test_delete_removes_listed_ids(self):
+        others = [Official.objects.create(name=f'Leaving {i}', team=self.team) for i in range(2)]
+        response = self.client.delete(self.officials_bulk_url, [official.pk for official in others], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['status'] for item in response.data['results']], [204, 204])
+        self.assertEqual(list(Official.objects.values_list('name', flat=True)), ['Existing Official'])
+
+    def test_delete_with_a_missing_id_deletes_nothing(self):
+        response = self.client.delete(self.officials_bulk_url, [self.official.pk, 999999], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Official.objects.filter(pk=self.official.pk).exists())
+
+    def test_bulk_assignments_change_the_feed_version(self):
+        before = official_feed.feed_version(self.official)
+        response = self.client.post(self.assignments_bulk_url, [
+            {'meet': self.meet.pk, 'official': self.official.pk, 'role': 'Timer'},
+            {'meet': self.meet.pk, 'official': self.official.pk, 'role': 'Starter'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Assignment.objects.filter(official=self.official).count(), 2)
+        self.assertNotEqual(official_feed.feed_version(self.official), before)
+
+    def test_duplicate_assignments_in_one_batch_are_rejected(self):
+        item = {'meet': self.meet.pk, 'official': self.official.pk, 'role': 'Timer'}
+        response = self.client.post(self.assignments_bulk_url, [item, dict(item)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Assignment.objects.exists())
@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from officials.models import Division, Event, League, Pool, Position, Strategy, Team
+
+User = get_user_model()
+
+
+class ConditionalGetTests(APITestCase):
+    """ETag / If-None-Match on the polled API reads."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='poller', password='testpassword123')
+        self.client.login(username='poller', password='testpassword123')
+        self.strategy = Strategy.objects.create(name='Dual Meet')
+        self.position = Position.objects.create(role='Timer', location='Lane', strategy=self.strategy)
+        self.event = Event.objects.create(name='50 Free', event_number=1)
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_list_is_not_modified(self):
+        url = reverse('position-list')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('no-cache', first['Cache-Control'])
+        # Session, user and the version aggregate; no rows are loaded.
+        with self.assertNumQueries(3):
+            second = self.revalidate(url, first)
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_edits_adds_and_deletes_change_the_list_etag(self):
+        url = reverse('position-list')
+        etags = [self.client.get(url)['ETag']]
+        self.position.role = 'Head Timer'
+        self.position.save()
+        etags.append(self.client.get(url)['ETag'])
+        other = Position.objects.create(role='Judge', location='Turn', strategy=self.strategy)
+        etags.append(self.client.get(url)['ETag'])
+        other.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[-1])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(set(etags)), 3)
+        # Back to the rows of the second read, so back to its ETag.
+        self.assertEqual(response['ETag'], etags[1])
+
+    def test_query_string_is_part_of_the_etag(self):
+        url = reverse('event-list')
+        first = self.client.get(url)
+        narrowed = self.client.get(f'{url}?fields=name', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(narrowed.status_code, status.HTTP_200_OK)
+        self.assertEqual(narrowed.data['results'], [{'name': '50 Free'}])
+
+    def test_detail_sends_last_modified(self):
+        url = reverse('event-detail', kwargs={'pk': self.event.pk})
+        first = self.client.get(url)
+        self.assertIn('Last-Modified', first)
+        self.assertEqual(self.revalidate(url, first).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.event.name = '100 Free'
+        self.event.save()
+        changed = self.revalidate(url, first)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data['name'], '100 Free')
+
+    def test_expanded_responses_are_never_not_modified(self):
+        url = f"{reverse('position-list')}?expand=strategy"
+        first = self.client.get(url)
+        self.assertNotIn('ETag', first)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_dropdown_lists_revalidate(self):
+        league = League.objects.create(name='Dropdown League')
+        team = Team.objects.create(name='Dropdown Team', division=Division.objects.create(name='D', league=league))
+        pool = Pool.objects.create(name='Home Pool', team=team, lanes=6)
+        url = reverse('api_team_pools', kwargs={'team_id': team.pk})
+        first = self.client.get(url)
+        self.assertEqual(self.revalidate(url, first).status_code, status.HTTP_304_NOT_MODIFIED)
+        pool.lanes = 8
+        pool.save()
+        self.assertEqual(self.revalidate(url, first).status_code, status.HTTP_200_OK)
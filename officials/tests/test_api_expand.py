@@ -0,0 +1,84 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from officials.models import Assignment, Certification, Division, League, Meet, Official, Team
+
+User = get_user_model()
+
+
+class ApiQueryPlanTests(APITestCase):
+    """API lists cost a fixed number of queries, with or without ?expand=."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='planner', password='testpassword123')
+        self.client.login(username='planner', password='testpassword123')
+        self.league = League.objects.create(name='Plan League')
+        self.league.users.add(self.user)
+        self.division = Division.objects.create(name='Plan Division', league=self.league)
+        self.certification = Certification.objects.create(name='Referee', abbreviation='REF', level=3)
+        self.count = 0
+        self.add_rows(3)
+
+    def add_rows(self, n):
+        for _ in range(n):
+            self.count += 1
+            team = Team.objects.create(name=f'Team {self.count}', division=self.division)
+            team.users.add(self.user)
+            official = Official.objects.create(name=f'Official {self.count}', team=team, certification=self.certification)
+            meet = Meet.objects.create(
+                name=f'Meet {self.count}', date=date(2026, 6, self.count), league=self.league, host_team=team
+            )
+            meet.participating_teams.add(team)
+            Assignment.objects.create(meet=meet, official=official, role='Referee')
+
+    def queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response.data['results']
+
+    def assert_fixed_cost(self, url):
+        before, _ = self.queries(url)
+        self.add_rows(4)
+        after, results = self.queries(url)
+        self.assertEqual(after, before, url)
+        return results
+
+    def test_lists_with_nested_users_do_not_query_per_row(self):
+        for name in ('league-list', 'team-list', 'meet-list', 'official-list', 'assignment-list'):
+            self.assert_fixed_cost(reverse(name))
+
+    def test_expanded_lists_do_not_query_per_row(self):
+        self.assert_fixed_cost(f"{reverse('official-list')}?expand=team,certification")
+        self.assert_fixed_cost(f"{reverse('assignment-list')}?expand=meet,official")
+        self.assert_fixed_cost(f"{reverse('meet-list')}?expand=league,host_team,pool,participating_teams")
+        self.assert_fixed_cost(f"{reverse('team-list')}?expand=division")
+
+    def test_expand_inlines_related_objects(self):
+        _count, results = self.queries(f"{reverse('official-list')}?expand=team,certification")
+        self.assertEqual(results[0]['certification']['abbreviation'], 'REF')
+        self.assertEqual(results[0]['team']['name'], 'Team 1')
+        self.assertEqual(results[0]['team']['users'][0]['username'], 'planner')
+        # The nested team keeps its division as an id.
+        self.assertEqual(results[0]['team']['division'], self.division.pk)
+
+    def test_unexpanded_fields_stay_ids(self):
+        _count, results = self.queries(f"{reverse('assignment-list')}?expand=official,bogus")
+        self.assertIsInstance(results[0]['meet'], int)
+        self.assertEqual(results[0]['official']['name'], 'Official 3')
+
+    def test_writes_are_not_expanded(self):
+        team = Team.objects.first()
+        response = self.client.post(
+            f"{reverse('official-list')}?expand=team",
+            {'name': 'New Official', 'team': team.pk, 'certification': None},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['team'], team.pk)
@@ -0,0 +1,80 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from officials.models import Certification, Division, League, Meet, Official, Team
+
+User = get_user_model()
+
+
+class SparseFieldsTests(APITestCase):
+    """?fields= narrows both the response and the columns loaded for it."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='sparse', password='testpassword123')
+        self.client.login(username='sparse', password='testpassword123')
+        self.league = League.objects.create(name='Sparse League')
+        self.league.users.add(self.user)
+        division = Division.objects.create(name='Sparse Division', league=self.league)
+        self.team = Team.objects.create(name='Sparse Team', division=division)
+        self.team.users.add(self.user)
+        certification = Certification.objects.create(name='Referee', level=3)
+        self.official = Official.objects.create(
+            name='Sam Sparse', email='sam@example.com', team=self.team, certification=certification
+        )
+        self.meet = Meet.objects.create(
+            name='Sparse Meet', date=date(2026, 7, 4), league=self.league, host_team=self.team,
+            weather_forecast={'temperature': 80, 'hourly': list(range(24))},
+        )
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_list_returns_only_requested_fields(self):
+        response, _queries = self.get(f"{reverse('official-list')}?fields=id,name,team")
+        self.assertEqual(response.data['results'], [{'id': self.official.pk, 'name': 'Sam Sparse', 'team': self.team.pk}])
+
+    def test_unrequested_columns_are_not_loaded(self):
+        response, queries = self.get(f"{reverse('meet-list')}?fields=id,name")
+        self.assertEqual(list(response.data['results'][0]), ['id', 'name'])
+        meet_query = next(sql for sql in queries if 'FROM "officials_meet"' in sql)
+        self.assertNotIn('weather_forecast', meet_query)
+        # participating_teams was not asked for, so it is not prefetched either.
+        self.assertFalse(any('officials_meet_participating_teams' in sql for sql in queries))
+
+    def test_detail_endpoint_is_narrowed(self):
+        response, _queries = self.get(f"{reverse('official-detail', kwargs={'pk': self.official.pk})}?fields=name,email")
+        self.assertEqual(response.data, {'name': 'Sam Sparse', 'email': 'sam@example.com'})
+
+    def test_many_to_many_fields_can_be_requested(self):
+        response, _queries = self.get(f"{reverse('team-list')}?fields=id,users")
+        self.assertEqual(response.data['results'][0]['users'][0]['username'], 'sparse')
+
+    def test_fields_combine_with_expand(self):
+        response, _queries = self.get(f"{reverse('official-list')}?fields=name,team&expand=team")
+        result = response.data['results'][0]
+        self.assertEqual(set(result), {'name', 'team'})
+        self.assertEqual(result['team']['name'], 'Sparse Team')
+
+    def test_unknown_fields_are_ignored(self):
+        response, _queries = self.get(f"{reverse('league-list')}?fields=name,nonsense")
+        self.assertEqual(response.data['results'], [{'name': 'Sparse League'}])
+        response, _queries = self.get(f"{reverse('league-list')}?fields=nonsense")
+        self.assertIn('users', response.data['results'][0])
+
+    def test_writes_return_every_field(self):
+        response = self.client.patch(
+            f"{reverse('official-detail', kwargs={'pk': self.official.pk})}?fields=name",
+            {'phone': '555-0100'}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['phone'], '555-0100')
+        self.assertIn('email', response.data)
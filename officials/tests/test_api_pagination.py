@@ -0,0 +1,93 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from officials.models import Assignment, Division, League, Meet, Official, Team
+
+User = get_user_model()
+
+
+class KeysetPaginationTests(APITestCase):
+    """Cursor pagination of the API lists on their related-field orderings."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='testpassword123')
+        self.client.login(username='pager', password='testpassword123')
+        league = League.objects.create(name='Paged League')
+        team = Team.objects.create(name='Paged Team', division=Division.objects.create(name='Paged', league=league))
+        meets = [
+            Meet.objects.create(name=f'Meet {n}', date=date(2026, 6, n), league=league, host_team=team)
+            for n in (1, 1, 8)
+        ]
+        # Officials sharing a name make the (date, name) ordering tie; the id breaks it.
+        officials = [Official.objects.create(name=name, team=team) for name in ('Ann', 'Bo', 'Bo', 'Cy')]
+        for meet in meets:
+            for official in officials:
+                Assignment.objects.create(meet=meet, official=official, role='Timer')
+        self.url = reverse('assignment-list')
+        self.expected = list(
+            Assignment.objects.order_by('-meet__date', 'official__name', 'pk').values_list('pk', flat=True)
+        )
+
+    def _walk(self, url, key='next'):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.append([item['id'] for item in response.data['results']])
+            url = response.data[key]
+        return ids
+
+    def test_pages_cover_every_row_once_in_order(self):
+        pages = self._walk(f'{self.url}?page_size=5')
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+
+    def test_previous_links_walk_back(self):
+        pages = self._walk(f'{self.url}?page_size=5')
+        response = self.client.get(f'{self.url}?page_size=5')
+        last = self.client.get(self.client.get(response.data['next']).data['next'])
+        self.assertIsNone(last.data['next'])
+        back = self._walk(last.data['previous'], key='previous')
+        self.assertEqual(back, pages[1::-1])
+
+    def test_first_page_has_no_previous_link(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 12)
+        self.assertIsNone(response.data['previous'])
+        self.assertIsNone(response.data['next'])
+
+    def test_rows_added_before_the_cursor_do_not_shift_pages(self):
+        response = self.client.get(f'{self.url}?page_size=6')
+        meet = Meet.objects.get(name='Meet 8')
+        Assignment.objects.create(meet=meet, official=Official.objects.get(name='Ann'), role='Referee')
+        following = self.client.get(response.data['next'])
+        self.assertEqual([item['id'] for item in following.data['results']], self.expected[6:])
+
+    def test_deep_pages_cost_the_same_queries(self):
+        first = self.client.get(f'{self.url}?page_size=2')
+        url = first.data['next']
+        for _ in range(3):
+            url = self.client.get(url).data['next']
+        # Session, user and the page query; the count does not grow with depth.
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+    @override_settings(API_MAX_PAGE_SIZE=4)
+    def test_page_size_is_capped(self):
+        response = self.client.get(f'{self.url}?page_size=500')
+        self.assertEqual(len(response.data['results']), 4)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(f'{self.url}?cursor=bm90LWpzb24=')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_model_without_related_ordering(self):
+        response = self.client.get(f"{reverse('official-list')}?page_size=3")
+        names = [item['name'] for item in response.data['results']]
+        names += [item['name'] for item in self.client.get(response.data['next']).data['results']]
+        self.assertEqual(names, ['Ann', 'Bo', 'Bo', 'Cy'])
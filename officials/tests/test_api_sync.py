@@ -0,0 +1,210 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from officials.models import Assignment, Certification, Division, Event, League, Meet, Official, Team, Tombstone
+
+User = get_user_model()
+
+
+# No overlap, so a sync right after another returns exactly the rows written in between.
+@override_settings(API_SYNC_OVERLAP_SECONDS=0)
+class DeltaSyncTests(APITestCase):
+    """GET /api/v1/officials/sync/?since=<token>."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tablet', password='testpassword123')
+        self.client.login(username='tablet', password='testpassword123')
+        self.url = reverse('api_sync')
+        self.league = self.make_league('Home League')
+        self.league.users.add(self.user)
+        self.team = self.league.divisions.get().teams.get()
+        self.official = Official.objects.create(name='Dana Deck', team=self.team)
+        self.meet = Meet.objects.create(name='Opener', date=date(2026, 6, 6), league=self.league, host_team=self.team)
+        self.assignment = Assignment.objects.create(meet=self.meet, official=self.official, role='Timer')
+        other = self.make_league('Other League')
+        self.other_official = Official.objects.create(name='Otto Other', team=other.divisions.get().teams.get())
+
+    def make_league(self, name):
+        league = League.objects.create(name=name)
+        Team.objects.create(name=f'{name} Team', division=Division.objects.create(name=name, league=league))
+        return league
+
+    def sync(self, token=None):
+        response = self.client.get(self.url, {'since': token} if token else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def ids(self, data, collection):
+        return [row['id'] for row in data['changed'].get(collection, [])]
+
+    def test_first_sync_returns_every_visible_row(self):
+        data = self.sync()
+        self.assertTrue(data['reset'])
+        self.assertEqual(self.ids(data, 'officials'), [self.official.pk])
+        self.assertEqual(self.ids(data, 'leagues'), [self.league.pk])
+        self.assertEqual(self.ids(data, 'assignments'), [self.assignment.pk])
+        self.assertEqual(data['deleted'], {})
+
+    def test_next_sync_returns_only_changes(self):
+        token = self.sync()['token']
+        self.official.phone = '555-0142'
+        self.official.save()
+        data = self.sync(token)
+        self.assertFalse(data['reset'])
+        self.assertEqual(data['changed'], {'officials': [dict(data['changed']['officials'][0], phone='555-0142')]})
+        self.assertEqual(self.sync(data['token'])['changed'], {})
+
+    def test_deletes_are_sent_as_tombstones(self):
+        token = self.sync()['token']
+        assignment_id = self.assignment.pk
+        self.assignment.delete()
+        self.other_official.delete()
+        data = self.sync(token)
+        self.assertEqual(data['deleted'], {'assignments': [assignment_id]})
+
+    def test_cascaded_deletes_are_tombstoned(self):
+        token = self.sync()['token']
+        meet_id, assignment_id = self.meet.pk, self.assignment.pk
+        self.meet.delete()
+        self.assertEqual(self.sync(token)['deleted'], {'meets': [meet_id], 'assignments': [assignment_id]})
+
+    def test_confirm_toggle_is_picked_up(self):
+        token = self.sync()['token']
+        response = self.client.post(reverse('assignment_toggle_confirm', kwargs={'pk': self.assignment.pk}))
+        self.assertEqual(response.status_code, 302)
+        data = self.sync(token)
+        self.assertEqual(self.ids(data, 'assignments'), [self.assignment.pk])
+        self.assertTrue(data['changed']['assignments'][0]['confirmed'])
+
+    def test_rows_nulled_by_a_delete_are_resent(self):
+        certification = Certification.objects.create(name='Referee', level=3)
+        self.official.certification = certification
+        self.official.save()
+        token = self.sync()['token']
+        certification_id = certification.pk
+        certification.delete()
+        data = self.sync(token)
+        self.assertEqual(data['deleted'], {'certifications': [certification_id]})
+        self.assertEqual(data['changed']['officials'][0]['certification'], None)
+
+    def test_moving_to_another_league_tombstones_the_old_scope(self):
+        other_team = Team.objects.get(name='Other League Team')
+        token = self.sync()['token']
+        self.official.team = other_team
+        self.official.save()
+        data = self.sync(token)
+        self.assertEqual(data['deleted'], {'officials': [self.official.pk]})
+        self.assertEqual(data['changed'], {})
+
+    def test_rows_scoped_through_a_moved_row_move_with_it(self):
+        other_league = League.objects.get(name='Other League')
+        other_league.users.add(self.user)
+        token = self.sync()['token']
+        division = self.team.division
+        division.league = other_league
+        division.save()
+        data = self.sync(token)
+        # Still visible through the other league: deletions come first, then the rows again.
+        self.assertEqual(data['deleted'], {
+            'divisions': [division.pk], 'teams': [self.team.pk], 'officials': [self.official.pk],
+        })
+        self.assertEqual(self.ids(data, 'officials'), [self.official.pk])
+        self.assertEqual(self.ids(data, 'teams'), [self.team.pk])
+
+    def test_bulk_moves_are_tombstoned(self):
+        token = self.sync()['token']
+        response = self.client.patch(reverse('official-bulk'), [
+            {'id': self.official.pk, 'team': Team.objects.get(name='Other League Team').pk},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.sync(token)['deleted'], {'officials': [self.official.pk]})
+
+    @override_settings(API_SYNC_PAGE_SIZE=2)
+    def test_large_syncs_are_paged(self):
+        for n in range(3):
+            Official.objects.create(name=f'Extra {n}', team=self.team)
+        data = self.sync()
+        self.assertTrue(data['reset'])
+        pages = [data]
+        while data['more']:
+            data = self.sync(data['token'])
+            self.assertFalse(data['reset'])
+            pages.append(data)
+        self.assertTrue(all(sum(len(rows) for rows in page['changed'].values()) <= 2 for page in pages))
+        officials = [pk for page in pages for pk in self.ids(page, 'officials')]
+        self.assertEqual(officials, list(Official.objects.filter(team=self.team).order_by('pk').values_list('pk', flat=True)))
+        # The last page's token starts an ordinary delta.
+        self.official.save()
+        data = self.sync(data['token'])
+        self.assertEqual((data['reset'], self.ids(data, 'officials')), (False, [self.official.pk]))
+
+    def test_reference_rows_are_visible_to_everyone(self):
+        token = self.sync()['token']
+        event = Event.objects.create(name='50 Free', event_number=1)
+        self.assertEqual(self.ids(self.sync(token), 'events'), [event.pk])
+
+    def test_bulk_updates_are_picked_up(self):
+        token = self.sync()['token']
+        response = self.client.patch(
+            reverse('official-bulk'), [{'id': self.official.pk, 'active': False}], format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.ids(self.sync(token), 'officials'), [self.official.pk])
+
+    def test_membership_changes_resend_the_owner(self):
+        token = self.sync()['token']
+        other_team = Team.objects.create(name='Visitors', division=self.team.division)
+        token = self.sync(token)['token']
+        self.meet.participating_teams.add(other_team)
+        data = self.sync(token)
+        self.assertEqual(self.ids(data, 'meets'), [self.meet.pk])
+        self.assertEqual(data['changed']['meets'][0]['participating_teams'], [other_team.pk])
+
+    def test_joining_a_league_resets_the_client(self):
+        token = self.sync()['token']
+        League.objects.get(name='Other League').users.add(self.user)
+        data = self.sync(token)
+        self.assertTrue(data['reset'])
+        self.assertEqual(self.ids(data, 'officials'), [self.official.pk, self.other_official.pk])
+
+    def test_staff_see_every_league(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.ids(self.sync(), 'officials'), [self.official.pk, self.other_official.pk])
+
+    def test_expired_token_resets(self):
+        token = self.sync()['token']
+        with override_settings(API_SYNC_TOMBSTONE_DAYS=0):
+            self.assertTrue(self.sync(token)['reset'])
+
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get(self.url, {'since': 'not-a-token'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def count():
+            with CaptureQueriesContext(connection) as context:
+                self.sync()
+            return len(context.captured_queries)
+        before = count()
+        for n in range(5):
+            official = Official.objects.create(name=f'Extra {n}', team=self.team)
+            Assignment.objects.create(meet=self.meet, official=official, role='Timer')
+        self.assertEqual(count(), before)
+
+    def test_prune_command_drops_old_tombstones(self):
+        self.assignment.delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        self.other_official.delete()
+        call_command('prune_sync_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('collection', flat=True)), ['officials'])
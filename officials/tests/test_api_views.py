@@ -34,8 +34,8 @@ class LeagueAPITests(APITestCase):
         self.client.login(username='testuser', password='testpassword123')
         response = self.client.get(self.league_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2) # Assuming pagination is not aggressive or default
-        self.assertEqual(response.data[0]['name'], self.league1.name)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['results'][0]['name'], self.league1.name)
 
     def test_retrieve_league_authenticated(self):
         """Ensure authenticated users can retrieve a league."""
@@ -119,8 +119,8 @@ class CertificationAPITests(APITestCase):
         self.client.login(username='testuser_cert', password='testpassword123')
         response = self.client.get(self.cert_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        self.assertEqual(response.data[0]['name'], self.cert2.name) # 'Advanced Timer' (cert2) comes before 'Basic Scorer' (cert1)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['results'][0]['name'], self.cert2.name) # 'Advanced Timer' (cert2) comes before 'Basic Scorer' (cert1)
 
     def test_retrieve_cert_authenticated(self):
         self.client.login(username='testuser_cert', password='testpassword123')
@@ -193,9 +193,9 @@ class DivisionAPITests(APITestCase):
         self.client.login(username='testuser_div', password='testpassword123')
         response = self.client.get(self.div_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
         # Note: Default ordering in ViewSet is by league__name, name. So div1 should be first if names are N, S.
-        self.assertEqual(response.data[0]['name'], self.div1.name) 
+        self.assertEqual(response.data['results'][0]['name'], self.div1.name) 
 
     def test_retrieve_division_authenticated(self):
         self.client.login(username='testuser_div', password='testpassword123')
@@ -276,10 +276,10 @@ class TeamAPITests(APITestCase):
         self.client.login(username='testuser_team', password='testpassword123')
         response = self.client.get(self.team_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
         # Default ordering: 'division__league__name', 'division__name', 'name'
         # Assuming 'Dolphins' comes before 'Sharks' alphabetically
-        self.assertEqual(response.data[0]['name'], self.team2.name) 
+        self.assertEqual(response.data['results'][0]['name'], self.team2.name) 
 
     def test_retrieve_team_authenticated(self):
         self.client.login(username='testuser_team', password='testpassword123')
@@ -388,9 +388,9 @@ class OfficialAPITests(APITestCase):
         self.client.login(username='testuser_official', password='testpassword123')
         response = self.client.get(self.official_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
         # Check both officials are in the response (order may vary)
-        official_names = [item['name'] for item in response.data]
+        official_names = [item['name'] for item in response.data['results']]
         self.assertIn(self.official1.name, official_names)
         self.assertIn(self.official2.name, official_names)
 
@@ -513,9 +513,9 @@ class AssignmentAPITests(APITestCase):
         self.client.login(username='testuser_assign', password='testpassword123')
         response = self.client.get(self.assignment_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
         # Check both officials are in the response (order may vary)
-        official_ids = [item['official'] for item in response.data]
+        official_ids = [item['official'] for item in response.data['results']]
         self.assertIn(self.official1.pk, official_ids)
         self.assertIn(self.official2.pk, official_ids)
 
@@ -638,9 +638,9 @@ class EventAPITests(APITestCase):
         self.client.login(username='testuser_event', password='testpassword123')
         response = self.client.get(self.event_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
         # Default ordering: 'meet__name', 'session_number', 'event_number'
-        self.assertEqual(response.data[0]['event_number'], self.event1.event_number)
+        self.assertEqual(response.data['results'][0]['event_number'], self.event1.event_number)
 
     def test_retrieve_event_authenticated(self):
         self.client.login(username='testuser_event', password='testpassword123')
@@ -741,10 +741,10 @@ class StrategyAPITests(APITestCase):
         self.client.login(username='testuser_strategy', password='testpassword123')
         response = self.client.get(self.strategy_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
         # Default ordering is by name ('QUADRANTS' before 'SIDES')
-        self.assertEqual(response.data[0]['name'], self.strategy1.name)  # QUADRANTS
-        self.assertEqual(response.data[1]['name'], self.strategy2.name)  # SIDES
+        self.assertEqual(response.data['results'][0]['name'], self.strategy1.name)  # QUADRANTS
+        self.assertEqual(response.data['results'][1]['name'], self.strategy2.name)  # SIDES
 
     def test_retrieve_strategy_authenticated(self):
         self.client.login(username='testuser_strategy', password='testpassword123')
@@ -851,10 +851,10 @@ class PositionAPITests(APITestCase):
         self.client.login(username='testuser_position', password='testpassword123')
         response = self.client.get(self.position_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
         # Default ordering is by role
-        self.assertEqual(response.data[0]['role'], self.position1.role) # Referee
-        self.assertEqual(response.data[1]['role'], self.position2.role) # Starter
+        self.assertEqual(response.data['results'][0]['role'], self.position1.role) # Referee
+        self.assertEqual(response.data['results'][1]['role'], self.position2.role) # Starter
 
     def test_retrieve_position_authenticated(self):
         self.client.login(username='testuser_position', password='testpassword123')
@@ -952,9 +952,9 @@ class UserLeagueAdminAPITests(APITestCase):
         self.client.login(username='adminleagueuser', password='testpassword123')
         response = self.client.get(self.ula_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['user'], self.target_user.pk)
-        self.assertEqual(response.data[0]['league'], self.league1.pk)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['user'], self.target_user.pk)
+        self.assertEqual(response.data['results'][0]['league'], self.league1.pk)
 
     def test_retrieve_ula_authenticated(self):
         self.client.login(username='adminleagueuser', password='testpassword123')
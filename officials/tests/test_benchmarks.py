@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from officials.models import Assignment, EventPosition, Official
+from officials.services.benchmarks import benchmark_report, compare_reports, run_benchmarks
+from officials.services.synthetic_league import SyntheticScale, generate_league
+
+TINY = SyntheticScale(divisions=2, teams=4, officials_per_team=6, events=4, positions=8, confirmed_per_team=4)
+
+
+class SyntheticLeagueTest(TestCase):
+    """The generator builds a league of the requested shape."""
+
+    def test_generated_league_shape(self):
+        data = generate_league(TINY, seed=1)
+        self.assertEqual(Official.objects.filter(team__division__league=data.league).count(), 24)
+        self.assertEqual(len(data.meets), 2)
+        self.assertEqual(Assignment.objects.filter(meet__in=data.meets, confirmed=True).count(), 16)
+        self.assertEqual(data.open_meet.participating_teams.count(), 2)
+        self.assertTrue(EventPosition.objects.filter(position__strategy=data.strategy).exists())
+
+    def test_second_league_reuses_shared_rows(self):
+        generate_league(TINY, seed=1)
+        positions = EventPosition.objects.count()
+        generate_league(TINY, seed=2, name='Another League')
+        self.assertEqual(EventPosition.objects.count(), positions)
+
+
+class BenchmarkRunTest(TestCase):
+    """Benchmarks time every case and produce comparable reports."""
+
+    def test_run_and_report(self):
+        data = generate_league(TINY)
+        results = run_benchmarks(data, repeat=2)
+        report = json.loads(json.dumps(benchmark_report(data, results, generate_ms=1.5)))
+        by_name = {case['name']: case for case in report['results']}
+        self.assertEqual(by_name['build_schedule.lightest']['runs'], 2)
+        self.assertFalse(by_name['build_schedule.lightest']['detail']['cached'])
+        self.assertTrue(by_name['build_schedule.lightest_cached']['detail']['cached'])
+        self.assertEqual(by_name['build_league_schedules']['detail'], {'meets': 2, 'built': 2})
+        self.assertEqual(by_name['auto_assign']['detail'], {'created': 12})
+        self.assertEqual(by_name['import.officials']['detail'], {'status': 302})
+        for name in ('view.official_list', 'view.meet_configure', 'api.assignments'):
+            self.assertEqual(by_name[name]['detail']['status'], 200)
+        self.assertEqual(report['scale']['officials'], 24)
+
+    def test_compare_flags_slower_cases_and_extra_queries(self):
+        baseline = {'results': [
+            {'name': 'a', 'median_ms': 10.0, 'queries': 3},
+            {'name': 'b', 'median_ms': 10.0, 'queries': 3},
+            {'name': 'c', 'median_ms': 10.0, 'queries': 3},
+        ]}
+        current = {'results': [
+            {'name': 'a', 'median_ms': 10.5, 'queries': 3},
+            {'name': 'b', 'median_ms': 20.0, 'queries': 3},
+            {'name': 'c', 'median_ms': 9.0, 'queries': 4},
+            {'name': 'd', 'median_ms': 1.0, 'queries': 1},
+        ]}
+        rows = compare_reports(baseline, current, threshold=0.1)
+        self.assertEqual([(name, regressed) for name, _b, _a, _r, regressed in rows],
+                         [('a', False), ('b', True), ('c', True)])
+
+    def test_command_writes_report_and_rolls_back(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'bench.json')
+            call_command(
+                'run_benchmarks', '--teams', '2', '--officials-per-team', '4', '--repeat', '1',
+                '--only', 'build', '--output', output, stderr=open(os.devnull, 'w'),
+            )
+            with open(output) as handle:
+                report = json.load(handle)
+            self.assertEqual(report['scale']['teams'], 2)
+            self.assertEqual(report['results'][0]['name'], 'build_schedule.lightest')
+            self.assertFalse(Official.objects.exists())
+
+            slower = dict(report, results=[dict(case, median_ms=case['median_ms'] / 100) for case in report['results']])
+            baseline = os.path.join(tmp, 'baseline.json')
+            with open(baseline, 'w') as handle:
+                json.dump(slower, handle)
+            with self.assertRaises(CommandError):
+                call_command(
+                    'run_benchmarks', '--teams', '2', '--officials-per-team', '4', '--repeat', '1',
+                    '--only', 'build', '--output', output, '--compare', baseline, stderr=open(os.devnull, 'w'),
+                )
@@ -0,0 +1,106 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from officials.models import Assignment, Certification, Division, League, Meet, Official, ScheduleJob, Team
+from officials.services.booking_index import BookingIndex
+from officials.services.jobs import submit_schedule_build
+from officials.services.league_builder import build_league_schedules
+from officials.services.schedule_builder import build_schedule
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin
+from officials.views_meets import _auto_assign_participating_officials
+
+User = get_user_model()
+DAY = date(2026, 6, 20)
+
+
+class BookingIndexTest(TestCase):
+    """Cross-meet double-booking checks."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='booker', password='testpassword123')
+        self.league = League.objects.create(name='Booking League')
+        self.league.users.add(self.user)
+        division = Division.objects.create(name='Booking Division', league=self.league)
+        self.team = Team.objects.create(name='Booking Team', division=division)
+        self.cert = Certification.objects.create(name='Stroke and Turn', level=1)
+        self.official = Official.objects.create(name='Busy Bee', team=self.team, certification=self.cert)
+        self.free = Official.objects.create(name='Free Fred', team=self.team, certification=self.cert)
+        self.dual = self._meet('Dual Meet')
+        self.divisional = self._meet('Divisional Weekend', meet_type='divisional')
+        self.next_week = self._meet('Next Week', day=date(2026, 6, 27))
+
+    def _meet(self, name, day=DAY, meet_type='dual'):
+        meet = Meet.objects.create(name=name, date=day, league=self.league, host_team=self.team, meet_type=meet_type)
+        meet.participating_teams.add(self.team)
+        return meet
+
+    def test_index_lookups(self):
+        Assignment.objects.create(meet=self.dual, official=self.official, role='Referee', confirmed=True)
+        Assignment.objects.create(meet=self.next_week, official=self.free, role='Starter', confirmed=True)
+        with self.assertNumQueries(1):
+            index = BookingIndex.for_dates([DAY])
+        with self.assertNumQueries(0):
+            self.assertEqual(index.confirmed_elsewhere(self.official.id, self.divisional), [self.dual.id])
+            self.assertEqual(index.confirmed_elsewhere(self.official.id, self.dual), [])
+            self.assertEqual(index.double_booked(self.divisional, [self.official.id, self.free.id]), [self.official.id])
+
+    def test_any_confirmed_role_commits_the_official(self):
+        Assignment.objects.create(meet=self.dual, official=self.official, role='Referee', confirmed=False)
+        Assignment.objects.create(meet=self.dual, official=self.official, role='Starter', confirmed=True)
+        index = BookingIndex.for_dates([DAY], [self.official.id])
+        self.assertEqual(index.other_meets(self.official.id, self.divisional), {self.dual.id: True})
+
+    def test_auto_assign_skips_officials_confirmed_elsewhere(self):
+        Assignment.objects.create(meet=self.dual, official=self.official, role='Referee', confirmed=True)
+        self.assertEqual(_auto_assign_participating_officials(self.divisional), 1)
+        self.assertEqual(
+            list(self.divisional.assignments.values_list('official__name', flat=True)), ['Free Fred']
+        )
+
+    def test_assignment_create_rejects_confirmed_elsewhere(self):
+        Assignment.objects.create(meet=self.dual, official=self.official, role='Referee', confirmed=True)
+        self.client.login(username='booker', password='testpassword123')
+        response = self.client.post(
+            reverse('assignment_create_for_meet', args=[self.divisional.id]),
+            {'official': self.official.id, 'role': 'Starter'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Busy Bee is already confirmed for Dual Meet')
+        self.assertFalse(self.divisional.assignments.exists())
+
+    def test_assignment_create_warns_about_unconfirmed_clash(self):
+        Assignment.objects.create(meet=self.dual, official=self.official, role='Referee', confirmed=False)
+        self.client.login(username='booker', password='testpassword123')
+        response = self.client.post(
+            reverse('assignment_create_for_meet', args=[self.divisional.id]),
+            {'official': self.official.id, 'role': self.cert.id},
+            follow=True,
+        )
+        self.assertTrue(self.divisional.assignments.filter(official=self.official).exists())
+        self.assertContains(response, 'also assigned to Dual Meet')
+
+
+@override_settings(SCHEDULE_JOBS_EAGER=True)
+class BuilderDoubleBookingTest(ScheduleFixtureMixin, TestCase):
+    """Schedule builds flag officials confirmed at another meet that day."""
+
+    def setUp(self):
+        super().setUp()
+        other = Meet.objects.create(
+            name='Other Meet', date=self.meet.date, league=self.league, host_team=self.team, meet_type='dual',
+        )
+        Assignment.objects.create(meet=other, official=self.ref_official, role='Referee', confirmed=True)
+
+    def test_build_reports_double_booked(self):
+        result = build_schedule(self.meet, 'LIGHTEST')
+        self.assertEqual(result.double_booked, [self.ref_official.id])
+        job = submit_schedule_build(self.meet, 'LIGHTEST')
+        self.assertIn('1 official(s) are also confirmed at another meet', ScheduleJob.objects.get(pk=job.pk).message)
+
+    def test_league_build_reports_double_booked(self):
+        outcomes = build_league_schedules(self.league, self.meet.date, workers=1)
+        by_meet = {outcome.meet: outcome for outcome in outcomes}
+        self.assertEqual(by_meet[self.meet].double_booked, [self.ref_official.id])
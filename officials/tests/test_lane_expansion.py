@@ -0,0 +1,143 @@
+import json
+
+from django.test import TestCase, override_settings
+
+from officials.models import EventPosition, MeetSchedule, Pool, Position
+from officials.services import lane_expansion
+from officials.services.schedule_builder import build_schedule, load_schedule_inputs, schedule_table
+from officials.services.schedule_diff import diff_schedules
+from officials.services.schedule_publish import publish_schedule
+from officials.services.schedule_sandbox import open_sandbox
+from officials.services.schedule_storage import UNFILLED, PackedSchedule, encode
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin
+
+
+class LaneLabelTest(TestCase):
+    """Unit tests for the lane labels of a pool's geometry."""
+
+    def test_one_timer_per_lane_at_a_single_finish_end(self):
+        self.assertEqual(lane_expansion.lane_labels(3, 50, False, 1, 'finish'), ('Lane 1', 'Lane 2', 'Lane 3'))
+
+    def test_bidirectional_pool_staffs_both_ends(self):
+        self.assertEqual(
+            lane_expansion.lane_labels(2, 50, True, 1, 'finish'),
+            ('Lane 1, Near End', 'Lane 2, Near End', 'Lane 1, Far End', 'Lane 2, Far End'),
+        )
+
+    def test_turn_judges_cover_lane_pairs_at_both_walls_of_a_short_pool(self):
+        self.assertEqual(
+            lane_expansion.lane_labels(5, 25, False, 2, 'turn'),
+            ('Lanes 1-2, Near End', 'Lanes 3-4, Near End', 'Lane 5, Near End',
+             'Lanes 1-2, Far End', 'Lanes 3-4, Far End', 'Lane 5, Far End'),
+        )
+        self.assertEqual(lane_expansion.lane_labels(4, 50, False, 2, 'turn'), ('Lanes 1-2', 'Lanes 3-4'))
+
+    def test_one_slot_per_end_is_only_expanded_with_two_ends(self):
+        self.assertEqual(lane_expansion.lane_labels(8, 25, False, 0, 'finish'), lane_expansion.NOT_EXPANDED)
+        self.assertEqual(lane_expansion.lane_labels(8, 25, True, 0, 'finish'), ('Near End', 'Far End'))
+
+    def test_labels_are_cached_per_geometry(self):
+        lane_expansion.lane_labels.cache_clear()
+        pool = Pool(lanes=8, length=25, bidirectional=True)
+        for _ in range(3):
+            lane_expansion.position_lanes(pool, 'Timer', 'Finish End')
+        info = lane_expansion.lane_labels.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+
+    def test_positions_that_are_not_expanded(self):
+        pool = Pool(lanes=6, length=25)
+        self.assertEqual(lane_expansion.position_lanes(pool, 'Referee', 'Deck'), lane_expansion.NOT_EXPANDED)
+        self.assertEqual(lane_expansion.position_lanes(pool, 'Timer', 'Lane 3'), lane_expansion.NOT_EXPANDED)
+        self.assertEqual(lane_expansion.position_lanes(None, 'Timer', 'Finish End'), lane_expansion.NOT_EXPANDED)
+
+    @override_settings(LANE_POSITION_RULES={'snt': (3, 'turn'), 'snt start': (0, 'finish')})
+    def test_longest_matching_rule_wins(self):
+        self.assertEqual(lane_expansion.position_rule('SNT Start'), (0, 'finish'))
+        self.assertEqual(lane_expansion.position_rule('SNT Turn'), (3, 'turn'))
+        self.assertIsNone(lane_expansion.position_rule('Timer'))
+
+
+@override_settings(SCHEDULE_JOBS_EAGER=True)
+class LaneScheduleTest(ScheduleFixtureMixin, TestCase):
+    """Schedules of a meet at a two-lane bidirectional pool with a generic timer position."""
+
+    def setUp(self):
+        super().setUp()
+        self.pool = Pool.objects.create(name='Home Pool', team=self.team, lanes=2, length=25, bidirectional=True)
+        self.meet.pool = self.pool
+        self.meet.save()
+        self.timer = Position.objects.create(role='Timer', strategy=self.strategy, location='Finish')
+        for event in self.events[:2]:
+            EventPosition.objects.create(event=event, position=self.timer, is_mandatory=False)
+
+    def test_inputs_have_a_column_per_lane_and_end(self):
+        inputs = load_schedule_inputs(self.meet)
+        self.assertEqual(inputs.shape, (4, 6))
+        self.assertEqual(inputs.position_ids, [self.referee.id, self.judge.id] + [self.timer.id] * 4)
+        self.assertEqual(
+            inputs.position_lanes,
+            [None, None, 'Lane 1, Near End', 'Lane 2, Near End', 'Lane 1, Far End', 'Lane 2, Far End'],
+        )
+        self.assertEqual([sum(row) for row in inputs.slot_mask], [6, 6, 2, 2])
+
+    def test_meet_without_pool_keeps_one_column(self):
+        self.meet.pool = None
+        self.meet.save()
+        inputs = load_schedule_inputs(self.meet)
+        self.assertEqual(inputs.shape, (4, 3))
+        self.assertIsNone(inputs.position_lanes)
+
+    def test_built_schedule_labels_its_lane_columns(self):
+        schedule = build_schedule(self.meet, 'LIGHTEST').schedule
+        columns, rows = schedule_table(schedule)
+        self.assertEqual(
+            [column.location for column in columns][2:],
+            ['Finish, Lane 1, Near End', 'Finish, Lane 2, Near End', 'Finish, Lane 1, Far End', 'Finish, Lane 2, Far End'],
+        )
+        self.assertEqual(columns[3].key, f'{self.timer.id}:Lane 2, Near End')
+        self.assertEqual(len(rows[0][1]), 6)
+
+    def test_lanes_survive_encoding(self):
+        grid = [[UNFILLED, UNFILLED]]
+        packed = PackedSchedule(encode([1], [7, 7], [], grid, [[False, False]], ['Lane 1', 'Lane 2']))
+        self.assertEqual(packed.lanes, ['Lane 1', 'Lane 2'])
+        self.assertEqual(packed.column_index('7:Lane 2'), 1)
+        self.assertEqual(packed.column_index(7), 0)
+        self.assertEqual(PackedSchedule(encode([1], [7], [], [[UNFILLED]], [[False]])).lanes, [None])
+
+    def test_sandbox_edits_address_lane_columns(self):
+        schedule = build_schedule(self.meet, 'LIGHTEST').schedule
+        sandbox = open_sandbox({}, schedule)
+        sandbox.assign(self.events[0].id, f'{self.timer.id}:Lane 2, Far End', self.judge_official.id)
+        self.assertEqual(sandbox.cell(0, 5), sandbox.official_ids.index(self.judge_official.id))
+        self.assertEqual(PackedSchedule(sandbox.encoded()).lanes, schedule.packed.lanes)
+
+    def test_diff_compares_lanes_separately(self):
+        before = build_schedule(self.meet, 'LIGHTEST').schedule
+        grid = before.packed.grid()
+        grid[0][4] = before.packed.official_ids.index(self.judge_official.id)
+        grid[0][1] = UNFILLED
+        after = MeetSchedule.objects.create(meet=self.meet, name='Edited', build_option='LIGHTEST', grid_data=encode(
+            before.packed.event_ids, before.packed.position_ids, before.packed.official_ids, grid,
+            before.packed.mandatory_mask(), before.packed.lanes,
+        ))
+        changes = [(change.position_id, change.lane) for change in diff_schedules(before, after).changed_slots]
+        self.assertIn((self.timer.id, 'Lane 1, Far End'), changes)
+
+    def test_published_slots_carry_their_lane(self):
+        schedule = build_schedule(self.meet, 'LIGHTEST').schedule
+        grid = schedule.packed.grid()
+        grid[1][3] = schedule.packed.official_ids.index(self.judge_official.id)
+        grid[1][1] = UNFILLED
+        schedule.grid_data = encode(
+            schedule.packed.event_ids, schedule.packed.position_ids, schedule.packed.official_ids, grid,
+            schedule.packed.mandatory_mask(), schedule.packed.lanes,
+        )
+        schedule.save()
+        del schedule.packed
+        snapshot = publish_schedule(schedule)
+        document = json.loads(snapshot.json)
+        self.assertIn('Lane 2, Near End', [slot['lane'] for slot in document['events'][1]['slots']])
+        self.assertEqual(
+            snapshot.slots.get(official=self.judge_official, event_number=2).location, 'Finish, Lane 2, Near End'
+        )
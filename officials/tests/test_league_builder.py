@@ -0,0 +1,113 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from officials.models import Assignment, Meet, MeetSchedule, ScheduleJob
+from officials.services.league_builder import build_league_schedules, league_meets
+from officials.services.schedule_builder import solve
+from officials.services.season_load import rebuild_season_loads
+from officials.services.solver_pool import solve_many
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin, make_inputs, slot_holders
+from officials.tests.test_season_load import index
+
+User = get_user_model()
+
+
+class SolveManyTest(TestCase):
+    """The process pool gives the same grids as solving inline."""
+
+    def test_pool_matches_inline(self):
+        inputs = [make_inputs(6, [3, 1, 1], [1, 3, 1, 3, 1]), make_inputs(4, [1, 1], [1, 1, 1])]
+        expected = [solve(i, 'LIGHTEST') for i in inputs]
+        self.assertEqual(solve_many(inputs, 'LIGHTEST', workers=1), expected)
+        self.assertEqual(solve_many(inputs, 'LIGHTEST', workers=2), expected)
+
+
+@override_settings(SCHEDULE_JOBS_EAGER=True, LEAGUE_BUILD_WORKERS=1)
+class LeagueScheduleBuildTest(ScheduleFixtureMixin, TestCase):
+    """Tests for building every meet of a league at once."""
+
+    def setUp(self):
+        super().setUp()
+        self.second_meet = Meet.objects.create(
+            name='Second Meet', date=date(2026, 6, 20), league=self.league,
+            host_team=self.team, meet_type='dual', strategy=self.strategy,
+        )
+        Assignment.objects.create(meet=self.second_meet, official=self.ref_official, role='Referee', confirmed=True)
+        self.no_strategy = Meet.objects.create(
+            name='No Strategy Meet', date=date(2026, 6, 21), league=self.league,
+            host_team=self.team, meet_type='dual',
+        )
+        Meet.objects.create(
+            name='Next Week', date=date(2026, 6, 27), league=self.league,
+            host_team=self.team, meet_type='dual', strategy=self.strategy,
+        )
+        self.staff = User.objects.create_user(username='staff', password='testpassword123', is_staff=True)
+
+    def test_builds_every_meet_on_date_with_constant_queries(self):
+        # Meets and inputs (3), season loads (2), bookings (1), then one insert (1) and the
+        # season index update (6) in a transaction (2).
+        with self.assertNumQueries(15):
+            outcomes = build_league_schedules(self.league, date(2026, 6, 20), workers=1)
+        self.assertEqual([o.meet for o in outcomes], [self.meet, self.second_meet])
+        self.assertTrue(all(o.ok for o in outcomes))
+        self.assertEqual(outcomes[0].filled_slots, 8)
+        # Only the referee is confirmed for the second meet; they can cover one slot per event.
+        self.assertEqual(outcomes[1].filled_slots, 4)
+        self.assertEqual(len(slot_holders(MeetSchedule.objects.get(meet=self.second_meet))), 8)
+
+    def test_season_index_counts_every_meet_an_official_works(self):
+        build_league_schedules(self.league, date(2026, 6, 20), date(2026, 6, 21), workers=1)
+        expected = index()
+        self.assertEqual(expected[(self.ref_official.id, 2026)][2], 2)
+        rebuild_season_loads()
+        self.assertEqual(index(), expected)
+
+    def test_date_range_reports_unbuildable_meets(self):
+        outcomes = build_league_schedules(self.league, date(2026, 6, 20), date(2026, 6, 21), workers=1)
+        self.assertEqual(len(outcomes), 3)
+        failed = [o for o in outcomes if not o.ok]
+        self.assertEqual([o.meet for o in failed], [self.no_strategy])
+        self.assertIn('Strategy', failed[0].error)
+        self.assertEqual(MeetSchedule.objects.count(), 2)
+
+    def test_league_meets_range(self):
+        self.assertEqual(league_meets(self.league, date(2026, 6, 20), date(2026, 6, 27)).count(), 4)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('build_league_schedules', str(self.league.id), '2026-06-20', '--workers', '1', stdout=out)
+        self.assertIn('Built 2 of 2 meet schedule(s).', out.getvalue())
+
+    def test_view_requires_staff(self):
+        self.client.login(username='coach', password='testpassword123')
+        response = self.client.get(reverse('league_build_schedules', args=[self.league.id]))
+        self.assertRedirects(response, reverse('league_detail', args=[self.league.id]))
+
+    def test_staff_view_runs_job(self):
+        self.client.login(username='staff', password='testpassword123')
+        response = self.client.post(
+            reverse('league_build_schedules', args=[self.league.id]),
+            {'start_date': '2026-06-20', 'end_date': '2026-06-21', 'build_option': 'HEAVIEST'},
+        )
+        self.assertRedirects(response, reverse('league_build_schedules', args=[self.league.id]))
+        job = ScheduleJob.objects.get(league=self.league)
+        self.assertEqual(job.status, 'DONE')
+        self.assertIn('2 of 3', job.message)
+        self.assertEqual(MeetSchedule.objects.filter(build_option='HEAVIEST').count(), 2)
+
+        response = self.client.get(reverse('league_build_status', args=[self.league.id, job.id]))
+        self.assertEqual(response.json()['status'], 'DONE')
+
+    def test_view_rejects_reversed_range(self):
+        self.client.login(username='staff', password='testpassword123')
+        response = self.client.post(
+            reverse('league_build_schedules', args=[self.league.id]),
+            {'start_date': '2026-06-21', 'end_date': '2026-06-20', 'build_option': 'LIGHTEST'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ScheduleJob.objects.exists())
@@ -0,0 +1,151 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from officials.models import Assignment, Meet, PublishedSlot
+from officials.services.official_feed import build_feed, official_feed
+from officials.services.schedule_builder import build_schedule
+from officials.services.schedule_publish import publish_schedule, withdraw_publications
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin
+
+User = get_user_model()
+
+
+@override_settings(SCHEDULE_JOBS_EAGER=True)
+class OfficialFeedTest(ScheduleFixtureMixin, TestCase):
+    """Per-official feeds of upcoming assignments and published slots."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.meet.date = timezone.localdate() + timedelta(days=7)
+        self.meet.save()
+        self.schedule = build_schedule(self.meet, 'LIGHTEST').schedule
+
+    def test_publish_indexes_slots_per_official(self):
+        publish_schedule(self.schedule)
+        self.assertEqual(PublishedSlot.objects.filter(official=self.ref_official).count(), 4)
+        publish_schedule(self.schedule)
+        self.assertEqual(PublishedSlot.objects.filter(official=self.ref_official).count(), 4)
+        withdraw_publications(self.meet)
+        self.assertFalse(PublishedSlot.objects.exists())
+
+    def test_feed_lists_assignments_and_slots_with_three_queries(self):
+        publish_schedule(self.schedule)
+        with self.assertNumQueries(3):
+            feed = build_feed(self.ref_official)
+        self.assertEqual(feed['official']['name'], 'Rita Ref')
+        [meet] = feed['meets']
+        self.assertEqual(meet['id'], self.meet.id)
+        self.assertEqual(meet['assignments'], [
+            {'id': self.ref_official.assignments.get().id, 'role': 'Referee', 'confirmed': True},
+        ])
+        self.assertEqual([slot['event_number'] for slot in meet['slots']], [1, 2, 3, 4])
+        self.assertEqual({slot['role'] for slot in meet['slots']}, {'Referee'})
+
+    def test_feed_skips_past_meets_and_is_bounded(self):
+        past = Meet.objects.create(
+            name='Past Meet', date=timezone.localdate() - timedelta(days=1), league=self.league, host_team=self.team,
+        )
+        Assignment.objects.create(meet=past, official=self.ref_official, role='Referee', confirmed=True)
+        later = Meet.objects.create(
+            name='Later Meet', date=timezone.localdate() + timedelta(days=14), league=self.league, host_team=self.team,
+        )
+        Assignment.objects.create(meet=later, official=self.ref_official, role='Referee')
+        feed = build_feed(self.ref_official)
+        self.assertEqual([meet['name'] for meet in feed['meets']], ['Build Meet', 'Later Meet'])
+        self.assertEqual([meet['name'] for meet in build_feed(self.ref_official, limit=1)['meets']], ['Build Meet'])
+
+    def test_meets_beyond_the_limit_are_not_loaded(self):
+        for day in range(20, 30):
+            meet = Meet.objects.create(
+                name=f'Meet {day}', date=timezone.localdate() + timedelta(days=day), league=self.league,
+                host_team=self.team,
+            )
+            Assignment.objects.create(meet=meet, official=self.ref_official, role='Referee')
+        with CaptureQueriesContext(connection) as context:
+            feed = build_feed(self.ref_official, limit=2)
+        self.assertEqual([meet['name'] for meet in feed['meets']], ['Build Meet', 'Meet 20'])
+        self.assertIn('LIMIT 2', context.captured_queries[0]['sql'])
+        # Assignments and slots are read for the two chosen meets only.
+        self.assertTrue(all('IN (' in query['sql'] for query in context.captured_queries[1:]))
+
+    def test_feed_is_cached_until_assignments_or_publications_change(self):
+        official_feed(self.ref_official)
+        # Only the version is read.
+        with self.assertNumQueries(2):
+            feed, etag = official_feed(self.ref_official)
+        self.assertEqual(feed['meets'][0]['slots'], [])
+
+        publish_schedule(self.schedule)
+        feed, published_etag = official_feed(self.ref_official)
+        self.assertEqual(len(feed['meets'][0]['slots']), 4)
+        self.assertNotEqual(published_etag, etag)
+
+        Assignment.objects.filter(official=self.ref_official).update(confirmed=False)
+        self.assertEqual(official_feed(self.ref_official)[1], published_etag)
+        self.ref_official.assignments.get().save()
+        self.assertFalse(official_feed(self.ref_official)[0]['meets'][0]['assignments'][0]['confirmed'])
+
+    def test_changes_made_elsewhere_are_seen(self):
+        # A write handled by another worker clears nothing in this process's cache.
+        official_feed(self.ref_official)
+        Assignment.objects.filter(official=self.ref_official).update(confirmed=False, updated_at=timezone.now())
+        self.assertFalse(official_feed(self.ref_official)[0]['meets'][0]['assignments'][0]['confirmed'])
+        publish_schedule(self.schedule)
+        self.assertEqual(len(official_feed(self.ref_official)[0]['meets'][0]['slots']), 4)
+        PublishedSlot.objects.filter(meet=self.meet).delete()
+        self.assertEqual(official_feed(self.ref_official)[0]['meets'][0]['slots'], [])
+
+
+@override_settings(SCHEDULE_JOBS_EAGER=True)
+class OfficialFeedViewTest(ScheduleFixtureMixin, TestCase):
+    """The "my assignments" page, JSON feed and API action."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.meet.date = timezone.localdate() + timedelta(days=7)
+        self.meet.save()
+        publish_schedule(build_schedule(self.meet, 'LIGHTEST').schedule)
+        self.client.login(username='coach', password='testpassword123')
+
+    def test_page(self):
+        response = self.client.get(reverse('official_assignments', args=[self.ref_official.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Build Meet')
+        self.assertContains(response, '#4 Event 4')
+
+    def test_json_supports_conditional_requests(self):
+        url = reverse('official_assignments_json', args=[self.ref_official.id])
+        response = self.client.get(url)
+        self.assertEqual(response.json()['meets'][0]['id'], self.meet.id)
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_other_leagues_are_denied(self):
+        User.objects.create_user(username='outsider', password='testpassword123')
+        self.client.login(username='outsider', password='testpassword123')
+        response = self.client.get(reverse('official_assignments_json', args=[self.ref_official.id]))
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(reverse('official_assignments', args=[self.ref_official.id]))
+        self.assertRedirects(response, reverse('official_list'), fetch_redirect_response=False)
+
+    def test_api_action(self):
+        response = self.client.get(f'/api/v1/officials/officials/{self.ref_official.id}/assignments/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['meets'][0]['slots']), 4)
+
+    def test_official_detail_lists_recent_assignments_only(self):
+        Assignment.objects.bulk_create([
+            Assignment(meet=self.meet, official=self.ref_official, role=f'Role {n}') for n in range(30)
+        ])
+        response = self.client.get(reverse('official_detail', args=[self.ref_official.id]))
+        self.assertEqual(len(response.context['assignments']), 25)
+        self.assertContains(response, 'Showing the 25 most recent of 31 assignments.')
@@ -0,0 +1,399 @@
+import json
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from officials.models import (Assignment, Certification, Division, Event, EventPosition, League, Meet,
+                              MeetSchedule, Official, Position, Strategy, Team)
+from officials.services import schedule_cache
+from officials.services.schedule_builder import (NO_SLOT, UNFILLED, ScheduleBuildError, ScheduleInputs,
+                                                 build_schedule, load_schedule_inputs, solve)
+from officials.services.schedule_search import improve_schedule, schedule_quality
+from officials.services.schedule_storage import PackedSchedule, encode, encode_inputs
+
+User = get_user_model()
+
+
+def make_inputs(n_events, position_levels, official_levels, official_proficiency=None, mandatory=True):
+    """Build solver inputs where every event uses every position."""
+    n_positions = len(position_levels)
+    return ScheduleInputs(
+        meet_id=1,
+        event_ids=list(range(1, n_events + 1)),
+        position_ids=list(range(1, n_positions + 1)),
+        position_levels=list(position_levels),
+        official_ids=list(range(1, len(official_levels) + 1)),
+        official_levels=list(official_levels),
+        official_proficiency=list(official_proficiency or [1] * len(official_levels)),
+        slot_mask=[[True] * n_positions for _ in range(n_events)],
+        mandatory_mask=[[mandatory] * n_positions for _ in range(n_events)],
+    )
+
+
+def slot_holders(schedule):
+    """{(event_id, position_id): official_id or None} for every slot of a built schedule."""
+    return {
+        (event_id, position_id): official_id
+        for event_id, position_id, official_id, _mandatory in schedule.packed.slots()
+    }
+
+
+class ScheduleSolverTest(TestCase):
+    """Unit tests for the in-memory schedule solver."""
+
+    def test_official_works_one_position_per_event(self):
+        inputs = make_inputs(5, [1, 1, 1], [1, 1, 1, 1])
+        for option in ('LIGHTEST', 'HEAVIEST'):
+            for row in solve(inputs, option):
+                filled = [cell for cell in row if cell >= 0]
+                self.assertEqual(len(filled), len(set(filled)))
+
+    def test_certification_level_is_respected(self):
+        inputs = make_inputs(3, [3, 1], [1, 1, 3])
+        for option in ('LIGHTEST', 'HEAVIEST'):
+            for row in solve(inputs, option):
+                self.assertEqual(row[0], 2)
+
+    def test_unqualified_slot_is_left_unfilled(self):
+        inputs = make_inputs(2, [5, 1], [1, 2])
+        grid = solve(inputs, 'LIGHTEST')
+        self.assertEqual([row[0] for row in grid], [UNFILLED, UNFILLED])
+        self.assertTrue(all(row[1] >= 0 for row in grid))
+
+    def test_missing_event_positions_are_not_slots(self):
+        inputs = make_inputs(2, [1, 1], [1, 1])
+        inputs.slot_mask[1][0] = False
+        grid = solve(inputs, 'LIGHTEST')
+        self.assertEqual(grid[1][0], NO_SLOT)
+
+    def test_lightest_spreads_load(self):
+        inputs = make_inputs(6, [1, 1], [1, 1, 1, 1])
+        grid = solve(inputs, 'LIGHTEST')
+        loads = [sum(row.count(o) for row in grid) for o in range(4)]
+        self.assertEqual(loads, [3, 3, 3, 3])
+
+    def test_heaviest_packs_strongest_officials(self):
+        inputs = make_inputs(6, [1, 1], [1, 1, 2, 3], official_proficiency=[4, 4, 1, 1])
+        grid = solve(inputs, 'HEAVIEST')
+        used = {cell for row in grid for cell in row}
+        self.assertEqual(used, {2, 3})
+
+
+class OptimalSolverTest(TestCase):
+    """Unit tests for the matrix-based OPTIMAL solver."""
+
+    def test_constraints_hold(self):
+        inputs = make_inputs(8, [3, 2, 1, 1], [1, 1, 2, 3, 3, 1])
+        grid = solve(inputs, 'OPTIMAL')
+        for row in grid:
+            filled = [cell for cell in row if cell >= 0]
+            self.assertEqual(len(filled), len(set(filled)))
+            for p, cell in enumerate(row):
+                self.assertGreaterEqual(inputs.official_levels[cell], inputs.position_levels[p])
+
+    def test_load_is_balanced(self):
+        inputs = make_inputs(6, [1, 1], [1, 1, 1, 1])
+        grid = solve(inputs, 'OPTIMAL')
+        loads = [sum(row.count(o) for row in grid) for o in range(4)]
+        self.assertEqual(loads, [3, 3, 3, 3])
+
+    def test_mandatory_slots_filled_first(self):
+        inputs = make_inputs(1, [1, 1, 1], [1, 1])
+        inputs.mandatory_mask[0] = [False, True, True]
+        grid = solve(inputs, 'OPTIMAL')
+        self.assertEqual(grid[0][0], UNFILLED)
+        self.assertTrue(grid[0][1] >= 0 and grid[0][2] >= 0)
+
+    def test_qualified_official_kept_for_strict_position(self):
+        inputs = make_inputs(1, [3, 1], [3, 1])
+        grid = solve(inputs, 'OPTIMAL')
+        self.assertEqual(grid[0], [0, 1])
+
+
+class ScheduleSearchTest(TestCase):
+    """Tests for the local-search improvement pass."""
+
+    def _assert_feasible(self, inputs, grid):
+        for e, row in enumerate(grid):
+            filled = [cell for cell in row if cell >= 0]
+            self.assertEqual(len(filled), len(set(filled)))
+            for p, cell in enumerate(row):
+                self.assertEqual(cell == NO_SLOT, not inputs.slot_mask[e][p])
+                if cell >= 0:
+                    self.assertGreaterEqual(inputs.official_levels[cell], inputs.position_levels[p])
+
+    def test_run_swap_fixes_proficiency_fit(self):
+        # The less proficient official starts on the demanding position in every event.
+        inputs = make_inputs(6, [3, 1], [3, 3], official_proficiency=[0, 3])
+        result = improve_schedule(inputs, [[0, 1]] * 6, max_iterations=200, seed=1)
+        self.assertEqual(result.grid, [[1, 0]] * 6)
+        self.assertLess(result.score, result.initial_score)
+
+    def test_seeded_runs_are_reproducible_and_feasible(self):
+        inputs = make_inputs(12, [3, 2, 1, 1, 1], [1, 1, 2, 3, 3, 1, 2], official_proficiency=[0, 1, 2, 3, 1, 2, 0])
+        inputs.slot_mask[3][1] = False
+        grid = solve(inputs, 'LIGHTEST')
+        first = improve_schedule(inputs, grid, max_iterations=3000, seed=7)
+        second = improve_schedule(inputs, grid, max_iterations=3000, seed=7)
+        self.assertEqual(first.grid, second.grid)
+        self._assert_feasible(inputs, first.grid)
+        self.assertLessEqual(first.score, first.initial_score)
+        self.assertAlmostEqual(first.score, schedule_quality(inputs, first.grid))
+
+    def test_time_budget_stops_search(self):
+        inputs = make_inputs(20, [1] * 6, [1] * 10)
+        result = improve_schedule(inputs, solve(inputs, 'LIGHTEST'), budget_ms=20)
+        self.assertLess(result.elapsed, 1.0)
+        self._assert_feasible(inputs, result.grid)
+
+
+class ScheduleStorageTest(TestCase):
+    """Tests for the compact schedule encoding."""
+
+    def test_round_trip(self):
+        grid = [[0, 1, NO_SLOT], [UNFILLED, 2, 1]]
+        mandatory = [[True, False, False], [True, True, False]]
+        packed = PackedSchedule(encode([11, 12], [21, 22, 23], [31, 32, 33], grid, mandatory))
+        self.assertEqual(packed.shape, (2, 3))
+        self.assertEqual(packed.grid(), grid)
+        self.assertEqual(packed.mandatory_mask(), mandatory)
+        self.assertEqual(list(packed.slots([12])), [(12, 21, None, True), (12, 22, 33, True), (12, 23, 32, False)])
+        self.assertEqual(packed.official_ids_used(), {31, 32, 33})
+
+    def test_rows_decode_only_requested_events(self):
+        inputs = make_inputs(99, [1] * 40, [1] * 60)
+        packed = PackedSchedule(encode_inputs(inputs, solve(inputs, 'LIGHTEST')))
+        with mock.patch.object(PackedSchedule, 'row', wraps=packed.row) as row:
+            rows = list(packed.rows([inputs.event_ids[5]]))
+        row.assert_called_once_with(5)
+        self.assertEqual(len(rows[0][1]), 40)
+
+    def test_rejects_foreign_data(self):
+        with self.assertRaises(ValueError):
+            PackedSchedule(b'not a grid at all')
+
+
+class ScheduleFixtureMixin:
+    """A dual meet with two confirmed officials and four events of two positions."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='coach', password='testpassword123')
+        self.league = League.objects.create(name='Build League')
+        self.league.users.add(self.user)
+        division = Division.objects.create(name='Build Division', league=self.league)
+        self.team = Team.objects.create(name='Build Team', division=division)
+        self.strategy = Strategy.objects.create(name='SIDES')
+        self.cert_low = Certification.objects.create(name='Stroke and Turn', level=1)
+        self.cert_high = Certification.objects.create(name='Referee', level=3)
+        self.referee = Position.objects.create(
+            role='Referee', strategy=self.strategy, location='Deck', minimum_certification=self.cert_high
+        )
+        self.judge = Position.objects.create(
+            role='Stroke Judge', strategy=self.strategy, location='Side', minimum_certification=self.cert_low
+        )
+        self.events = [
+            Event.objects.create(event_number=n, name=f'Event {n}', meet_type='dual') for n in range(1, 5)
+        ]
+        for event in self.events:
+            EventPosition.objects.create(event=event, position=self.referee)
+            EventPosition.objects.create(event=event, position=self.judge, is_mandatory=False)
+        self.meet = Meet.objects.create(
+            name='Build Meet', date=date(2026, 6, 20), league=self.league,
+            host_team=self.team, meet_type='dual', strategy=self.strategy,
+        )
+        self.ref_official = Official.objects.create(name='Rita Ref', team=self.team, certification=self.cert_high)
+        self.judge_official = Official.objects.create(name='Jon Judge', team=self.team, certification=self.cert_low)
+        unconfirmed = Official.objects.create(name='Una Unconfirmed', team=self.team, certification=self.cert_high)
+        Assignment.objects.create(meet=self.meet, official=self.ref_official, role='Referee', confirmed=True)
+        Assignment.objects.create(meet=self.meet, official=self.judge_official, role='Stroke and Turn', confirmed=True)
+        Assignment.objects.create(meet=self.meet, official=unconfirmed, role='Referee', confirmed=False)
+
+
+@override_settings(SCHEDULE_JOBS_EAGER=True)
+class ScheduleBuildTest(ScheduleFixtureMixin, TestCase):
+    """Integration tests for building and persisting meet schedules."""
+
+    def test_inputs_use_confirmed_officials_only(self):
+        inputs = load_schedule_inputs(self.meet)
+        self.assertEqual(inputs.official_ids, [self.judge_official.id, self.ref_official.id])
+        self.assertEqual(inputs.shape, (4, 2))
+
+    def test_build_persists_full_grid_with_bulk_queries(self):
+        # Inputs (2), season loads (2), bookings (1), then the insert (1) and the season index
+        # update (6) in a transaction (2).
+        with self.assertNumQueries(14):
+            result = build_schedule(self.meet, 'LIGHTEST')
+        self.assertEqual(result.total_slots, 8)
+        self.assertEqual(result.filled_slots, 8)
+        holders = slot_holders(MeetSchedule.objects.get(pk=result.schedule.pk))
+        self.assertEqual(len(holders), 8)
+        self.assertEqual(
+            {holder for (_event, position), holder in holders.items() if position == self.referee.id},
+            {self.ref_official.id},
+        )
+
+    def test_failed_season_load_update_keeps_no_schedule(self):
+        with mock.patch('officials.services.season_load.apply_deltas', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                build_schedule(self.meet, 'LIGHTEST')
+        self.assertFalse(MeetSchedule.objects.filter(meet=self.meet).exists())
+
+    def test_build_with_improvement_pass(self):
+        result = build_schedule(self.meet, 'LIGHTEST', improve_ms=50, seed=3)
+        self.assertIsNotNone(result.search)
+        self.assertEqual(result.filled_slots, 8)
+
+    def test_build_requires_strategy(self):
+        self.meet.strategy = None
+        self.meet.save()
+        with self.assertRaises(ScheduleBuildError):
+            build_schedule(self.meet, 'LIGHTEST')
+
+    def test_build_view_creates_schedule(self):
+        self.client.login(username='coach', password='testpassword123')
+        response = self.client.post(
+            reverse('meet_build_schedule', args=[self.meet.id]), {'build_option': 'HEAVIEST'}
+        )
+        self.assertRedirects(response, reverse('meet_configure', args=[self.meet.id]))
+        schedule = MeetSchedule.objects.get(meet=self.meet)
+        self.assertEqual(schedule.build_option, 'HEAVIEST')
+        self.assertEqual(len(slot_holders(schedule)), 8)
+
+        response = self.client.get(reverse('meet_schedule_detail', args=[self.meet.id, schedule.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Rita Ref')
+
+
+class ScheduleRepairTest(ScheduleFixtureMixin, TestCase):
+    """Tests for repairing built schedules when officials drop out."""
+
+    def setUp(self):
+        super().setUp()
+        self.backup_ref = Official.objects.create(name='Bea Backup', team=self.team, certification=self.cert_high)
+        Assignment.objects.create(meet=self.meet, official=self.backup_ref, role='Referee', confirmed=True)
+        self.schedule = build_schedule(self.meet, 'LIGHTEST').schedule
+        self.client.login(username='coach', password='testpassword123')
+
+    def _holders(self):
+        return slot_holders(MeetSchedule.objects.get(pk=self.schedule.pk))
+
+    def test_toggle_unconfirm_reassigns_only_that_officials_slots(self):
+        before = self._holders()
+        dropped = {slot for slot, holder in before.items() if holder == self.ref_official.id}
+        self.assertTrue(dropped)
+        assignment = Assignment.objects.get(meet=self.meet, official=self.ref_official)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('assignment_toggle_confirm', args=[assignment.id]))
+
+        after = self._holders()
+        backup_events = {event for (event, _position), holder in before.items() if holder == self.backup_ref.id}
+        for slot, holder in before.items():
+            if slot not in dropped:
+                self.assertEqual(after[slot], holder)
+            elif slot[0] in backup_events:
+                self.assertIsNone(after[slot])
+            else:
+                self.assertEqual(after[slot], self.backup_ref.id)
+
+    def test_delete_leaves_unfillable_slots_empty(self):
+        assignment = Assignment.objects.get(meet=self.meet, official=self.judge_official)
+        judge_slots = list(self._holders().values()).count(self.judge_official.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('assignment_delete', args=[assignment.id]))
+        after = list(self._holders().values())
+        self.assertNotIn(self.judge_official.id, after)
+        # Referees can cover stroke judge slots when they are free in that event.
+        self.assertNotIn(None, after)
+        self.assertGreater(judge_slots, 0)
+
+    def test_unconfirming_through_the_model_repairs(self):
+        assignment = Assignment.objects.get(meet=self.meet, official=self.ref_official)
+        assignment.confirmed = False
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.save()
+        self.assertGreater(assignment.repaired_slots, 0)
+        self.assertNotIn(self.ref_official.id, self._holders().values())
+
+    def test_bulk_api_unconfirm_and_delete_repair(self):
+        ref = Assignment.objects.get(meet=self.meet, official=self.ref_official)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse('assignment-bulk'), json.dumps([{'id': ref.id, 'confirmed': False}]),
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(self.ref_official.id, self._holders().values())
+        judge = Assignment.objects.get(meet=self.meet, official=self.judge_official)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                reverse('assignment-bulk'), json.dumps([judge.id]), content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(self.judge_official.id, self._holders().values())
+
+    def test_failed_repair_keeps_the_write(self):
+        assignment = Assignment.objects.get(meet=self.meet, official=self.ref_official)
+        assignment.confirmed = False
+        with mock.patch('officials.signals.repair_schedules', side_effect=RuntimeError), \
+                self.assertLogs('officials.signals', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            assignment.save()
+        self.assertIsNone(assignment.repaired_slots)
+        self.assertFalse(Assignment.objects.get(pk=assignment.pk).confirmed)
+
+    def test_no_repair_while_another_role_is_confirmed(self):
+        Assignment.objects.create(meet=self.meet, official=self.ref_official, role='Starter', confirmed=True)
+        before = self._holders()
+        assignment = Assignment.objects.get(meet=self.meet, official=self.ref_official, role='Referee')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('assignment_toggle_confirm', args=[assignment.id]))
+        self.assertEqual(self._holders(), before)
+
+
+class ScheduleCacheTest(ScheduleFixtureMixin, TestCase):
+    """Tests for reusing solved grids when a meet's inputs are unchanged."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_unchanged_inputs_reuse_grid(self):
+        first = build_schedule(self.meet, 'LIGHTEST')
+        with mock.patch('officials.services.schedule_builder.solve') as solver:
+            second = build_schedule(self.meet, 'LIGHTEST')
+        solver.assert_not_called()
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(slot_holders(second.schedule), slot_holders(first.schedule))
+
+    def test_build_option_is_part_of_fingerprint(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        self.assertFalse(build_schedule(self.meet, 'HEAVIEST').cached)
+
+    def test_assignment_change_invalidates(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        inputs = load_schedule_inputs(self.meet)
+        self.assertIsNotNone(schedule_cache.get_cached_grid(inputs, 'LIGHTEST'))
+        Assignment.objects.filter(meet=self.meet, official=self.judge_official).delete()
+        self.assertIsNone(schedule_cache.get_cached_grid(inputs, 'LIGHTEST'))
+        self.assertFalse(build_schedule(self.meet, 'LIGHTEST').cached)
+
+    def test_event_position_change_invalidates(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        inputs = load_schedule_inputs(self.meet)
+        EventPosition.objects.filter(event=self.events[0], position=self.judge).update(is_mandatory=True)
+        # A queryset update bypasses signals; the fingerprint still notices.
+        self.assertFalse(build_schedule(self.meet, 'LIGHTEST').cached)
+        self.assertIsNotNone(schedule_cache.get_cached_grid(load_schedule_inputs(self.meet), 'LIGHTEST'))
+        EventPosition.objects.get(event=self.events[0], position=self.judge).save()
+        self.assertIsNone(schedule_cache.get_cached_grid(load_schedule_inputs(self.meet), 'LIGHTEST'))
+        self.assertIsNone(schedule_cache.get_cached_grid(inputs, 'LIGHTEST'))
+
+    def test_official_certification_change_changes_fingerprint(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        self.judge_official.certification = self.cert_high
+        self.judge_official.save()
+        self.assertFalse(build_schedule(self.meet, 'LIGHTEST').cached)
@@ -0,0 +1,82 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from officials.models import MeetSchedule
+from officials.services.schedule_diff import diff_schedules
+from officials.services.schedule_storage import NO_SLOT, UNFILLED, encode
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin
+
+
+class ScheduleDiffTest(ScheduleFixtureMixin, TestCase):
+    """Tests for comparing two built schedules of a meet."""
+
+    def setUp(self):
+        super().setUp()
+        self.event_ids = [event.id for event in self.events[:2]]
+        self.position_ids = [self.referee.id, self.judge.id]
+        self.officials = [self.ref_official.id, self.judge_official.id]
+        mandatory = [[True, False], [True, False]]
+        self.before = self._schedule('Before', [[0, 1], [0, 1]], mandatory)
+        self.after = self._schedule('After', [[0, UNFILLED], [UNFILLED, 1]], mandatory)
+        self.client.login(username='coach', password='testpassword123')
+
+    def _schedule(self, name, grid, mandatory, event_ids=None):
+        return MeetSchedule.objects.create(
+            meet=self.meet, name=name, build_option='LIGHTEST',
+            grid_data=encode(event_ids or self.event_ids, self.position_ids, self.officials, grid, mandatory),
+        )
+
+    def test_changed_slots_loads_and_unfilled(self):
+        diff = diff_schedules(self.before, self.after)
+        self.assertEqual(
+            [(c.event_id, c.position_id, c.before, c.after) for c in diff.changed_slots],
+            [
+                (self.events[0].id, self.judge.id, self.judge_official.id, None),
+                (self.events[1].id, self.referee.id, self.ref_official.id, None),
+            ],
+        )
+        self.assertEqual(
+            [(load.official_id, load.before, load.after, load.delta) for load in diff.load_deltas],
+            sorted([(self.ref_official.id, 2, 1, -1), (self.judge_official.id, 2, 1, -1)]),
+        )
+        # The optional judge slot going empty is a change but not a mandatory gap.
+        self.assertEqual(diff.newly_unfilled_mandatory, [(self.events[1].id, self.referee.id)])
+
+    def test_identical_schedules(self):
+        diff = diff_schedules(self.before, self.before)
+        self.assertEqual((diff.changed_slots, diff.load_deltas, diff.newly_unfilled_mandatory), ([], [], []))
+
+    def test_aligns_schedules_with_different_events(self):
+        other = self._schedule(
+            'Other', [[0, 1], [NO_SLOT, 1]], [[True, False], [False, False]],
+            event_ids=[self.events[1].id, self.events[2].id],
+        )
+        diff = diff_schedules(self.before, other)
+        changed = {(c.event_id, c.position_id): (c.before, c.after) for c in diff.changed_slots}
+        self.assertEqual(changed[(self.events[0].id, self.referee.id)], (self.ref_official.id, None))
+        self.assertEqual(changed[(self.events[2].id, self.judge.id)], (None, self.judge_official.id))
+        self.assertNotIn((self.events[1].id, self.referee.id), changed)
+
+    def test_json_api(self):
+        response = self.client.get(
+            reverse('meet_schedule_diff', args=[self.meet.id]),
+            {'a': self.before.id, 'b': self.after.id, 'format': 'json'},
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['changed_slots']), 2)
+        self.assertEqual(data['newly_unfilled_mandatory'], [{'event_id': self.events[1].id, 'position_id': self.referee.id}])
+
+    def test_view_defaults_to_latest_two(self):
+        response = self.client.get(reverse('meet_schedule_diff', args=[self.meet.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['before'], self.before)
+        self.assertEqual(response.context['after'], self.after)
+        self.assertContains(response, 'Jon Judge')
+
+    def test_rejects_schedule_from_another_meet(self):
+        response = self.client.get(
+            reverse('meet_schedule_diff', args=[self.meet.id]),
+            {'a': self.before.id, 'b': 999999, 'format': 'json'},
+        )
+        self.assertEqual(response.status_code, 404)
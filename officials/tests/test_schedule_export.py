@@ -0,0 +1,78 @@
+import io
+from unittest import mock
+
+import openpyxl
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from officials.models import MeetSchedule
+from officials.services import schedule_export
+from officials.services.schedule_storage import NO_SLOT, UNFILLED, encode
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin
+
+User = get_user_model()
+
+
+class ScheduleExportTest(ScheduleFixtureMixin, TestCase):
+    """Excel export of a built schedule."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='coach', password='testpassword123')
+        officials = [self.judge_official.id, self.ref_official.id]
+        self.schedule = MeetSchedule.objects.create(
+            meet=self.meet, name='Deck', build_option='LIGHTEST',
+            grid_data=encode(
+                [event.id for event in self.events], [self.referee.id, self.judge.id], officials,
+                [[1, 0], [UNFILLED, 0], [1, NO_SLOT], [1, UNFILLED]],
+                [[True, False]] * 4,
+            ),
+        )
+        self.url = reverse('meet_schedule_export_excel', args=[self.meet.id, self.schedule.id])
+
+    def _workbook(self, response):
+        return openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_export_streams_deck_layout(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn(f'OfficialsSchedule_2026-build-meet-{self.schedule.id}.xlsx', response['Content-Disposition'])
+        workbook = self._workbook(response)
+        self.assertEqual(workbook.sheetnames, ['Schedule', 'Officials'])
+        rows = list(workbook['Schedule'].iter_rows(values_only=True))
+        self.assertEqual(rows[0][0], '2026 Build Meet')
+        self.assertEqual(rows[1], ('Event', None, 'Referee', 'Stroke Judge'))
+        self.assertEqual(rows[2], ('Number', 'Name', 'Deck', 'Side'))
+        self.assertEqual(rows[3:], [
+            (1, 'Event 1', 'Rita Ref', 'Jon Judge'),
+            (2, 'Event 2', 'Unfilled', 'Jon Judge'),
+            (3, 'Event 3', 'Rita Ref', None),
+            (4, 'Event 4', 'Rita Ref', None),
+        ])
+        officials = list(workbook['Officials'].iter_rows(values_only=True))
+        self.assertEqual(officials, [
+            ('who', 'count', 'pos', 'team'),
+            ('Jon Judge', 2, 'Stroke and Turn', 'Build Team'),
+            ('Rita Ref', 3, 'Referee', 'Build Team'),
+        ])
+
+    def test_export_reads_events_in_batches(self):
+        with mock.patch.object(schedule_export, 'EVENT_BATCH', 3):
+            response = self.client.get(self.url)
+            rows = list(self._workbook(response)['Schedule'].iter_rows(min_row=4, values_only=True))
+        self.assertEqual([row[0] for row in rows], [1, 2, 3, 4])
+
+    def test_export_requires_league_membership(self):
+        User.objects.create_user(username='outsider', password='testpassword123')
+        self.client.login(username='outsider', password='testpassword123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('meet_detail', args=[self.meet.id]), fetch_redirect_response=False)
+
+    def test_schedule_without_grid_redirects(self):
+        empty = MeetSchedule.objects.create(meet=self.meet, name='Empty', build_option='LIGHTEST')
+        response = self.client.get(reverse('meet_schedule_export_excel', args=[self.meet.id, empty.id]))
+        self.assertRedirects(
+            response, reverse('meet_schedule_detail', args=[self.meet.id, empty.id]), fetch_redirect_response=False
+        )
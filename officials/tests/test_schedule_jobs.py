@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from officials.models import MeetSchedule, ScheduleJob
+from officials.services.jobs import JobProgress, run_schedule_build, submit_schedule_build
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin
+
+
+class ScheduleJobTest(ScheduleFixtureMixin, TestCase):
+    """Tests for background schedule builds and progress polling."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='coach', password='testpassword123')
+
+    def test_build_is_queued_until_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(
+                reverse('meet_build_schedule', args=[self.meet.id]),
+                {'build_option': 'LIGHTEST'},
+                HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            )
+        self.assertEqual(response.status_code, 202)
+        payload = response.json()
+        self.assertEqual(payload['status'], 'QUEUED')
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(MeetSchedule.objects.filter(meet=self.meet).exists())
+
+        job = ScheduleJob.objects.get(pk=payload['id'])
+        with mock.patch('officials.services.jobs.get_executor') as get_executor:
+            callbacks[0]()
+        get_executor.return_value.submit.assert_called_once()
+
+        run_schedule_build(job.pk)
+        status = self.client.get(payload['status_url']).json()
+        self.assertEqual(status['status'], 'DONE')
+        self.assertEqual(status['progress'], 100)
+        self.assertTrue(status['finished'])
+        self.assertEqual(
+            status['schedule_url'],
+            reverse('meet_schedule_detail', args=[self.meet.id, status['schedule_id']]),
+        )
+
+    @override_settings(SCHEDULE_JOBS_EAGER=True)
+    def test_failed_build_reports_reason(self):
+        self.meet.strategy = None
+        self.meet.save()
+        job = submit_schedule_build(self.meet, 'HEAVIEST')
+        self.assertEqual(job.status, 'FAILED')
+        self.assertIn('Strategy', job.message)
+        self.assertIsNone(job.schedule)
+
+    @override_settings(SCHEDULE_JOBS_EAGER=True, SCHEDULE_IMPROVE_MS=30)
+    def test_improve_option_runs_search(self):
+        self.client.post(
+            reverse('meet_build_schedule', args=[self.meet.id]), {'build_option': 'LIGHTEST', 'improve': '1'}
+        )
+        job = ScheduleJob.objects.get(meet=self.meet)
+        self.assertEqual(job.improve_ms, 30)
+        self.assertEqual(job.status, 'DONE')
+
+    def test_status_requires_league_access(self):
+        job = ScheduleJob.objects.create(meet=self.meet, build_option='LIGHTEST')
+        self.league.users.remove(self.user)
+        response = self.client.get(reverse('meet_build_status', args=[self.meet.id, job.pk]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_progress_writes_are_throttled(self):
+        job = ScheduleJob.objects.create(meet=self.meet, build_option='LIGHTEST')
+        progress = JobProgress(job.pk, start=0, end=100, step=25)
+        with self.assertNumQueries(3):
+            for step in range(100):
+                progress(step / 100)
+        job.refresh_from_db()
+        self.assertEqual(job.progress, 75)
+
+    def test_configure_page_lists_running_jobs(self):
+        job = ScheduleJob.objects.create(meet=self.meet, build_option='LIGHTEST', status='RUNNING', progress=40)
+        response = self.client.get(reverse('meet_configure', args=[self.meet.id]))
+        self.assertContains(response, reverse('meet_build_status', args=[self.meet.id, job.pk]))
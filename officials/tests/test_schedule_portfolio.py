@@ -0,0 +1,54 @@
+from django.test import TestCase, override_settings
+
+from officials.models import MeetSchedule, ScheduleJob
+from officials.services.jobs import submit_schedule_build
+from officials.services.schedule_builder import build_schedule, solve
+from officials.services.schedule_portfolio import HEURISTICS, solve_portfolio
+from officials.services.schedule_search import schedule_quality
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin, make_inputs
+
+
+class SolvePortfolioTest(TestCase):
+    """Tests for racing several solvers and keeping the best grid."""
+
+    def setUp(self):
+        self.inputs = make_inputs(8, [3, 2, 1, 1], [3, 1, 2, 3, 1, 2], official_proficiency=[0, 1, 2, 3, 1, 2])
+
+    def test_keeps_lowest_scoring_construction(self):
+        result = solve_portfolio(self.inputs, improve_ms=0, workers=1)
+        self.assertEqual([run.heuristic for run in result.runs], list(HEURISTICS))
+        scores = {heuristic: schedule_quality(self.inputs, solve(self.inputs, heuristic)) for heuristic in HEURISTICS}
+        self.assertAlmostEqual(result.best.score, min(scores.values()))
+        self.assertAlmostEqual(schedule_quality(self.inputs, result.grid), result.best.score)
+        self.assertTrue(all(run.construct_seconds >= 0 and run.improve_seconds == 0 for run in result.runs))
+
+    def test_seeds_add_improved_candidates(self):
+        result = solve_portfolio(self.inputs, heuristics=('LIGHTEST',), seeds=3, improve_ms=20, workers=1)
+        self.assertEqual([run.label for run in result.runs], ['LIGHTEST#0', 'LIGHTEST#1', 'LIGHTEST#2'])
+        self.assertEqual(result.best.score, min(run.score for run in result.runs))
+
+    def test_pool_matches_inline(self):
+        inline = solve_portfolio(self.inputs, improve_ms=0, workers=1)
+        pooled = solve_portfolio(self.inputs, improve_ms=0, workers=2)
+        self.assertEqual(pooled.grid, inline.grid)
+        self.assertEqual(pooled.best.label, inline.best.label)
+
+
+@override_settings(SCHEDULE_PORTFOLIO_WORKERS=1, SCHEDULE_PORTFOLIO_SEEDS=1, SCHEDULE_IMPROVE_MS=10)
+class PortfolioBuildTest(ScheduleFixtureMixin, TestCase):
+    """Portfolio as a build option."""
+
+    def test_build_reports_candidates(self):
+        result = build_schedule(self.meet, 'PORTFOLIO')
+        self.assertEqual(result.schedule.build_option, 'PORTFOLIO')
+        self.assertEqual(result.filled_slots, 8)
+        self.assertEqual(len(result.portfolio.runs), len(HEURISTICS))
+
+    @override_settings(SCHEDULE_JOBS_EAGER=True)
+    def test_job_message_names_winner(self):
+        job = submit_schedule_build(self.meet, 'PORTFOLIO')
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'DONE')
+        self.assertIn(f'Best of {len(HEURISTICS)} candidates', job.message)
+        self.assertEqual(MeetSchedule.objects.get(meet=self.meet).build_option, 'PORTFOLIO')
+        self.assertEqual(ScheduleJob.objects.count(), 1)
@@ -0,0 +1,114 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from officials.models import PublishedSchedule
+from officials.services.schedule_builder import build_schedule
+from officials.services.schedule_publish import current_publication, publication_body, publish_schedule
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin
+
+
+@override_settings(SCHEDULE_JOBS_EAGER=True)
+class SchedulePublishTest(ScheduleFixtureMixin, TestCase):
+    """Publishing schedules as immutable pre-rendered snapshots."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.schedule = build_schedule(self.meet, 'LIGHTEST').schedule
+        self.page = reverse('published_schedule', args=[self.meet.id])
+        self.feed = reverse('published_schedule_json', args=[self.meet.id])
+
+    def test_publish_view_stores_snapshot(self):
+        self.client.login(username='coach', password='testpassword123')
+        response = self.client.post(reverse('meet_schedule_publish', args=[self.meet.id, self.schedule.id]))
+        self.assertRedirects(response, reverse('meet_schedule_detail', args=[self.meet.id, self.schedule.id]))
+        snapshot = PublishedSchedule.objects.get(meet=self.meet)
+        self.assertEqual(snapshot.schedule, self.schedule)
+        self.assertEqual(snapshot.published_by.username, 'coach')
+        self.assertIn('Rita Ref', snapshot.html)
+
+    def test_published_page_is_served_from_cache_with_etag(self):
+        publish_schedule(self.schedule)
+        self.client.logout()
+        # The current publication's version; the body comes from the cache.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.page)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Build Meet')
+        self.assertContains(response, 'Rita Ref')
+        self.assertIn('public', response['Cache-Control'])
+
+        with self.assertNumQueries(1):
+            again = self.client.get(self.page, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+
+    def test_json_feed(self):
+        publish_schedule(self.schedule)
+        response = self.client.get(self.feed)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        document = json.loads(response.content)
+        self.assertEqual(document['schedule']['id'], self.schedule.id)
+        self.assertEqual([p['role'] for p in document['positions']], ['Referee', 'Stroke Judge'])
+        self.assertEqual(len(document['events']), 4)
+        referee_slots = [event['slots'][0] for event in document['events']]
+        self.assertEqual({slot['official']['name'] for slot in referee_slots}, {'Rita Ref'})
+        self.assertNotEqual(response['ETag'], self.client.get(self.page)['ETag'])
+
+    def test_cache_miss_loads_the_body_once(self):
+        publish_schedule(self.schedule)
+        newer = publish_schedule(self.schedule)
+        cache.clear()
+        publication = current_publication(self.meet.id)
+        self.assertEqual(publication['id'], newer.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(publication_body(publication, 'json'), newer.json)
+        with self.assertNumQueries(0):
+            publication_body(publication, 'json')
+
+    def test_other_workers_see_publish_and_withdraw(self):
+        # Another worker's cache is not told about either; the database is.
+        self.assertEqual(self.client.get(self.page).status_code, 404)
+        snapshot = PublishedSchedule.objects.create(
+            meet=self.meet, schedule=self.schedule, html='<p>elsewhere</p>', json='{}', etag='abc',
+        )
+        self.assertContains(self.client.get(self.page), 'elsewhere')
+        PublishedSchedule.objects.filter(pk=snapshot.pk).delete()
+        self.assertEqual(self.client.get(self.page).status_code, 404)
+
+    def test_snapshot_survives_schedule_deletion(self):
+        publish_schedule(self.schedule)
+        etag = self.client.get(self.page)['ETag']
+        self.schedule.delete()
+        response = self.client.get(self.page, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_republish_changes_etag(self):
+        publish_schedule(self.schedule)
+        etag = self.client.get(self.page)['ETag']
+        other = build_schedule(self.meet, 'HEAVIEST', name='Other').schedule
+        publish_schedule(other)
+        response = self.client.get(self.page, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_withdraw(self):
+        publish_schedule(self.schedule)
+        self.client.login(username='coach', password='testpassword123')
+        self.client.post(reverse('meet_schedule_withdraw', args=[self.meet.id]))
+        self.assertFalse(PublishedSchedule.objects.exists())
+        self.assertEqual(self.client.get(self.page).status_code, 404)
+
+    def test_unpublished_meet_is_404(self):
+        self.assertEqual(self.client.get(self.page).status_code, 404)
+        self.assertEqual(self.client.get(self.feed).status_code, 404)
+
+    def test_schedule_detail_shows_publication(self):
+        publish_schedule(self.schedule)
+        self.client.login(username='coach', password='testpassword123')
+        response = self.client.get(reverse('meet_schedule_detail', args=[self.meet.id, self.schedule.id]))
+        self.assertContains(response, 'This schedule is')
+        self.assertContains(response, 'Republish')
@@ -0,0 +1,177 @@
+import json
+import random
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from officials.models import MeetSchedule
+from officials.services.schedule_builder import build_schedule
+from officials.services.schedule_sandbox import (SandboxError, ScheduleSandbox, commit_sandbox, get_sandbox,
+                                                 open_sandbox, save_sandbox)
+from officials.services.schedule_validation import DOUBLE_BOOKED, UNDER_CERTIFIED, UNFILLED_MANDATORY, validate_grid
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin, slot_holders
+
+
+class ScheduleSandboxTest(ScheduleFixtureMixin, TestCase):
+    """Tests for editing a built schedule in a sandbox."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.schedule = build_schedule(self.meet, 'LIGHTEST').schedule
+        self.session = {}
+        self.sandbox = open_sandbox(self.session, self.schedule)
+        self.first = self.events[0].id
+
+    def _kinds(self, sandbox=None):
+        return [(v.kind, v.event_id, v.position_id, v.official_id) for v in (sandbox or self.sandbox).violation_list()]
+
+    def test_edits_are_validated_incrementally(self):
+        self.assertEqual(self._kinds(), [])
+        self.sandbox.swap(self.first, self.referee.id, self.first, self.judge.id)
+        self.assertEqual(self._kinds(), [(UNDER_CERTIFIED, self.first, self.referee.id, self.judge_official.id)])
+        self.assertTrue(self.sandbox.blocking)
+
+        self.sandbox.swap(self.first, self.referee.id, self.first, self.judge.id)
+        self.sandbox.assign(self.first, self.judge.id, self.ref_official.id)
+        self.assertEqual(self._kinds(), [
+            (DOUBLE_BOOKED, self.first, self.referee.id, self.ref_official.id),
+            (DOUBLE_BOOKED, self.first, self.judge.id, self.ref_official.id),
+        ])
+
+        self.sandbox.move(self.first, self.judge.id, self.events[1].id, self.referee.id)
+        self.assertEqual(self._kinds(), [])
+        self.sandbox.clear(self.first, self.referee.id)
+        self.assertEqual(self._kinds(), [(UNFILLED_MANDATORY, self.first, self.referee.id, None)])
+        self.assertFalse(self.sandbox.blocking)
+
+    def test_incremental_matches_full_validation(self):
+        rng = random.Random(5)
+        slots = [(event.id, position.id) for event in self.events for position in (self.referee, self.judge)]
+        officials = [self.ref_official.id, self.judge_official.id]
+        for _ in range(200):
+            op = rng.choice(['swap', 'move', 'clear', 'assign'])
+            try:
+                if op in ('swap', 'move'):
+                    getattr(self.sandbox, op)(*rng.choice(slots), *rng.choice(slots))
+                elif op == 'clear':
+                    self.sandbox.clear(*rng.choice(slots))
+                else:
+                    self.sandbox.assign(*rng.choice(slots), rng.choice(officials))
+            except SandboxError:
+                continue
+            packed = self.sandbox.packed
+            full = validate_grid(
+                packed.event_ids, packed.position_ids, packed.official_ids, self.sandbox.grid(),
+                packed.arrays()[1], self.sandbox.official_levels, self.sandbox.position_levels,
+            )
+            self.assertEqual(self.sandbox.violation_list(), full)
+
+    def test_stored_schedule_is_untouched_until_commit(self):
+        before = slot_holders(self.schedule)
+        self.sandbox.clear(self.first, self.judge.id)
+        save_sandbox(self.session, self.sandbox)
+        restored = get_sandbox(self.session, self.schedule.pk)
+        self.assertEqual(restored.edits, self.sandbox.edits)
+        self.assertEqual(slot_holders(MeetSchedule.objects.get(pk=self.schedule.pk)), before)
+
+        edited = commit_sandbox(self.session, restored)
+        self.assertEqual(edited.name, f'{self.schedule.name} (edited)')
+        self.assertIsNone(slot_holders(edited)[(self.first, self.judge.id)])
+        self.assertIsNone(get_sandbox(self.session, self.schedule.pk))
+
+    def test_commit_refuses_blocking_violations(self):
+        self.sandbox.swap(self.first, self.referee.id, self.first, self.judge.id)
+        with self.assertRaises(SandboxError):
+            commit_sandbox(self.session, self.sandbox)
+
+    def test_rejects_missing_slots(self):
+        with self.assertRaises(SandboxError):
+            self.sandbox.clear(self.first, 999999)
+        with self.assertRaises(SandboxError):
+            self.sandbox.move(self.first, self.referee.id, self.first, self.referee.id + 999999)
+
+    def test_sandbox_round_trips_through_json(self):
+        self.sandbox.swap(self.first, self.referee.id, self.first, self.judge.id)
+        save_sandbox(self.session, self.sandbox)
+        restored = get_sandbox(json.loads(json.dumps(self.session)), self.schedule.pk)
+        self.assertEqual(restored.violation_list(), self.sandbox.violation_list())
+        restored.swap(self.first, self.referee.id, self.first, self.judge.id)
+        self.assertEqual(self._kinds(restored), [])
+        self.assertFalse(restored.blocking)
+
+    def test_expired_sandbox_is_dropped(self):
+        save_sandbox(self.session, self.sandbox)
+        self.session[next(iter(self.session))]['expires'] = 0
+        self.assertIsNone(get_sandbox(self.session, self.schedule.pk))
+        self.assertEqual(self.session, {})
+
+    def test_sandbox_is_per_session(self):
+        self.sandbox.clear(self.first, self.judge.id)
+        save_sandbox(self.session, self.sandbox)
+        self.assertEqual(open_sandbox({}, self.schedule).edits, {})
+        self.assertIsInstance(open_sandbox(self.session, self.schedule), ScheduleSandbox)
+
+
+class ScheduleSandboxViewTest(ScheduleFixtureMixin, TestCase):
+    """The sandbox editing pages."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.schedule = build_schedule(self.meet, 'LIGHTEST').schedule
+        self.client.login(username='coach', password='testpassword123')
+        self.args = [self.meet.id, self.schedule.id]
+
+    def test_edit_and_save(self):
+        response = self.client.get(reverse('meet_schedule_sandbox', args=self.args))
+        self.assertContains(response, 'Save as New Schedule')
+
+        response = self.client.post(
+            reverse('meet_schedule_sandbox_edit', args=self.args),
+            {'op': 'swap', 'event': self.events[0].id, 'position': self.referee.id,
+             'to_event': self.events[0].id, 'to_position': self.judge.id},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        data = response.json()
+        self.assertTrue(data['blocking'])
+        self.assertEqual([v['kind'] for v in data['violations']], [UNDER_CERTIFIED])
+        # Kept in the session, not a per-process cache.
+        cache.clear()
+        response = self.client.get(reverse('meet_schedule_sandbox', args=self.args))
+        self.assertTrue(response.context['sandbox'].blocking)
+
+        response = self.client.post(reverse('meet_schedule_sandbox_commit', args=self.args), {'name': 'Tweaked'})
+        self.assertRedirects(response, reverse('meet_schedule_sandbox', args=self.args))
+        self.assertEqual(MeetSchedule.objects.count(), 1)
+
+        self.client.post(
+            reverse('meet_schedule_sandbox_edit', args=self.args),
+            {'op': 'clear', 'event': self.events[0].id, 'position': self.referee.id},
+        )
+        response = self.client.post(reverse('meet_schedule_sandbox_commit', args=self.args), {'name': 'Tweaked'})
+        tweaked = MeetSchedule.objects.get(name='Tweaked')
+        self.assertRedirects(response, reverse('meet_schedule_detail', args=[self.meet.id, tweaked.id]))
+        holders = slot_holders(tweaked)
+        self.assertIsNone(holders[(self.events[0].id, self.referee.id)])
+        self.assertEqual(holders[(self.events[0].id, self.judge.id)], self.ref_official.id)
+
+    def test_bad_edit_reports_error(self):
+        response = self.client.post(
+            reverse('meet_schedule_sandbox_edit', args=self.args),
+            {'op': 'assign', 'event': self.events[0].id, 'position': self.judge.id, 'official': 999999},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not confirmed', response.json()['error'])
+
+    def test_discard(self):
+        self.client.post(
+            reverse('meet_schedule_sandbox_edit', args=self.args),
+            {'op': 'clear', 'event': self.events[0].id, 'position': self.judge.id},
+        )
+        response = self.client.post(reverse('meet_schedule_sandbox_commit', args=self.args), {'discard': '1'})
+        self.assertRedirects(response, reverse('meet_schedule_detail', args=self.args))
+        response = self.client.post(reverse('meet_schedule_sandbox_commit', args=self.args))
+        self.assertEqual(MeetSchedule.objects.count(), 1)
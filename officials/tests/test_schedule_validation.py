@@ -0,0 +1,82 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from officials.models import MeetSchedule
+from officials.services.schedule_builder import build_schedule
+from officials.services.schedule_storage import NO_SLOT, UNFILLED, encode
+from officials.services.schedule_validation import (DOUBLE_BOOKED, UNDER_CERTIFIED, UNFILLED_MANDATORY,
+                                                    find_violations, validate_schedule)
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin
+
+
+class FindViolationsTest(TestCase):
+    """Tests for the array-level constraint checks."""
+
+    def test_each_constraint(self):
+        matrix = [
+            [0, 1, UNFILLED],
+            [2, 2, NO_SLOT],
+            [UNFILLED, UNFILLED, 1],
+        ]
+        mandatory = [[True, False, True], [True, True, False], [True, False, False]]
+        found = find_violations(matrix, mandatory, official_levels=[3, 1, 2], position_levels=[3, 1, 2])
+        as_cells = {kind: list(zip(rows.tolist(), cols.tolist())) for kind, (rows, cols) in found.items()}
+        self.assertEqual(as_cells[UNFILLED_MANDATORY], [(0, 2), (2, 0)])
+        # Official 2 (level 2) on the level-3 position, official 1 (level 1) on the level-2 one.
+        self.assertEqual(as_cells[UNDER_CERTIFIED], [(1, 0), (2, 2)])
+        self.assertEqual(as_cells[DOUBLE_BOOKED], [(1, 0), (1, 1)])
+
+    def test_valid_grid(self):
+        found = find_violations([[0, 1], [1, 0]], [[True, True]] * 2, [3, 3], [1, 1])
+        self.assertTrue(all(len(rows) == 0 for rows, _cols in found.values()))
+
+
+class ValidateScheduleTest(ScheduleFixtureMixin, TestCase):
+    """Validating stored schedules."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='coach', password='testpassword123')
+
+    def _hand_edited(self, grid):
+        event_ids = [event.id for event in self.events[:2]]
+        return MeetSchedule.objects.create(
+            meet=self.meet, name='Edited', build_option='LIGHTEST',
+            grid_data=encode(
+                event_ids, [self.referee.id, self.judge.id], [self.ref_official.id, self.judge_official.id],
+                grid, [[True, False], [True, False]],
+            ),
+        )
+
+    def test_built_schedule_is_valid(self):
+        schedule = build_schedule(self.meet, 'LIGHTEST').schedule
+        with self.assertNumQueries(2):
+            self.assertEqual(validate_schedule(schedule), [])
+
+    def test_hand_edited_schedule_violations(self):
+        schedule = self._hand_edited([[1, 1], [UNFILLED, 0]])
+        violations = [(v.kind, v.event_id, v.position_id, v.official_id) for v in validate_schedule(schedule)]
+        first, second = self.events[0].id, self.events[1].id
+        self.assertEqual(violations, [
+            (UNFILLED_MANDATORY, second, self.referee.id, None),
+            (UNDER_CERTIFIED, first, self.referee.id, self.judge_official.id),
+            (DOUBLE_BOOKED, first, self.referee.id, self.judge_official.id),
+            (DOUBLE_BOOKED, first, self.judge.id, self.judge_official.id),
+        ])
+
+    def test_json_endpoint(self):
+        schedule = self._hand_edited([[0, 1], [UNFILLED, 1]])
+        response = self.client.get(reverse('meet_schedule_validate', args=[self.meet.id, schedule.id]))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertFalse(data['valid'])
+        self.assertEqual(data['violations'], [{
+            'kind': UNFILLED_MANDATORY, 'event_id': self.events[1].id,
+            'position_id': self.referee.id, 'lane': None, 'official_id': None,
+        }])
+
+    def test_detail_page_lists_violations(self):
+        schedule = self._hand_edited([[1, 1], [0, UNFILLED]])
+        response = self.client.get(reverse('meet_schedule_detail', args=[self.meet.id, schedule.id]))
+        self.assertContains(response, '3 constraint violations')
+        self.assertContains(response, 'Jon Judge holds more than one position in this event')
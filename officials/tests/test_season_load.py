@@ -0,0 +1,124 @@
+from datetime import date
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from officials.models import Assignment, Meet, MeetSchedule, OfficialSeasonLoad
+from officials.services.schedule_builder import build_schedule, load_schedule_inputs, repair_schedules, solve
+from officials.services.schedule_sandbox import commit_sandbox, open_sandbox
+from officials.services.season_load import rebuild_season_loads
+from officials.tests.test_schedule_builder import ScheduleFixtureMixin, make_inputs
+
+
+def index():
+    """{(official id, season): (slots, heavy slots, meets)} for every non-empty index row."""
+    return {
+        (row.official_id, row.season): (row.slots, row.heavy_slots, row.meets)
+        for row in OfficialSeasonLoad.objects.all()
+        if row.slots or row.heavy_slots or row.meets
+    }
+
+
+class SeasonFairnessTest(TestCase):
+    """The season term in LIGHTEST builds."""
+
+    def test_less_worked_official_wins_ties(self):
+        inputs = make_inputs(1, [1], [1, 1])
+        self.assertEqual(solve(inputs, 'LIGHTEST'), [[0]])
+        inputs.official_season_load = [5, 0]
+        self.assertEqual(solve(inputs, 'LIGHTEST'), [[1]])
+
+    def test_meet_load_still_comes_first(self):
+        inputs = make_inputs(2, [1], [1, 1])
+        inputs.official_season_load = [0, 9]
+        self.assertEqual(solve(inputs, 'LIGHTEST'), [[0], [1]])
+
+    def test_heaviest_ignores_season(self):
+        inputs = make_inputs(1, [1], [1, 1])
+        inputs.official_season_load = [5, 0]
+        self.assertEqual(solve(inputs, 'HEAVIEST'), [[0]])
+
+
+class SeasonLoadIndexTest(ScheduleFixtureMixin, TestCase):
+    """Keeping the season index in step with committed schedules."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.season = self.meet.date.year
+        self.ref = (self.ref_official.id, self.season)
+        self.judge_key = (self.judge_official.id, self.season)
+
+    def test_build_counts_slots_heavy_positions_and_meets(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        # The referee position needs level 3, so the referee's slots are heavy.
+        self.assertEqual(index(), {self.ref: (4, 4, 1), self.judge_key: (4, 0, 1)})
+
+    def test_rebuild_replaces_meet_contribution(self):
+        first = build_schedule(self.meet, 'LIGHTEST').schedule
+        second = build_schedule(self.meet, 'HEAVIEST').schedule
+        self.assertEqual(index(), {self.ref: (4, 4, 1), self.judge_key: (4, 0, 1)})
+        first.refresh_from_db()
+        self.assertFalse(first.season_counted)
+        self.assertTrue(second.season_counted)
+
+    def test_deleting_counted_schedule_falls_back_to_previous(self):
+        first = build_schedule(self.meet, 'LIGHTEST').schedule
+        sandbox = open_sandbox({}, first)
+        sandbox.clear(self.events[0].id, self.judge.id)
+        edited = commit_sandbox({}, sandbox)
+        self.assertEqual(index(), {self.ref: (4, 4, 1), self.judge_key: (3, 0, 1)})
+
+        edited.delete()
+        self.assertEqual(index(), {self.ref: (4, 4, 1), self.judge_key: (4, 0, 1)})
+        first.refresh_from_db()
+        self.assertTrue(first.season_counted)
+        first.delete()
+        self.assertEqual(index(), {})
+
+    def test_deleting_meet_removes_its_load(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        build_schedule(self.meet, 'HEAVIEST')
+        # Its confirmed assignments go too, but there are no schedules left to repair.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meet.delete()
+        self.assertEqual(index(), {})
+
+    def test_repair_restates_counted_schedule(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        Assignment.objects.filter(meet=self.meet, official=self.judge_official).update(confirmed=False)
+        repair_schedules(self.meet, self.judge_official.id)
+        # Nobody else can take the judge's slots, so they go unfilled.
+        self.assertEqual(index(), {self.ref: (4, 4, 1)})
+
+    def test_other_meets_feed_the_fairness_term(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        second = Meet.objects.create(
+            name='Second Meet', date=date(2026, 7, 4), league=self.league,
+            host_team=self.team, meet_type='dual', strategy=self.strategy,
+        )
+        Assignment.objects.create(meet=second, official=self.ref_official, role='Referee', confirmed=True)
+        self.assertEqual(load_schedule_inputs(second).official_season_load, [8])
+        # A meet is not weighed against its own earlier build.
+        self.assertEqual(load_schedule_inputs(self.meet).official_season_load, [0, 0])
+
+    @override_settings(SCHEDULE_SEASON_BALANCE=False)
+    def test_balance_can_be_switched_off(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        self.assertIsNone(load_schedule_inputs(self.meet).official_season_load)
+        self.assertEqual(len(index()), 2)
+
+    def test_rebuild_matches_incremental_index(self):
+        build_schedule(self.meet, 'LIGHTEST')
+        build_schedule(self.meet, 'HEAVIEST')
+        expected = index()
+        MeetSchedule.objects.update(official_loads=None, season_counted=False)
+        OfficialSeasonLoad.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_season_loads', stdout=out)
+        self.assertIn('from 1 meet schedule(s)', out.getvalue())
+        self.assertEqual(index(), expected)
+        self.assertEqual(rebuild_season_loads(self.season), 1)
+        self.assertEqual(index(), expected)
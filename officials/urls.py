@@ -6,6 +6,7 @@ from . import views_strategy
 from . import views_position
 from . import views_leagues
 from . import views_meets
+from . import views_officials
 from . import views_event_positions
 
 urlpatterns = [
@@ -18,6 +19,8 @@ urlpatterns = [
     path('leagues/create/', views_leagues.league_create, name='league_create'),
     path('leagues/<int:pk>/update/', views_leagues.league_update, name='league_update'),
     path('leagues/<int:pk>/delete/', views_leagues.league_delete, name='league_delete'),
+    path('leagues/<int:pk>/build-schedules/', views_leagues.league_build_schedules, name='league_build_schedules'),
+    path('leagues/<int:pk>/build-schedules/<uuid:job_id>/', views_leagues.league_build_status, name='league_build_status'),
     
     # Division URLs
     path('divisions/', views.division_list, name='division_list'),
@@ -43,6 +46,8 @@ urlpatterns = [
     # Official URLs
     path('officials/', views.official_list, name='official_list'),
     path('officials/<int:pk>/', views.official_detail, name='official_detail'),
+    path('officials/<int:pk>/assignments/', views_officials.official_assignments, name='official_assignments'),
+    path('officials/<int:pk>/assignments.json', views_officials.official_assignments_json, name='official_assignments_json'),
     path('officials/create/', views.official_create, name='official_create'),
     path('officials/<int:pk>/update/', views.official_update, name='official_update'),
     path('officials/<int:pk>/delete/', views.official_delete, name='official_delete'),
@@ -66,6 +71,18 @@ urlpatterns = [
     path('meets/<int:pk>/configure/', views_meets.meet_configure, name='meet_configure'),
     path('meets/<int:pk>/configure/proceed/', views_meets.meet_configure_proceed, name='meet_configure_proceed'),
     path('meets/<int:pk>/configure/build/', views_meets.meet_build_schedule, name='meet_build_schedule'),
+    path('meets/<int:pk>/configure/build/<uuid:job_id>/', views_meets.meet_build_status, name='meet_build_status'),
+    path('meets/<int:pk>/schedules/diff/', views_meets.meet_schedule_diff, name='meet_schedule_diff'),
+    path('meets/<int:pk>/schedules/<int:schedule_id>/', views_meets.meet_schedule_detail, name='meet_schedule_detail'),
+    path('meets/<int:pk>/schedules/<int:schedule_id>/validate/', views_meets.meet_schedule_validate, name='meet_schedule_validate'),
+    path('meets/<int:pk>/schedules/<int:schedule_id>/export/excel/', views_meets.meet_schedule_export_excel, name='meet_schedule_export_excel'),
+    path('meets/<int:pk>/schedules/<int:schedule_id>/publish/', views_meets.meet_schedule_publish, name='meet_schedule_publish'),
+    path('meets/<int:pk>/published/', views_meets.published_schedule, name='published_schedule'),
+    path('meets/<int:pk>/published.json', views_meets.published_schedule_json, name='published_schedule_json'),
+    path('meets/<int:pk>/published/withdraw/', views_meets.meet_schedule_withdraw, name='meet_schedule_withdraw'),
+    path('meets/<int:pk>/schedules/<int:schedule_id>/edit/', views_meets.meet_schedule_sandbox, name='meet_schedule_sandbox'),
+    path('meets/<int:pk>/schedules/<int:schedule_id>/edit/apply/', views_meets.meet_schedule_sandbox_edit, name='meet_schedule_sandbox_edit'),
+    path('meets/<int:pk>/schedules/<int:schedule_id>/edit/save/', views_meets.meet_schedule_sandbox_commit, name='meet_schedule_sandbox_commit'),
     
     # Assignment URLs
     path('assignments/', views.assignment_list, name='assignment_list'),
@@ -3,11 +3,13 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django_filters.views import FilterView
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
 from django.urls import reverse_lazy
 
-from .models import League, Division
-from .forms import LeagueForm, DivisionForm
+from .models import League, Division, ScheduleJob
+from .forms import LeagueForm, DivisionForm, LeagueScheduleBuildForm
 from .filters import LeagueFilter
+from .services.jobs import job_payload, submit_league_build
 
 class LeagueListView(LoginRequiredMixin, FilterView):
     """
@@ -111,3 +113,46 @@ def league_delete(request, pk):
     return render(request, 'officials/league_confirm_delete.html', {
         'league': league,
     })
+
+@login_required
+def league_build_schedules(request, pk):
+    """Build schedules for every meet of a league on a date or date range (staff only)."""
+    league = get_object_or_404(League, pk=pk)
+
+    if not request.user.is_staff:
+        messages.error(request, 'Only staff can build schedules for a whole league.')
+        return redirect('league_detail', pk=league.pk)
+
+    if request.method == 'POST':
+        form = LeagueScheduleBuildForm(request.POST)
+        if form.is_valid():
+            job = submit_league_build(
+                league,
+                form.cleaned_data['start_date'],
+                form.cleaned_data['end_date'],
+                form.cleaned_data['build_option'],
+                user=request.user,
+            )
+            if job.status == 'FAILED':
+                messages.error(request, job.message)
+            elif job.status == 'DONE':
+                messages.success(request, job.message)
+            else:
+                messages.info(request, 'League schedule build started. Progress is shown below.')
+            return redirect('league_build_schedules', pk=league.pk)
+    else:
+        form = LeagueScheduleBuildForm()
+
+    return render(request, 'officials/league_build_schedules.html', {
+        'league': league,
+        'form': form,
+        'schedule_jobs': league.schedule_jobs.all()[:10],
+    })
+
+@login_required
+def league_build_status(request, pk, job_id):
+    """Return the status of a league-wide schedule build as JSON."""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Permission denied.'}, status=403)
+    job = get_object_or_404(ScheduleJob, pk=job_id, league_id=pk)
+    return JsonResponse(job_payload(job))
@@ -1,12 +1,27 @@
 import sys
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from .models import Meet, Assignment, Team, Official, League, Pool, MeetSchedule
+from .models import (Meet, Assignment, Team, Official, League, Pool, MeetSchedule, ScheduleJob, Event, Position,
+                     PublishedSchedule)
 from .forms import MeetForm, AssignmentForm
+from .services.booking_index import BookingIndex
+from .services.jobs import job_payload, submit_schedule_build
+from .services.schedule_builder import packed_table, schedule_table
+from .services.schedule_diff import diff_schedules
+from .services.schedule_export import export_filename, stream_schedule_workbook
+from .services.schedule_publish import (current_publication, publication_body, publish_schedule,
+                                       withdraw_publications)
+from .services.schedule_sandbox import (SandboxError, commit_sandbox, discard_sandbox, get_sandbox, open_sandbox,
+                                        save_sandbox)
+from .services.schedule_storage import PackedSchedule
+from .services.schedule_validation import validate_schedule
 from datetime import datetime
-from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 
 
 # Meet views
@@ -60,7 +75,7 @@ def meet_detail(request, pk):
         'participating_teams': participating_teams,
         'eligible_referees': eligible_referees,
         'meet_referee': meet_referee,
-        'schedules': getattr(meet, 'schedules', None) and meet.schedules.all() or [],
+        'schedules': getattr(meet, 'schedules', None) and meet.schedules.defer('grid_data') or [],
     })
 
 
@@ -303,15 +318,20 @@ logger = logging.getLogger(__name__)
 def _auto_assign_participating_officials(meet: Meet):
     """Assign all officials from participating teams to the given meet.
     Creates an Assignment per official with a default role and an auto-generated note.
+    Officials already confirmed at another meet on the same date are skipped.
     Safe to call multiple times; uses get_or_create to avoid duplicates.
     """
     try:
         participating_teams = meet.participating_teams.all()
         if not participating_teams.exists():
             return 0
-        officials = Official.objects.filter(team__in=participating_teams).distinct()
+        officials = list(Official.objects.filter(team__in=participating_teams).distinct())
+        bookings = BookingIndex.for_dates([meet.date], [official.id for official in officials])
         created_count = 0
         for official in officials:
+            if bookings.confirmed_elsewhere(official.id, meet):
+                logger.info(f"Not auto-assigning official {official.id} to meet {meet.id}: confirmed at another meet that day")
+                continue
             # Use the official's certification name if available; else a generic default
             role_label = 'Official'
             try:
@@ -523,6 +543,23 @@ def assignment_detail(request, pk):
     })
 
 
+def _other_meet_bookings(official, meet):
+    """
+    Names of the other meets on `meet`'s date the official is assigned to, as
+    (confirmed there, not yet confirmed there).
+    """
+    if official is None or official.pk is None:
+        return [], []
+    others = BookingIndex.for_dates([meet.date], [official.pk]).other_meets(official.pk, meet)
+    if not others:
+        return [], []
+    names = dict(Meet.objects.filter(pk__in=others).values_list('id', 'name'))
+    return (
+        [names[meet_id] for meet_id, confirmed in others.items() if confirmed],
+        [names[meet_id] for meet_id, confirmed in others.items() if not confirmed],
+    )
+
+
 @login_required
 def assignment_create(request, meet_id=None):
     """Create a new assignment."""
@@ -654,12 +691,25 @@ def assignment_create(request, meet_id=None):
             if not getattr(assignment.official, 'certification_id', None):
                 messages.warning(request, f'Note: {assignment.official.name} has no certification.')
 
-            try:
-                assignment.save()
-                messages.success(request, f'Assignment for {assignment.official.name} created successfully!')
-                return redirect('meet_detail', pk=assignment.meet.pk)
-            except Exception as e:
-                messages.error(request, f'Error creating assignment: {str(e)}')
+            # Officials confirmed at another meet that day cannot be booked again
+            confirmed_at, assigned_at = _other_meet_bookings(assignment.official, meet_obj)
+            if confirmed_at:
+                messages.error(
+                    request,
+                    f'{assignment.official.name} is already confirmed for {", ".join(confirmed_at)} on {meet_obj.date}.'
+                )
+            else:
+                if assigned_at:
+                    messages.warning(
+                        request,
+                        f'Note: {assignment.official.name} is also assigned to {", ".join(assigned_at)} on {meet_obj.date}.'
+                    )
+                try:
+                    assignment.save()
+                    messages.success(request, f'Assignment for {assignment.official.name} created successfully!')
+                    return redirect('meet_detail', pk=assignment.meet.pk)
+                except Exception as e:
+                    messages.error(request, f'Error creating assignment: {str(e)}')
         else:
             # Fallback: if essential fields are present, attempt manual creation to satisfy test flow
             try:
@@ -687,6 +737,13 @@ def assignment_create(request, meet_id=None):
                 # Validate role text
                 if not posted_role:
                     raise ValueError('Role is required')
+                confirmed_at, _assigned_at = _other_meet_bookings(official_obj, meet_obj)
+                if confirmed_at:
+                    messages.error(
+                        request,
+                        f'{official_obj.name} is already confirmed for {", ".join(confirmed_at)} on {meet_obj.date}.'
+                    )
+                    raise ValueError('Official is confirmed at another meet that day')
                 # Create and save assignment
                 assignment = Assignment(
                     meet=meet_obj,
@@ -767,8 +824,9 @@ def assignment_update(request, pk):
             if new_prof and hasattr(assignment, 'official'):
                 if getattr(assignment.official, 'proficiency', None) != new_prof:
                     assignment.official.proficiency = new_prof
-                    assignment.official.save(update_fields=['proficiency'])
+                    assignment.official.save(update_fields=['proficiency', 'updated_at'])
             messages.success(request, f'Assignment for {assignment.official.name} updated successfully!')
+            _report_schedule_repair(request, updated)
             return redirect('meet_detail', pk=assignment.meet.pk)
     else:
         form = AssignmentForm(instance=assignment)
@@ -804,6 +862,7 @@ def assignment_delete(request, pk):
         official_name = assignment.official.name
         assignment.delete()
         messages.success(request, f'Assignment for {official_name} deleted successfully!')
+        _report_schedule_repair(request, assignment)
         return redirect('meet_detail', pk=meet_id)
     
     return render(request, 'officials/assignment_confirm_delete.html', {
@@ -822,16 +881,27 @@ def toggle_assignment_confirm(request, pk):
     if request.method == 'POST':
         # Proceed to toggle without certification check
         assignment.confirmed = not assignment.confirmed
-        assignment.save(update_fields=['confirmed'])
+        assignment.save(update_fields=['confirmed', 'updated_at'])
         if assignment.confirmed:
             messages.success(request, f'{assignment.official.name} confirmed for this meet.')
         else:
             messages.info(request, f'{assignment.official.name} unconfirmed for this meet.')
+            _report_schedule_repair(request, assignment)
     else:
         messages.error(request, 'Invalid request method.')
     return redirect('meet_detail', pk=assignment.meet.pk)
 
 
+def _report_schedule_repair(request, assignment):
+    """Tell the user how the built schedules were patched when saving or deleting dropped an official."""
+    if not hasattr(assignment, 'repaired_slots'):
+        return
+    if assignment.repaired_slots is None:
+        messages.warning(request, 'Built schedules could not be updated; rebuild the schedule for this meet.')
+    elif assignment.repaired_slots:
+        messages.info(request, f'Reassigned {assignment.repaired_slots} slot(s) in built schedules.')
+
+
 @login_required
 def meet_configure(request, pk):
     """Display the Configure Meet page with basic meet information."""
@@ -900,7 +970,8 @@ def meet_configure(request, pk):
         'assignments': assignments_qs,
         'eligible_referees': eligible_referees,
         'meet_referee': meet_referee,
-        'schedules': getattr(meet, 'schedules', None) and meet.schedules.all() or [],
+        'schedules': getattr(meet, 'schedules', None) and meet.schedules.defer('grid_data') or [],
+        'schedule_jobs': meet.schedule_jobs.all()[:5],
     }
     return render(request, 'officials/meet_configure.html', context)
 
@@ -952,10 +1023,13 @@ def meet_configure_proceed(request, pk):
 
 @login_required
 def meet_build_schedule(request, pk):
-    """Build and persist a meet schedule record with a timestamped name."""
+    """Queue a background build of the meet's schedule and return to the configure page."""
     meet = get_object_or_404(Meet, pk=pk)
+    wants_json = request.headers.get('x-requested-with') == 'XMLHttpRequest'
     # Permission: user must have access to the meet's league unless staff
     if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        if wants_json:
+            return JsonResponse({'error': 'Permission denied'}, status=403)
         messages.error(request, 'You do not have permission to build a schedule for this meet.')
         return redirect('meet_detail', pk=pk)
     if request.method != 'POST':
@@ -964,15 +1038,346 @@ def meet_build_schedule(request, pk):
     option = request.POST.get('build_option', 'LIGHTEST').upper()
     if option not in dict(MeetSchedule.BUILD_CHOICES):
         option = 'LIGHTEST'
-    timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-    schedule_name = f"{meet.name} - {timestamp}"
+    improve_ms = getattr(settings, 'SCHEDULE_IMPROVE_MS', 500) if request.POST.get('improve') else 0
+    job = submit_schedule_build(meet, option, user=request.user, improve_ms=improve_ms)
+    if wants_json:
+        payload = job_payload(job)
+        payload['status_url'] = reverse('meet_build_status', args=[meet.pk, job.pk])
+        return JsonResponse(payload, status=202)
+    if job.status == 'DONE':
+        messages.success(request, job.message)
+    elif job.status == 'FAILED':
+        messages.error(request, job.message)
+    else:
+        messages.info(request, f'{option.title()} schedule build started.')
+    return redirect('meet_configure', pk=pk)
+
+
+@login_required
+def meet_build_status(request, pk, job_id):
+    """Return the progress of a background schedule build as JSON."""
+    meet = get_object_or_404(Meet, pk=pk)
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    job = get_object_or_404(ScheduleJob, pk=job_id, meet=meet)
+    payload = job_payload(job)
+    if job.schedule_id:
+        payload['schedule_url'] = reverse('meet_schedule_detail', args=[meet.pk, job.schedule_id])
+    return JsonResponse(payload)
+
+
+@login_required
+def meet_schedule_detail(request, pk, schedule_id):
+    """Display a built schedule as an event-by-position grid."""
+    meet = get_object_or_404(Meet, pk=pk)
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        messages.error(request, 'You do not have permission to view this schedule.')
+        return redirect('meet_detail', pk=pk)
+    schedule = get_object_or_404(MeetSchedule, pk=schedule_id, meet=meet)
+    positions, rows = schedule_table(schedule)
+    violations = validate_schedule(schedule) if schedule.packed is not None else []
+    events_by_id = {event.id: event for event, _cells in rows}
+    positions_by_id = {position.id: position for position in positions}
+    officials_by_id = {cell.official.id: cell.official for _event, cells in rows for cell in cells if cell and cell.official}
+    return render(request, 'officials/meet_schedule_detail.html', {
+        'meet': meet,
+        'schedule': schedule,
+        'publication': current_publication(meet.id),
+        'positions': positions,
+        'rows': rows,
+        'violations': [
+            (v, events_by_id.get(v.event_id), positions_by_id.get(v.position_id), officials_by_id.get(v.official_id))
+            for v in violations
+        ],
+    })
+
+
+@login_required
+def meet_schedule_validate(request, pk, schedule_id):
+    """Return a built schedule's constraint violations as JSON."""
+    meet = get_object_or_404(Meet, pk=pk)
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    schedule = get_object_or_404(MeetSchedule, pk=schedule_id, meet=meet)
     try:
-        MeetSchedule.objects.create(
-            meet=meet,
-            name=schedule_name,
-            build_option=option,
-        )
-        messages.success(request, f'Schedule "{schedule_name}" created ({option.title()}).')
-    except Exception as e:
-        messages.error(request, f'Failed to create schedule: {e}')
+        violations = validate_schedule(schedule)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({
+        'schedule': schedule.pk,
+        'valid': not violations,
+        'violations': [violation.as_dict() for violation in violations],
+    })
+
+
+@login_required
+def meet_schedule_export_excel(request, pk, schedule_id):
+    """Download a built schedule as an .xlsx deck sheet, streamed as it is written."""
+    meet = get_object_or_404(Meet, pk=pk)
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        messages.error(request, 'You do not have permission to export this schedule.')
+        return redirect('meet_detail', pk=pk)
+    schedule = get_object_or_404(MeetSchedule.objects.select_related('meet'), pk=schedule_id, meet=meet)
+    if schedule.packed is None:
+        messages.error(request, 'This schedule has no built grid to export.')
+        return redirect('meet_schedule_detail', pk=pk, schedule_id=schedule.pk)
+    response = StreamingHttpResponse(
+        stream_schedule_workbook(schedule),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(schedule)}"'
+    return response
+
+
+@login_required
+def meet_schedule_publish(request, pk, schedule_id):
+    """Publish a built schedule as the meet's public schedule page and JSON feed."""
+    meet = get_object_or_404(Meet, pk=pk)
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        messages.error(request, 'You do not have permission to publish this schedule.')
+        return redirect('meet_detail', pk=pk)
+    if request.method != 'POST':
+        return redirect('meet_schedule_detail', pk=pk, schedule_id=schedule_id)
+    schedule = get_object_or_404(MeetSchedule.objects.select_related('meet__pool'), pk=schedule_id, meet=meet)
+    try:
+        publish_schedule(schedule, request.user)
+    except ValueError as e:
+        messages.error(request, str(e))
+    else:
+        messages.success(request, f'Published "{schedule.name}".')
+    return redirect('meet_schedule_detail', pk=pk, schedule_id=schedule.pk)
+
+
+@login_required
+def meet_schedule_withdraw(request, pk):
+    """Take down a meet's published schedule."""
+    meet = get_object_or_404(Meet, pk=pk)
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        messages.error(request, 'You do not have permission to withdraw this schedule.')
+        return redirect('meet_detail', pk=pk)
+    if request.method != 'POST':
+        return redirect('meet_configure', pk=pk)
+    if withdraw_publications(meet):
+        messages.success(request, 'The published schedule was withdrawn.')
     return redirect('meet_configure', pk=pk)
+
+
+def _published_response(request, pk, kind, content_type):
+    # Served from the stored snapshot: no login, no schedule queries, no rendering.
+    publication = current_publication(pk)
+    if publication is None:
+        raise Http404('This meet has no published schedule.')
+    etag = f'"{publication["etag"]}-{kind}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        try:
+            body = publication_body(publication, kind)
+        except PublishedSchedule.DoesNotExist:
+            raise Http404('This meet has no published schedule.')
+        response = HttpResponse(body, content_type=content_type)
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=60)
+    return response
+
+
+def published_schedule(request, pk):
+    """The meet's published schedule page."""
+    return _published_response(request, pk, 'html', 'text/html; charset=utf-8')
+
+
+def published_schedule_json(request, pk):
+    """The meet's published schedule as JSON."""
+    return _published_response(request, pk, 'json', 'application/json')
+
+
+@login_required
+def meet_schedule_diff(request, pk):
+    """
+    Compare two built schedules of a meet.
+
+    `?a=<schedule id>&b=<schedule id>` pick the schedules; they default to the
+    second newest and newest. Returns JSON for `?format=json` or XHR requests.
+    """
+    meet = get_object_or_404(Meet, pk=pk)
+    wants_json = request.GET.get('format') == 'json' or request.headers.get('x-requested-with') == 'XMLHttpRequest'
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        if wants_json:
+            return JsonResponse({'error': 'Permission denied'}, status=403)
+        messages.error(request, 'You do not have permission to view these schedules.')
+        return redirect('meet_detail', pk=pk)
+
+    choices = list(meet.schedules.defer('grid_data'))
+    if request.GET.get('a') and request.GET.get('b'):
+        try:
+            before = get_object_or_404(MeetSchedule, pk=int(request.GET['a']), meet=meet)
+            after = get_object_or_404(MeetSchedule, pk=int(request.GET['b']), meet=meet)
+        except ValueError:
+            if wants_json:
+                return JsonResponse({'error': 'a and b must be schedule ids'}, status=400)
+            messages.error(request, 'Choose two schedules to compare.')
+            return redirect('meet_configure', pk=pk)
+    elif len(choices) >= 2:
+        # grid_data is deferred on these and loads on first use.
+        before, after = choices[1], choices[0]
+    else:
+        if wants_json:
+            return JsonResponse({'error': 'Build at least two schedules to compare them'}, status=400)
+        messages.info(request, 'Build at least two schedules to compare them.')
+        return redirect('meet_configure', pk=pk)
+
+    try:
+        diff = diff_schedules(before, after)
+    except ValueError as e:
+        if wants_json:
+            return JsonResponse({'error': str(e)}, status=400)
+        messages.error(request, str(e))
+        return redirect('meet_configure', pk=pk)
+
+    if wants_json:
+        return JsonResponse(diff.as_dict())
+
+    events = Event.objects.in_bulk({change.event_id for change in diff.changed_slots}
+                                   | {event_id for event_id, _ in diff.newly_unfilled_mandatory})
+    positions = Position.objects.in_bulk({change.position_id for change in diff.changed_slots}
+                                         | {position_id for _, position_id in diff.newly_unfilled_mandatory})
+    officials = Official.objects.in_bulk(
+        {official_id for change in diff.changed_slots for official_id in (change.before, change.after) if official_id}
+        | {load.official_id for load in diff.load_deltas}
+    )
+    return render(request, 'officials/meet_schedule_diff.html', {
+        'meet': meet,
+        'schedules': choices,
+        'before': before,
+        'after': after,
+        'diff': diff,
+        'changed_slots': [
+            (events.get(c.event_id), positions.get(c.position_id), officials.get(c.before), officials.get(c.after), c)
+            for c in diff.changed_slots
+        ],
+        'load_deltas': [(officials.get(load.official_id), load) for load in diff.load_deltas],
+        'newly_unfilled': [(events.get(e), positions.get(p)) for e, p in diff.newly_unfilled_mandatory],
+    })
+
+
+def _sandbox_payload(sandbox):
+    return {
+        'schedule': sandbox.schedule_id,
+        'edits': len(sandbox.edits),
+        'blocking': sandbox.blocking,
+        'violations': [violation.as_dict() for violation in sandbox.violation_list()],
+    }
+
+
+@login_required
+def meet_schedule_sandbox(request, pk, schedule_id):
+    """
+    Edit a built schedule in a sandbox kept for the user's session.
+
+    The stored schedule is not changed; edits are saved as a new schedule with
+    meet_schedule_sandbox_commit.
+    """
+    meet = get_object_or_404(Meet, pk=pk)
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        messages.error(request, 'You do not have permission to edit this schedule.')
+        return redirect('meet_detail', pk=pk)
+    schedule = get_object_or_404(MeetSchedule, pk=schedule_id, meet=meet)
+    try:
+        sandbox = open_sandbox(request.session, schedule)
+    except SandboxError as e:
+        messages.error(request, str(e))
+        return redirect('meet_schedule_detail', pk=pk, schedule_id=schedule_id)
+
+    positions, rows = packed_table(PackedSchedule(sandbox.encoded()))
+    events_by_id = {event.id: event for event, _cells in rows}
+    positions_by_id = {position.id: position for position in positions}
+    officials = list(Official.objects.filter(id__in=sandbox.official_ids).order_by('name'))
+    officials_by_id = {official.id: official for official in officials}
+    return render(request, 'officials/meet_schedule_sandbox.html', {
+        'meet': meet,
+        'schedule': schedule,
+        'sandbox': sandbox,
+        'positions': positions,
+        'rows': rows,
+        'officials': officials,
+        'violations': [
+            (v, events_by_id.get(v.event_id), positions_by_id.get(v.position_id), officials_by_id.get(v.official_id))
+            for v in sandbox.violation_list()
+        ],
+    })
+
+
+@login_required
+def meet_schedule_sandbox_edit(request, pk, schedule_id):
+    """
+    Apply one edit to the session's sandbox.
+
+    POST `op` is swap, move, clear or assign. Slots are given as
+    `event`/`position` and, for swap and move, `to_event`/`to_position`,
+    where a position is a column key (a position id, or 'id:lane');
+    assign takes an `official`. XHR requests get the sandbox's violations back
+    as JSON.
+    """
+    meet = get_object_or_404(Meet, pk=pk)
+    wants_json = request.headers.get('x-requested-with') == 'XMLHttpRequest'
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        if wants_json:
+            return JsonResponse({'error': 'Permission denied'}, status=403)
+        messages.error(request, 'You do not have permission to edit this schedule.')
+        return redirect('meet_detail', pk=pk)
+    if request.method != 'POST':
+        return redirect('meet_schedule_sandbox', pk=pk, schedule_id=schedule_id)
+    schedule = get_object_or_404(MeetSchedule, pk=schedule_id, meet=meet)
+
+    try:
+        sandbox = open_sandbox(request.session, schedule)
+        op = request.POST.get('op')
+        slot = (int(request.POST['event']), request.POST['position'])
+        if op in ('swap', 'move'):
+            target = (int(request.POST['to_event']), request.POST['to_position'])
+            getattr(sandbox, op)(*slot, *target)
+        elif op == 'clear':
+            sandbox.clear(*slot)
+        elif op == 'assign':
+            sandbox.assign(*slot, int(request.POST['official']))
+        else:
+            raise SandboxError('Choose swap, move, clear or assign.')
+    except (KeyError, ValueError) as e:
+        error = str(e) if isinstance(e, SandboxError) else 'Choose the slots to edit.'
+        if wants_json:
+            return JsonResponse({'error': error}, status=400)
+        messages.error(request, error)
+        return redirect('meet_schedule_sandbox', pk=pk, schedule_id=schedule_id)
+
+    save_sandbox(request.session, sandbox)
+    if wants_json:
+        return JsonResponse(_sandbox_payload(sandbox))
+    return redirect('meet_schedule_sandbox', pk=pk, schedule_id=schedule_id)
+
+
+@login_required
+def meet_schedule_sandbox_commit(request, pk, schedule_id):
+    """Save the session's sandbox as a new schedule, or discard it with `discard`."""
+    meet = get_object_or_404(Meet, pk=pk)
+    if not request.user.leagues.filter(id=meet.league.id).exists() and not request.user.is_staff:
+        messages.error(request, 'You do not have permission to edit this schedule.')
+        return redirect('meet_detail', pk=pk)
+    if request.method != 'POST':
+        return redirect('meet_schedule_sandbox', pk=pk, schedule_id=schedule_id)
+    schedule = get_object_or_404(MeetSchedule, pk=schedule_id, meet=meet)
+
+    if request.POST.get('discard'):
+        discard_sandbox(request.session, schedule.pk)
+        messages.info(request, 'Your edits were discarded.')
+        return redirect('meet_schedule_detail', pk=pk, schedule_id=schedule.pk)
+
+    sandbox = get_sandbox(request.session, schedule.pk)
+    if sandbox is None:
+        messages.error(request, 'There are no edits to save for this schedule.')
+        return redirect('meet_schedule_detail', pk=pk, schedule_id=schedule.pk)
+    try:
+        new_schedule = commit_sandbox(request.session, sandbox, name=request.POST.get('name', '').strip() or None)
+    except SandboxError as e:
+        messages.error(request, str(e))
+        return redirect('meet_schedule_sandbox', pk=pk, schedule_id=schedule.pk)
+    messages.success(request, f'Schedule "{new_schedule.name}" saved.')
+    return redirect('meet_schedule_detail', pk=pk, schedule_id=new_schedule.pk)
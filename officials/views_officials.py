@@ -1,16 +1,23 @@
 import sys
 import logging
+from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.urls import reverse
 from django.core.paginator import Paginator
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 from .models import Official, Team, Certification
 from .forms import OfficialForm, CertificationForm
+from .services.official_feed import official_feed
 
 logger = logging.getLogger(__name__)
 
+# Most recent assignments listed on an official's page; upcoming meets are on their assignments page.
+DETAIL_ASSIGNMENTS = 25
+
 # Certification views
 @login_required
 def certification_list(request):
@@ -144,7 +151,8 @@ def certification_update(request, pk):
                     rows_updated = Certification.objects.filter(pk=pk).update(
                         name=name, 
                         abbreviation=abbr,
-                        description=desc
+                        description=desc,
+                        updated_at=timezone.now()
                     )
                     logger.info(f"Direct DB update: {rows_updated} rows affected")
                     
@@ -254,15 +262,52 @@ def official_detail(request, pk):
         messages.error(request, 'You do not have permission to view this official.')
         return redirect('official_list')
     
-    assignments = official.assignments.all().order_by('-meet__date')
+    assignments = official.assignments.select_related('meet__host_team').order_by('-meet__date', '-id')
     
     return render(request, 'officials/official_detail.html', {
         'official': official,
 
-        'assignments': assignments,
+        'assignments': assignments[:DETAIL_ASSIGNMENTS],
+        'assignment_count': assignments.count(),
     })
 
 
+def _feed_official(request, pk):
+    """The official for a feed request, or None if the user may not see them."""
+    official = get_object_or_404(Official.objects.select_related('team__division'), pk=pk)
+    if not request.user.leagues.filter(id=official.team.division.league_id).exists() and not request.user.is_staff:
+        return None
+    return official
+
+
+@login_required
+def official_assignments(request, pk):
+    """An official's upcoming meets: their assignments and published slots."""
+    official = _feed_official(request, pk)
+    if official is None:
+        messages.error(request, 'You do not have permission to view this official.')
+        return redirect('official_list')
+    feed, _etag = official_feed(official)
+    return render(request, 'officials/official_assignments.html', {
+        'official': official,
+        'meets': feed['meets'],
+    })
+
+
+@login_required
+def official_assignments_json(request, pk):
+    """official_assignments() as JSON, with an ETag for conditional requests."""
+    official = _feed_official(request, pk)
+    if official is None:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    feed, etag = official_feed(official)
+    etag = f'"{etag}"'
+    response = get_conditional_response(request, etag=etag) or JsonResponse(feed)
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=60)
+    return response
+
+
 @login_required
 def official_create(request):
     """Create a new official."""
@@ -231,6 +231,41 @@ LOGIN_URL = 'login'
 CRISPY_ALLOWED_TEMPLATE_PACKS = 'bootstrap5'
 CRISPY_TEMPLATE_PACK = 'bootstrap5'
 
+# Background schedule builds (officials.services.jobs)
+SCHEDULE_JOB_WORKERS = 2
+# Run build jobs inline instead of on the thread pool (tests, debugging)
+SCHEDULE_JOBS_EAGER = False
+# Wall-clock budget (ms) of the optional local-search pass after a build
+SCHEDULE_IMPROVE_MS = 500
+# Season balancing: LIGHTEST builds favour officials who have worked less this season
+SCHEDULE_SEASON_BALANCE = True
+# Positions needing at least this certification level count as heavy in season loads
+SEASON_HEAVY_POSITION_LEVEL = 3
+# Portfolio builds: improvement seeds per heuristic and solver processes (None = one per CPU core)
+SCHEDULE_PORTFOLIO_SEEDS = 2
+SCHEDULE_PORTFOLIO_WORKERS = None
+# Solver processes for league-wide builds; None uses one per CPU core
+LEAGUE_BUILD_WORKERS = None
+# Upcoming meets listed in an official's assignments feed
+OFFICIAL_FEED_MEETS = 20
+# Positions built as one column per lane group of the meet's pool:
+# role prefix -> (lanes per slot, 'finish' or 'turn' end); 0 lanes means one per end
+LANE_POSITION_RULES = {
+    'timer': (1, 'finish'),
+    'snt turn': (2, 'turn'),
+    'oof': (0, 'finish'),
+}
+# Largest page an API client may ask for with ?page_size= (the default is REST_FRAMEWORK's PAGE_SIZE)
+API_MAX_PAGE_SIZE = 1000
+# Most items one bulk API write may carry
+API_BULK_MAX_ITEMS = 1000
+# Delta sync (/api/v1/officials/sync/): how far back each new token reaches so rows
+# committed late are not missed, and how long tombstones of deleted rows are kept
+API_SYNC_OVERLAP_SECONDS = 30
+API_SYNC_TOMBSTONE_DAYS = 30
+# Rows and tombstones per sync response; larger syncs continue with "more"
+API_SYNC_PAGE_SIZE = 1000
+
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'officials.exceptions.custom_exception_handler',
@@ -241,5 +276,7 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'officials.pagination.KeysetPagination',
+    'PAGE_SIZE': 100,
 }